@@ -40,7 +40,11 @@ resource "aws_apigatewayv2_integration" "lambda_integrations" {
 
   api_id           = aws_apigatewayv2_api.this.id
   integration_type = "AWS_PROXY"
-  integration_uri  = var.lambda_functions[each.value.lambda_key].invoke_arn
+  # Integrate against the function's alias when it has one
+  integration_uri = coalesce(
+    var.lambda_functions[each.value.lambda_key].qualified_invoke_arn,
+    var.lambda_functions[each.value.lambda_key].invoke_arn
+  )
 
   integration_method     = "POST"
   payload_format_version = var.payload_format_version
@@ -55,6 +59,19 @@ resource "aws_apigatewayv2_stage" "this" {
   name        = var.stage_name
   auto_deploy = var.auto_deploy
 
+  # Per-route metrics (Latency, IntegrationLatency, 4xx/5xx by route). HTTP
+  # APIs cannot emit X-Ray traces, so these and the latency fields of the
+  # access log show the API Gateway part of a request.
+  dynamic "default_route_settings" {
+    for_each = var.enable_detailed_metrics ? [1] : []
+    content {
+      detailed_metrics_enabled = true
+      # The account-level defaults, so enabling metrics leaves throttling unchanged
+      throttling_burst_limit = 5000
+      throttling_rate_limit  = 10000
+    }
+  }
+
   # Optional stage configuration
   dynamic "access_log_settings" {
     for_each = var.enable_access_logs ? [1] : []
@@ -71,6 +88,11 @@ resource "aws_apigatewayv2_stage" "this" {
         responseLength   = "$context.responseLength"
         error            = "$context.error.message"
         integrationError = "$context.integrationErrorMessage"
+        # Time spent in the integration vs. the whole request, and the
+        # Lambda request ID to join with the function's logs and traces
+        integrationLatency   = "$context.integrationLatency"
+        responseLatency      = "$context.responseLatency"
+        integrationRequestId = "$context.integration.requestId"
       })
     }
   }
@@ -141,3 +163,102 @@ resource "aws_apigatewayv2_api_mapping" "this" {
   domain_name = aws_apigatewayv2_domain_name.this[0].id
   stage       = aws_apigatewayv2_stage.this.id
 }
+
+# Optional: CloudFront cache in front of the API
+# GET/HEAD responses are cached per full query string (so a cached lookup can
+# never be poisoned by extra parameters) for as long as the origin's
+# Cache-Control allows, bounded by max_ttl. Other methods and the uncached
+# paths always reach the API.
+locals {
+  edge_cache_enabled = var.edge_cache.enabled
+  api_origin_id      = "${var.prefix}-${var.project_name}-api"
+
+  # AWS managed CloudFront policies
+  caching_disabled_policy_id       = "4135ea2d-6df8-44a3-9df3-4b5a84be39ad"
+  all_viewer_except_host_policy_id = "b689b0a8-53d0-40ab-baf2-68738e2966ac"
+}
+
+resource "aws_cloudfront_cache_policy" "api" {
+  count = local.edge_cache_enabled ? 1 : 0
+
+  name        = "${var.prefix}-${var.project_name}-api-cache"
+  comment     = "Caches API responses per query string"
+  min_ttl     = 0
+  default_ttl = var.edge_cache.default_ttl
+  max_ttl     = var.edge_cache.max_ttl
+
+  parameters_in_cache_key_and_forwarded_to_origin {
+    enable_accept_encoding_gzip   = true
+    enable_accept_encoding_brotli = true
+
+    cookies_config {
+      cookie_behavior = "none"
+    }
+
+    headers_config {
+      header_behavior = "none"
+    }
+
+    query_strings_config {
+      query_string_behavior = "all"
+    }
+  }
+}
+
+resource "aws_cloudfront_distribution" "api" {
+  count = local.edge_cache_enabled ? 1 : 0
+
+  enabled         = true
+  comment         = "Edge cache for ${var.prefix}-${var.project_name}-api"
+  price_class     = var.edge_cache.price_class
+  is_ipv6_enabled = true
+
+  origin {
+    domain_name = replace(aws_apigatewayv2_api.this.api_endpoint, "https://", "")
+    origin_id   = local.api_origin_id
+
+    custom_origin_config {
+      http_port              = 80
+      https_port             = 443
+      origin_protocol_policy = "https-only"
+      origin_ssl_protocols   = ["TLSv1.2"]
+    }
+  }
+
+  default_cache_behavior {
+    target_origin_id         = local.api_origin_id
+    viewer_protocol_policy   = "redirect-to-https"
+    allowed_methods          = ["DELETE", "GET", "HEAD", "OPTIONS", "PATCH", "POST", "PUT"]
+    cached_methods           = ["GET", "HEAD"]
+    cache_policy_id          = aws_cloudfront_cache_policy.api[0].id
+    origin_request_policy_id = local.all_viewer_except_host_policy_id
+    compress                 = true
+  }
+
+  dynamic "ordered_cache_behavior" {
+    for_each = var.edge_cache.uncached_path_patterns
+    content {
+      path_pattern             = ordered_cache_behavior.value
+      target_origin_id         = local.api_origin_id
+      viewer_protocol_policy   = "redirect-to-https"
+      allowed_methods          = ["DELETE", "GET", "HEAD", "OPTIONS", "PATCH", "POST", "PUT"]
+      cached_methods           = ["GET", "HEAD"]
+      cache_policy_id          = local.caching_disabled_policy_id
+      origin_request_policy_id = local.all_viewer_except_host_policy_id
+    }
+  }
+
+  restrictions {
+    geo_restriction {
+      restriction_type = "none"
+    }
+  }
+
+  viewer_certificate {
+    cloudfront_default_certificate = true
+  }
+
+  tags = merge(var.common_tags, {
+    Name = "${var.prefix}-${var.project_name}-edge-cache"
+  })
+}
@@ -74,3 +74,13 @@ output "access_logs_group" {
   description = "CloudWatch log group for API Gateway access logs (if enabled)"
   value       = var.enable_access_logs ? aws_cloudwatch_log_group.api_gateway_logs[0] : null
 }
+
+output "edge_cache_url" {
+  description = "URL of the CloudFront edge cache in front of the API (if enabled)"
+  value       = var.edge_cache.enabled ? "https://${aws_cloudfront_distribution.api[0].domain_name}" : null
+}
+
+output "edge_cache_distribution_id" {
+  description = "ID of the CloudFront distribution (if enabled)"
+  value       = var.edge_cache.enabled ? aws_cloudfront_distribution.api[0].id : null
+}
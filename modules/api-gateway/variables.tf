@@ -29,8 +29,9 @@ variable "routes" {
 variable "lambda_functions" {
   description = "Map of Lambda function resources from lambda-function module"
   type = map(object({
-    invoke_arn       = string
-    source_code_hash = string
+    invoke_arn           = string
+    qualified_invoke_arn = optional(string)
+    source_code_hash     = string
   }))
 }
 
@@ -78,6 +79,12 @@ variable "integration_timeout_ms" {
   default     = 30000
 }
 
+variable "enable_detailed_metrics" {
+  description = "Whether to publish per-route CloudWatch metrics for the stage"
+  type        = bool
+  default     = false
+}
+
 variable "enable_access_logs" {
   description = "Whether to enable API Gateway access logs"
   type        = bool
@@ -99,6 +106,20 @@ variable "custom_domain" {
   default = null
 }
 
+variable "edge_cache" {
+  description = "Optional CloudFront distribution caching GET responses in front of the API"
+  type = object({
+    enabled                = bool
+    default_ttl            = optional(number, 0)
+    max_ttl                = optional(number, 300)
+    price_class            = optional(string, "PriceClass_100")
+    uncached_path_patterns = optional(list(string), [])
+  })
+  default = {
+    enabled = false
+  }
+}
+
 variable "common_tags" {
   description = "Common tags to apply to all resources"
   type        = map(string)
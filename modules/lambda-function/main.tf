@@ -2,24 +2,87 @@
 # This module creates Lambda functions with associated IAM roles, policies, and CloudWatch log groups
 
 locals {
+  # In monolith mode every function is packaged into one Lambda with the
+  # union of their source files, environment variables and IAM policies
+  monolith_function = {
+    source_file = var.monolith.source_file
+    handler     = var.monolith.handler
+    description = "Serves ${join(", ", keys(var.functions))}"
+    environment_vars = merge([
+      for config in values(var.functions) : config.environment_vars
+    ]...)
+    extra_files = merge(
+      { for config in values(var.functions) : basename(config.source_file) => config.source_file },
+      var.monolith.extra_files,
+      [for config in values(var.functions) : config.extra_files]...
+    )
+    iam_policies = flatten([for config in values(var.functions) : config.iam_policies])
+    publish      = anytrue([for config in values(var.functions) : config.publish])
+    alias        = try(coalesce([for config in values(var.functions) : config.alias]...), null)
+    # The combined function carries the traffic of every function it replaces
+    provisioned_concurrency = sum(concat([0], [for config in values(var.functions) : config.provisioned_concurrency]))
+    reserved_concurrency = anytrue([
+      for config in values(var.functions) : config.reserved_concurrency < 0
+    ]) ? -1 : sum(concat([0], [for config in values(var.functions) : config.reserved_concurrency]))
+    memory_size = try(max([
+      for config in values(var.functions) : config.memory_size if config.memory_size != null
+    ]...), null)
+    architectures = local.monolith_architectures
+    package_file  = var.monolith.package_file
+    # Layers built for another architecture (native extensions) would not load
+    layers = distinct(flatten([
+      for config in values(var.functions) : config.layers
+      if config.architectures == null || config.architectures == local.monolith_architectures
+    ]))
+  }
+  monolith_architectures = try(coalesce([for config in values(var.functions) : config.architectures]...), null)
+
+  deployed_functions = var.monolith.enabled ? { (var.monolith.name) = local.monolith_function } : var.functions
+
+  # Deployed function serving each key of var.functions
+  function_keys = {
+    for name in keys(var.functions) : name => var.monolith.enabled ? var.monolith.name : name
+  }
+
+  # Functions served through an alias, which API Gateway invokes instead of $LATEST
+  aliased_functions = {
+    for name, config in local.deployed_functions : name => config if config.alias != null
+  }
+
   # Create IAM policies for each function based on their requirements
   lambda_iam_policies = {
-    for name, config in var.functions : name => config.iam_policies
+    for name, config in local.deployed_functions : name => config.iam_policies
   }
 }
 
-# Create zip files for each Lambda function
+# Create zip files for each Lambda function without a prebuilt package_file
+# The handler file and any extra files (shared modules, templates) are packaged
+# side by side at the root of the archive
 data "archive_file" "lambda_zip" {
-  for_each = var.functions
+  for_each = {
+    for name, config in local.deployed_functions : name => config if config.package_file == null
+  }
 
   type        = "zip"
-  source_file = each.value.source_file
   output_path = "${path.root}/${each.key}_lambda.zip"
+
+  source {
+    content  = file(each.value.source_file)
+    filename = basename(each.value.source_file)
+  }
+
+  dynamic "source" {
+    for_each = each.value.extra_files
+    content {
+      content  = file(source.value)
+      filename = source.key
+    }
+  }
 }
 
 # CloudWatch Log Groups for Lambda functions
 resource "aws_cloudwatch_log_group" "lambda_logs" {
-  for_each = var.functions
+  for_each = local.deployed_functions
 
   name              = "/aws/lambda/${var.prefix}-${var.project_name}-${each.key}"
   retention_in_days = var.log_retention_days
@@ -31,7 +94,7 @@ resource "aws_cloudwatch_log_group" "lambda_logs" {
 
 # IAM roles for Lambda execution (one per function)
 resource "aws_iam_role" "lambda_execution_role" {
-  for_each = var.functions
+  for_each = local.deployed_functions
 
   name = "${var.prefix}-${var.project_name}-${each.key}-role"
 
@@ -99,7 +162,7 @@ resource "aws_iam_policy" "lambda_function_policies" {
 
 # Attach logging policy to all Lambda roles
 resource "aws_iam_role_policy_attachment" "lambda_logs" {
-  for_each = var.functions
+  for_each = local.deployed_functions
 
   role       = aws_iam_role.lambda_execution_role[each.key].name
   policy_arn = aws_iam_policy.lambda_logging.arn
@@ -107,34 +170,58 @@ resource "aws_iam_role_policy_attachment" "lambda_logs" {
 
 # Attach function-specific policies to Lambda roles
 resource "aws_iam_role_policy_attachment" "lambda_policies" {
-  for_each = var.functions
+  for_each = local.deployed_functions
 
   role       = aws_iam_role.lambda_execution_role[each.key].name
   policy_arn = aws_iam_policy.lambda_function_policies[each.key].arn
 }
 
+# Allow functions to send traces when tracing is Active
+resource "aws_iam_role_policy_attachment" "xray" {
+  for_each = var.tracing_mode == "Active" ? local.deployed_functions : {}
+
+  role       = aws_iam_role.lambda_execution_role[each.key].name
+  policy_arn = "arn:aws:iam::aws:policy/AWSXRayDaemonWriteAccess"
+}
+
 # Lambda functions
 resource "aws_lambda_function" "functions" {
-  for_each = var.functions
+  for_each = local.deployed_functions
 
-  filename      = data.archive_file.lambda_zip[each.key].output_path
+  filename      = coalesce(each.value.package_file, try(data.archive_file.lambda_zip[each.key].output_path, null))
   function_name = "${var.prefix}-${var.project_name}-${each.key}"
   role          = aws_iam_role.lambda_execution_role[each.key].arn
   handler       = each.value.handler
   runtime       = var.runtime
   timeout       = var.timeout
-  memory_size   = var.memory_size
+  memory_size   = coalesce(each.value.memory_size, var.memory_size)
+  architectures = each.value.architectures
   description   = each.value.description
 
-  source_code_hash = data.archive_file.lambda_zip[each.key].output_base64sha256
+  # Aliases point at a published version
+  publish                        = each.value.publish || each.value.alias != null
+  reserved_concurrent_executions = each.value.reserved_concurrency
+
+  layers = each.value.layers
+
+  source_code_hash = (
+    each.value.package_file != null
+    ? filebase64sha256(each.value.package_file)
+    : try(data.archive_file.lambda_zip[each.key].output_base64sha256, null)
+  )
 
   environment {
     variables = each.value.environment_vars
   }
 
+  tracing_config {
+    mode = var.tracing_mode
+  }
+
   depends_on = [
     aws_iam_role_policy_attachment.lambda_policies,
     aws_iam_role_policy_attachment.lambda_logs,
+    aws_iam_role_policy_attachment.xray,
     aws_cloudwatch_log_group.lambda_logs,
   ]
 
@@ -143,13 +230,34 @@ resource "aws_lambda_function" "functions" {
   })
 }
 
-# Lambda permissions for API Gateway to invoke functions
+# Aliases tracking the latest published version
+resource "aws_lambda_alias" "functions" {
+  for_each = local.aliased_functions
+
+  name             = each.value.alias
+  function_name    = aws_lambda_function.functions[each.key].function_name
+  function_version = aws_lambda_function.functions[each.key].version
+}
+
+# Pre-initialized execution environments behind the alias
+resource "aws_lambda_provisioned_concurrency_config" "functions" {
+  for_each = {
+    for name, config in local.aliased_functions : name => config if config.provisioned_concurrency > 0
+  }
+
+  function_name                     = aws_lambda_function.functions[each.key].function_name
+  qualifier                         = aws_lambda_alias.functions[each.key].name
+  provisioned_concurrent_executions = each.value.provisioned_concurrency
+}
+
+# Lambda permissions for API Gateway to invoke functions (through the alias when there is one)
 resource "aws_lambda_permission" "api_gateway_invoke" {
-  for_each = var.functions
+  for_each = local.deployed_functions
 
   statement_id  = "AllowExecutionFromAPIGateway-${each.key}"
   action        = "lambda:InvokeFunction"
   function_name = aws_lambda_function.functions[each.key].function_name
+  qualifier     = each.value.alias
   principal     = "apigateway.amazonaws.com"
   source_arn    = "${var.api_gateway_execution_arn}/*/*"
 }
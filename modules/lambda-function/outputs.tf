@@ -1,41 +1,63 @@
 # Lambda Function Module Outputs
 
+# Outputs are keyed by the keys of var.functions. In monolith mode they all
+# point at the single combined function.
 output "functions" {
   description = "Map of Lambda function resources"
-  value       = aws_lambda_function.functions
+  value = {
+    for key, target in local.function_keys : key => aws_lambda_function.functions[target]
+  }
 }
 
 output "function_names" {
   description = "Map of Lambda function names"
   value = {
-    for key, func in aws_lambda_function.functions : key => func.function_name
+    for key, target in local.function_keys : key => aws_lambda_function.functions[target].function_name
   }
 }
 
 output "function_arns" {
   description = "Map of Lambda function ARNs"
   value = {
-    for key, func in aws_lambda_function.functions : key => func.arn
+    for key, target in local.function_keys : key => aws_lambda_function.functions[target].arn
   }
 }
 
 output "function_invoke_arns" {
   description = "Map of Lambda function invoke ARNs"
   value = {
-    for key, func in aws_lambda_function.functions : key => func.invoke_arn
+    for key, target in local.function_keys : key => aws_lambda_function.functions[target].invoke_arn
+  }
+}
+
+output "qualified_invoke_arns" {
+  description = "Map of invoke ARNs to integrate against: the alias when there is one, otherwise the function"
+  value = {
+    for key, target in local.function_keys : key => (
+      contains(keys(aws_lambda_alias.functions), target)
+      ? aws_lambda_alias.functions[target].invoke_arn
+      : aws_lambda_function.functions[target].invoke_arn
+    )
+  }
+}
+
+output "function_versions" {
+  description = "Map of published Lambda function versions ($LATEST when not published)"
+  value = {
+    for key, target in local.function_keys : key => aws_lambda_function.functions[target].version
   }
 }
 
 output "execution_roles" {
   description = "Map of Lambda execution role ARNs"
   value = {
-    for key, role in aws_iam_role.lambda_execution_role : key => role.arn
+    for key, target in local.function_keys : key => aws_iam_role.lambda_execution_role[target].arn
   }
 }
 
 output "log_groups" {
   description = "Map of CloudWatch log group names"
   value = {
-    for key, log_group in aws_cloudwatch_log_group.lambda_logs : key => log_group.name
+    for key, target in local.function_keys : key => aws_cloudwatch_log_group.lambda_logs[target].name
   }
 }
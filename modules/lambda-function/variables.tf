@@ -22,12 +22,54 @@ variable "functions" {
     handler          = string
     description      = string
     environment_vars = map(string)
+    extra_files      = optional(map(string), {})
     iam_policies = list(object({
       effect    = string
       actions   = list(string)
       resources = list(string)
     }))
+    publish                 = optional(bool, false)
+    alias                   = optional(string)
+    provisioned_concurrency = optional(number, 0)
+    reserved_concurrency    = optional(number, -1)
+    memory_size             = optional(number)
+    architectures           = optional(list(string))
+    package_file            = optional(string)
+    layers                  = optional(list(string), [])
   }))
+  validation {
+    condition = alltrue([
+      for config in values(var.functions) : config.provisioned_concurrency == 0 || config.alias != null
+    ])
+    error_message = "Provisioned concurrency needs an alias to attach to."
+  }
+  validation {
+    condition = alltrue(flatten([
+      for config in values(var.functions) : [
+        for architecture in coalesce(config.architectures, ["x86_64"]) : contains(["x86_64", "arm64"], architecture)
+      ]
+    ]))
+    error_message = "Architectures must be x86_64 or arm64."
+  }
+}
+
+variable "monolith" {
+  description = "Deploy every function as one Lambda whose handler dispatches on the route"
+  type = object({
+    enabled      = bool
+    name         = optional(string, "app")
+    source_file  = optional(string)
+    handler      = optional(string)
+    extra_files  = optional(map(string), {})
+    package_file = optional(string)
+  })
+  default = {
+    enabled = false
+  }
+  validation {
+    condition     = !var.monolith.enabled || (var.monolith.source_file != null && var.monolith.handler != null)
+    error_message = "A monolith needs a source_file and a handler."
+  }
 }
 
 variable "runtime" {
@@ -43,11 +85,21 @@ variable "timeout" {
 }
 
 variable "memory_size" {
-  description = "Lambda function memory size in MB"
+  description = "Lambda function memory size in MB, for functions that do not set their own"
   type        = number
   default     = 128
 }
 
+variable "tracing_mode" {
+  description = "X-Ray tracing mode of every function: Active samples and records traces, PassThrough only propagates the trace header"
+  type        = string
+  default     = "PassThrough"
+  validation {
+    condition     = contains(["Active", "PassThrough"], var.tracing_mode)
+    error_message = "tracing_mode must be Active or PassThrough."
+  }
+}
+
 variable "log_retention_days" {
   description = "CloudWatch log retention in days"
   type        = number
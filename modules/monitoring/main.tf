@@ -0,0 +1,189 @@
+# Monitoring Module
+# This module creates a CloudWatch dashboard and alarms over the Embedded Metric
+# Format metrics emitted by the Lambda handlers (src/metrics.py)
+
+locals {
+  # Monolith deployments map every key to the same function
+  functions      = sort(distinct(values(var.function_names)))
+  dashboard_name = "${var.prefix}-${var.project_name}"
+
+  phase_metrics = ["Latency", "ParseLatency", "DynamoDBLatency", "S3Latency", "SerializeLatency"]
+
+  # One row of three widgets per function
+  function_widgets = flatten([
+    for index, function_name in local.functions : [
+      {
+        type   = "metric"
+        x      = 0
+        y      = index * 6
+        width  = 8
+        height = 6
+        properties = {
+          title  = "${function_name}: p99 latency by phase (ms)"
+          region = var.aws_region
+          view   = "timeSeries"
+          period = 60
+          stat   = "p99"
+          metrics = [
+            for metric in local.phase_metrics : [var.metrics_namespace, metric, "Function", function_name]
+          ]
+        }
+      },
+      {
+        type   = "metric"
+        x      = 8
+        y      = index * 6
+        width  = 8
+        height = 6
+        properties = {
+          title  = "${function_name}: cache hit ratio (%)"
+          region = var.aws_region
+          view   = "timeSeries"
+          period = 60
+          stat   = "Sum"
+          yAxis  = { left = { min = 0, max = 100 } }
+          metrics = [
+            [{ expression = "100 * lh / (lh + lm)", label = "Lookup cache", id = "lookup" }],
+            [{ expression = "100 * ph / (ph + pm)", label = "Page cache", id = "page" }],
+            [var.metrics_namespace, "LookupCacheHits", "Function", function_name, { id = "lh", visible = false }],
+            [var.metrics_namespace, "LookupCacheMisses", "Function", function_name, { id = "lm", visible = false }],
+            [var.metrics_namespace, "PageCacheHits", "Function", function_name, { id = "ph", visible = false }],
+            [var.metrics_namespace, "PageCacheMisses", "Function", function_name, { id = "pm", visible = false }],
+          ]
+        }
+      },
+      {
+        type   = "metric"
+        x      = 16
+        y      = index * 6
+        width  = 8
+        height = 6
+        properties = {
+          title  = "${function_name}: cold starts, errors and read capacity"
+          region = var.aws_region
+          view   = "timeSeries"
+          period = 60
+          stat   = "Sum"
+          metrics = [
+            for metric in ["ColdStart", "4XXError", "5XXError", "ConsumedReadCapacity"] :
+            [var.metrics_namespace, metric, "Function", function_name]
+          ]
+        }
+      },
+    ]
+  ])
+
+  api_widgets = var.api_id == null ? [] : [
+    {
+      type   = "metric"
+      x      = 0
+      y      = length(local.functions) * 6
+      width  = 12
+      height = 6
+      properties = {
+        title  = "API Gateway: p99 latency (ms)"
+        region = var.aws_region
+        view   = "timeSeries"
+        period = 60
+        stat   = "p99"
+        metrics = [
+          ["AWS/ApiGateway", "Latency", "ApiId", var.api_id],
+          ["AWS/ApiGateway", "IntegrationLatency", "ApiId", var.api_id],
+        ]
+      }
+    },
+    {
+      type   = "metric"
+      x      = 12
+      y      = length(local.functions) * 6
+      width  = 12
+      height = 6
+      properties = {
+        title  = "API Gateway: requests and errors"
+        region = var.aws_region
+        view   = "timeSeries"
+        period = 60
+        stat   = "Sum"
+        metrics = [
+          ["AWS/ApiGateway", "Count", "ApiId", var.api_id],
+          ["AWS/ApiGateway", "4xx", "ApiId", var.api_id],
+          ["AWS/ApiGateway", "5xx", "ApiId", var.api_id],
+        ]
+      }
+    },
+  ]
+}
+
+resource "aws_cloudwatch_dashboard" "this" {
+  dashboard_name = local.dashboard_name
+  dashboard_body = jsonencode({
+    widgets = concat(local.function_widgets, local.api_widgets)
+  })
+}
+
+# Alarms per function on the hot path
+resource "aws_cloudwatch_metric_alarm" "latency" {
+  for_each = toset(local.functions)
+
+  alarm_name          = "${each.value}-p99-latency"
+  comparison_operator = "GreaterThanThreshold"
+  evaluation_periods  = var.alarm_evaluation_periods
+  metric_name         = "Latency"
+  namespace           = var.metrics_namespace
+  period              = var.alarm_period
+  extended_statistic  = "p99"
+  threshold           = var.latency_alarm_threshold_ms
+  treat_missing_data  = "notBreaching"
+  alarm_description   = "p99 handler latency of ${each.value} is above ${var.latency_alarm_threshold_ms} ms"
+  alarm_actions       = var.alarm_actions
+
+  dimensions = {
+    Function = each.value
+  }
+
+  tags = var.common_tags
+}
+
+resource "aws_cloudwatch_metric_alarm" "dynamodb_latency" {
+  for_each = toset(local.functions)
+
+  alarm_name          = "${each.value}-p99-dynamodb-latency"
+  comparison_operator = "GreaterThanThreshold"
+  evaluation_periods  = var.alarm_evaluation_periods
+  metric_name         = "DynamoDBLatency"
+  namespace           = var.metrics_namespace
+  period              = var.alarm_period
+  extended_statistic  = "p99"
+  threshold           = var.dynamodb_latency_alarm_threshold_ms
+  treat_missing_data  = "notBreaching"
+  alarm_description   = "p99 DynamoDB call latency of ${each.value} is above ${var.dynamodb_latency_alarm_threshold_ms} ms"
+  alarm_actions       = var.alarm_actions
+
+  dimensions = {
+    Function = each.value
+  }
+
+  tags = var.common_tags
+}
+
+resource "aws_cloudwatch_metric_alarm" "errors" {
+  for_each = toset(local.functions)
+
+  alarm_name          = "${each.value}-5xx-errors"
+  comparison_operator = "GreaterThanThreshold"
+  evaluation_periods  = var.alarm_evaluation_periods
+  metric_name         = "5XXError"
+  namespace           = var.metrics_namespace
+  period              = var.alarm_period
+  statistic           = "Sum"
+  threshold           = var.error_alarm_threshold
+  treat_missing_data  = "notBreaching"
+  alarm_description   = "${each.value} returned more than ${var.error_alarm_threshold} 5xx responses per period"
+  alarm_actions       = var.alarm_actions
+
+  dimensions = {
+    Function = each.value
+  }
+
+  tags = var.common_tags
+}
@@ -0,0 +1,22 @@
+# Monitoring Module Outputs
+
+output "dashboard_name" {
+  description = "Name of the CloudWatch dashboard"
+  value       = aws_cloudwatch_dashboard.this.dashboard_name
+}
+
+output "dashboard_url" {
+  description = "Console URL of the CloudWatch dashboard"
+  value       = "https://${var.aws_region}.console.aws.amazon.com/cloudwatch/home?region=${var.aws_region}#dashboards:name=${aws_cloudwatch_dashboard.this.dashboard_name}"
+}
+
+output "alarm_arns" {
+  description = "Map of alarm ARNs by alarm name"
+  value = {
+    for alarm in concat(
+      values(aws_cloudwatch_metric_alarm.latency),
+      values(aws_cloudwatch_metric_alarm.dynamodb_latency),
+      values(aws_cloudwatch_metric_alarm.errors),
+    ) : alarm.alarm_name => alarm.arn
+  }
+}
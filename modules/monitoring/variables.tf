@@ -0,0 +1,74 @@
+# Monitoring Module Variables
+
+variable "prefix" {
+  description = "Prefix for resource names"
+  type        = string
+}
+
+variable "project_name" {
+  description = "Name of the project for resource naming"
+  type        = string
+}
+
+variable "aws_region" {
+  description = "AWS region of the monitored resources"
+  type        = string
+}
+
+variable "function_names" {
+  description = "Map of Lambda function names to monitor (duplicate names are monitored once)"
+  type        = map(string)
+}
+
+variable "metrics_namespace" {
+  description = "CloudWatch namespace of the handlers' Embedded Metric Format metrics"
+  type        = string
+}
+
+variable "api_id" {
+  description = "ID of the HTTP API whose AWS/ApiGateway metrics are added to the dashboard"
+  type        = string
+  default     = null
+}
+
+variable "latency_alarm_threshold_ms" {
+  description = "p99 handler latency (ms) above which the latency alarm fires"
+  type        = number
+  default     = 1000
+}
+
+variable "dynamodb_latency_alarm_threshold_ms" {
+  description = "p99 DynamoDB call latency (ms) above which the DynamoDB latency alarm fires"
+  type        = number
+  default     = 100
+}
+
+variable "error_alarm_threshold" {
+  description = "Number of 5xx responses per period above which the error alarm fires"
+  type        = number
+  default     = 0
+}
+
+variable "alarm_period" {
+  description = "Period (seconds) over which alarm statistics are computed"
+  type        = number
+  default     = 300
+}
+
+variable "alarm_evaluation_periods" {
+  description = "Number of periods that must breach before an alarm fires"
+  type        = number
+  default     = 2
+}
+
+variable "alarm_actions" {
+  description = "List of ARNs to notify when an alarm triggers"
+  type        = list(string)
+  default     = []
+}
+
+variable "common_tags" {
+  description = "Common tags to apply to all resources"
+  type        = map(string)
+  default     = {}
+}
@@ -0,0 +1,162 @@
+#!/usr/bin/env python3
+"""
+Deterministic Lambda packaging for the handlers in src/
+
+Builds two artifacts in packaging/dist/:
+
+1. dependencies-layer-<architecture>.zip - a Lambda layer per architecture
+   (x86_64, arm64) with the pinned dependencies in requirements-layer.txt,
+   installed for that architecture's platform since Brotli and wrapt ship C
+   extensions. It is trimmed to the botocore/boto3 service models the handlers
+   and the X-Ray SDK use, with tests and stale bytecode removed.
+2. functions.zip - every module in src/ plus the HTML pages, shipped with
+   precompiled bytecode.
+
+Bytecode is compiled into the regular __pycache__/*.pyc files, which the
+runtime loads without -O. It uses the unchecked-hash format, so there are no
+source mtimes and the runtime never compares bytecode with its source. Zip
+entries are sorted and carry fixed timestamps and permissions, so the same
+inputs always produce the same bytes and terraform's source_code_hash only
+changes when the code does.
+
+Our own modules are compiled with --optimize (default 2, which strips
+asserts and docstrings). Third-party code in the layer may rely on either, so
+it uses --layer-optimize (default 0).
+
+Bytecode is tied to the interpreter's minor version, so run this with the
+same Python as the Lambda runtime (see --python-version).
+
+Usage:
+    python packaging/build.py
+    python packaging/build.py --skip-layer --optimize 1
+    python packaging/build.py --python-version 3.9 --architectures arm64
+"""
+
+import argparse
+import hashlib
+import importlib.util
+import py_compile
+import shutil
+import subprocess
+import sys
+import tempfile
+import zipfile
+from pathlib import Path
+
+project_root = Path(__file__).parent.parent
+src_dir = project_root / "src"
+html_dir = project_root / "html"
+dist_dir = Path(__file__).parent / "dist"
+requirements = Path(__file__).parent / "requirements-layer.txt"
+
+# Service models kept in the layer; everything else in botocore/boto3 data is dropped
+# (xray is used by aws_xray_sdk to fetch sampling rules)
+KEEP_SERVICES = {"dynamodb", "s3", "sts", "xray"}
+TRIMMED_DIRS = {"tests", "__pycache__"}
+# pip platform tag of each Lambda architecture
+ARCHITECTURE_PLATFORMS = {"x86_64": "manylinux2014_x86_64", "arm64": "manylinux2014_aarch64"}
+
+ZIP_DATE_TIME = (1980, 1, 1, 0, 0, 0)
+
+
+def write_deterministic_zip(root, output):
+    """Zip ``root`` with sorted entries, fixed timestamps and fixed permissions"""
+    files = sorted(path for path in root.rglob("*") if path.is_file())
+    with zipfile.ZipFile(output, "w", zipfile.ZIP_DEFLATED) as archive:
+        for path in files:
+            info = zipfile.ZipInfo(path.relative_to(root).as_posix(), ZIP_DATE_TIME)
+            info.external_attr = 0o644 << 16
+            info.compress_type = zipfile.ZIP_DEFLATED
+            archive.writestr(info, path.read_bytes())
+    return hashlib.sha256(output.read_bytes()).hexdigest()
+
+
+def compile_tree(root, optimize):
+    """Compile every .py under ``root`` into unchecked-hash __pycache__ bytecode"""
+    for path in sorted(root.rglob("*.py")):
+        py_compile.compile(
+            str(path),
+            cfile=importlib.util.cache_from_source(str(path)),
+            dfile=path.relative_to(root).as_posix(),
+            doraise=True,
+            optimize=optimize,
+            invalidation_mode=py_compile.PycInvalidationMode.UNCHECKED_HASH,
+        )
+
+
+def trim_layer(site_dir):
+    for path in sorted(site_dir.rglob("*"), reverse=True):
+        if path.is_dir() and path.name in TRIMMED_DIRS:
+            shutil.rmtree(path)
+    for package in ("botocore", "boto3"):
+        data_dir = site_dir / package / "data"
+        if not data_dir.is_dir():
+            continue
+        for service_dir in data_dir.iterdir():
+            if service_dir.is_dir() and service_dir.name not in KEEP_SERVICES:
+                shutil.rmtree(service_dir)
+
+
+def build_layer(work_dir, architecture, args):
+    layer_dir = work_dir / f"layer-{architecture}"
+    site_dir = layer_dir / "python"
+    subprocess.run(
+        [sys.executable, "-m", "pip", "install", "--quiet", "--no-compile", "--no-deps",
+         "--target", str(site_dir), "--requirement", str(requirements),
+         "--platform", ARCHITECTURE_PLATFORMS[architecture], "--implementation", "cp",
+         "--python-version", args.python_version, "--only-binary=:all:"],
+        check=True,
+    )
+    trim_layer(site_dir)
+    if not args.no_bytecode:
+        compile_tree(site_dir, args.layer_optimize)
+    return write_deterministic_zip(layer_dir, dist_dir / f"dependencies-layer-{architecture}.zip")
+
+
+def build_functions(work_dir, args):
+    package_dir = work_dir / "functions"
+    package_dir.mkdir()
+    for path in sorted(src_dir.glob("*.py")):
+        shutil.copyfile(path, package_dir / path.name)
+    for path in sorted(html_dir.glob("*.html")):
+        shutil.copyfile(path, package_dir / path.name)
+    if not args.no_bytecode:
+        compile_tree(package_dir, args.optimize)
+    return write_deterministic_zip(package_dir, dist_dir / "functions.zip")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build the Lambda layer and function packages")
+    parser.add_argument("--python-version", default="3.9", help="Lambda runtime Python version")
+    parser.add_argument("--architectures", nargs="+", default=sorted(ARCHITECTURE_PLATFORMS),
+                        choices=sorted(ARCHITECTURE_PLATFORMS), help="Architectures to build a layer for")
+    parser.add_argument("--optimize", type=int, default=2, choices=(0, 1, 2),
+                        help="Bytecode optimization level of src/ (2 strips asserts and docstrings)")
+    parser.add_argument("--layer-optimize", type=int, default=0, choices=(0, 1, 2),
+                        help="Bytecode optimization level of the third-party code in the layers")
+    parser.add_argument("--no-bytecode", action="store_true", help="Ship sources only")
+    parser.add_argument("--skip-layer", action="store_true", help="Only build functions.zip")
+    args = parser.parse_args()
+
+    running = f"{sys.version_info.major}.{sys.version_info.minor}"
+    if not args.no_bytecode and running != args.python_version:
+        print(f"❌ Bytecode for Python {args.python_version} must be compiled by Python "
+              f"{args.python_version}, not {running} (or pass --no-bytecode)")
+        sys.exit(1)
+
+    dist_dir.mkdir(exist_ok=True)
+    print("🚀 Building Lambda packages")
+    print("=" * 60)
+    with tempfile.TemporaryDirectory() as tmp:
+        work_dir = Path(tmp)
+        digest = build_functions(work_dir, args)
+        print(f"✅ functions.zip           sha256 {digest}")
+        if not args.skip_layer:
+            for architecture in args.architectures:
+                digest = build_layer(work_dir, architecture, args)
+                print(f"✅ dependencies-layer-{architecture}.zip  sha256 {digest}")
+    print(f"\n📝 Packages written to {dist_dir}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,25 @@
+"""
+Combined handler that serves every route from a single Lambda function.
+
+The routers of the individual handlers are merged, so register and verify
+share one warm container, one set of boto3 clients and the page and lookup
+caches. Unknown routes get a 404.
+"""
+import hello_world
+import register_user
+import verify_user
+from metrics import metered_handler
+from resilience import request_deadline
+from router import Router
+from structured_logging import logged_handler
+
+router = Router()
+for handler_module in (hello_world, register_user, verify_user):
+    router.include(handler_module.router)
+
+
+@logged_handler("app")
+@metered_handler("app")
+def lambda_handler(event, context):
+    with request_deadline(context):
+        return router.dispatch(event, context)
@@ -0,0 +1,132 @@
+"""
+Shared AWS client layer for the Lambda handlers.
+
+Clients and resources are created lazily on first use and cached for the
+lifetime of the execution environment, so warm invocations reuse resolved
+credentials, endpoints and keep-alive HTTP connections instead of paying for
+them on every request.
+
+boto3 itself is only imported when the first client is built, so importing a
+handler stays cheap and requests that never reach AWS (validation errors,
+cached lookups of bundled pages) never pay for it.
+"""
+import threading
+from os import getenv
+
+_lock = threading.Lock()
+_clients = {}
+_resources = {}
+_tables = {}
+_config = None
+
+
+def client_config():
+    """Return the botocore Config shared by every client, importing botocore on first use."""
+    global _config
+    if _config is None:
+        from botocore.config import Config
+
+        # Short timeouts so a slow connection is retried instead of holding the
+        # request; adaptive mode also rate-limits retries while throttled
+        _config = Config(
+            tcp_keepalive=True,
+            max_pool_connections=int(getenv("AWS_MAX_POOL_CONNECTIONS", "10")),
+            connect_timeout=float(getenv("AWS_CONNECT_TIMEOUT_SECONDS", "1")),
+            read_timeout=float(getenv("AWS_READ_TIMEOUT_SECONDS", "2")),
+            retries={
+                "mode": getenv("AWS_RETRY_MODE", "adaptive"),
+                "max_attempts": int(getenv("AWS_MAX_ATTEMPTS", "3")),
+            },
+        )
+    return _config
+
+
+def get_client(service_name):
+    """Return the cached low-level client for ``service_name``."""
+    client = _clients.get(service_name)
+    if client is None:
+        with _lock:
+            client = _clients.get(service_name)
+            if client is None:
+                import boto3
+
+                client = boto3.client(service_name, config=client_config())
+                _clients[service_name] = client
+    return client
+
+
+def get_resource(service_name):
+    """Return the cached service resource for ``service_name``."""
+    resource = _resources.get(service_name)
+    if resource is None:
+        with _lock:
+            resource = _resources.get(service_name)
+            if resource is None:
+                import boto3
+
+                resource = boto3.resource(service_name, config=client_config())
+                _resources[service_name] = resource
+    return resource
+
+
+def get_s3_client():
+    return get_client("s3")
+
+
+def get_dynamodb_client():
+    """Return the cached low-level DynamoDB client.
+
+    Unlike the Table resource, low-level clients are thread-safe, so reads
+    that may be hedged on a second thread (see resilience.call) use this.
+    """
+    return get_client("dynamodb")
+
+
+def get_dynamodb_table(table_name=None):
+    """
+    Return the cached DynamoDB Table for ``table_name``.
+
+    The name defaults to ``DB_TABLE_NAME`` and is read on every call, so a
+    changed environment picks up a new Table without a reset.
+    """
+    table_name = table_name or getenv("DB_TABLE_NAME")
+    table = _tables.get(table_name)
+    if table is None:
+        table = get_resource("dynamodb").Table(table_name)
+        _tables[table_name] = table
+    return table
+
+
+def get_website_bucket():
+    return getenv("WEBSITE_S3")
+
+
+def error_code(error):
+    """The AWS error code of a botocore ClientError, or None for any other exception.
+
+    Reading it from the error's response keeps botocore.exceptions out of the
+    import path.
+    """
+    return getattr(error, "response", {}).get("Error", {}).get("Code")
+
+
+def install_client(service_name, client):
+    """Use ``client`` for ``service_name`` (local stand-ins for tests and benchmarks)."""
+    with _lock:
+        _clients[service_name] = client
+
+
+def install_resource(service_name, resource):
+    """Use ``resource`` for ``service_name`` (local stand-ins for tests and benchmarks)."""
+    with _lock:
+        _resources[service_name] = resource
+        if service_name == "dynamodb":
+            _tables.clear()
+
+
+def reset_clients():
+    """Drop every cached client, resource and table (used by tests)."""
+    with _lock:
+        _clients.clear()
+        _resources.clear()
+        _tables.clear()
@@ -0,0 +1,127 @@
+"""
+Chunked DynamoDB batch operations with retry of unprocessed items.
+
+BatchWriteItem accepts at most 25 put requests and BatchGetItem at most 100
+keys per call. Items or keys DynamoDB could not process (throttling, partition
+limits) are retried with exponential backoff and every entry gets an
+individual outcome.
+"""
+import logging
+import random
+import time
+from os import getenv
+
+from aws_clients import get_resource
+from metrics import record_error
+from resilience import call
+from structured_logging import log
+
+BATCH_WRITE_LIMIT = 25
+BATCH_GET_LIMIT = 100
+MAX_ATTEMPTS = int(getenv("BATCH_MAX_ATTEMPTS", "5"))
+BASE_DELAY_SECONDS = float(getenv("BATCH_BASE_DELAY_SECONDS", "0.05"))
+
+
+def chunked(items, size):
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
+
+
+def backoff_delay(attempt, base_delay=BASE_DELAY_SECONDS):
+    """Exponential backoff with full jitter for retry number ``attempt`` (0-based)."""
+    return random.uniform(0, base_delay * (2 ** attempt))
+
+
+def batch_write_items(items, key_attribute, table_name=None,
+                      max_attempts=MAX_ATTEMPTS, sleep=None):
+    """
+    Put ``items`` into ``table_name`` with BatchWriteItem.
+
+    Returns a dict mapping each item's ``key_attribute`` value to ``None`` on
+    success or to an error message when the item could not be written.
+    """
+    table_name = table_name or getenv("DB_TABLE_NAME")
+    sleep = sleep or time.sleep
+    dynamodb = get_resource("dynamodb")
+    outcomes = {}
+
+    for chunk in chunked(items, BATCH_WRITE_LIMIT):
+        pending = chunk
+        for attempt in range(max_attempts):
+            try:
+                response = call("dynamodb.batch_write_item", dynamodb.batch_write_item, RequestItems={
+                    table_name: [{"PutRequest": {"Item": item}} for item in pending]
+                })
+            except Exception as err:
+                log(logging.ERROR, "Error writing batch", error=str(err), items=len(pending))
+                record_error(err)
+                for item in pending:
+                    outcomes[item[key_attribute]] = str(err)
+                pending = []
+                break
+
+            unprocessed = response.get("UnprocessedItems", {}).get(table_name, [])
+            unprocessed_items = [request["PutRequest"]["Item"] for request in unprocessed]
+            unprocessed_keys = {item[key_attribute] for item in unprocessed_items}
+            for item in pending:
+                if item[key_attribute] not in unprocessed_keys:
+                    outcomes[item[key_attribute]] = None
+
+            pending = unprocessed_items
+            if not pending:
+                break
+            if attempt + 1 < max_attempts:
+                sleep(backoff_delay(attempt))
+
+        for item in pending:
+            outcomes[item[key_attribute]] = "Unprocessed after retries"
+
+    return outcomes
+
+
+def batch_get_keys(key_values, key_attribute, table_name=None,
+                   max_attempts=MAX_ATTEMPTS, sleep=None):
+    """
+    Look up ``key_values`` in ``table_name`` with BatchGetItem.
+
+    Only the key attribute is projected. Returns a dict mapping each key value
+    to True (found), False (not found) or None when it could not be resolved.
+    """
+    table_name = table_name or getenv("DB_TABLE_NAME")
+    sleep = sleep or time.sleep
+    dynamodb = get_resource("dynamodb")
+    outcomes = {}
+
+    for chunk in chunked(list(dict.fromkeys(key_values)), BATCH_GET_LIMIT):
+        pending = [{key_attribute: value} for value in chunk]
+        for attempt in range(max_attempts):
+            try:
+                response = call("dynamodb.batch_get_item", dynamodb.batch_get_item, RequestItems={
+                    table_name: {
+                        "Keys": pending,
+                        "ProjectionExpression": "#k",
+                        "ExpressionAttributeNames": {"#k": key_attribute},
+                    }
+                })
+            except Exception as err:
+                log(logging.ERROR, "Error reading batch", error=str(err), keys=len(pending))
+                record_error(err)
+                break
+
+            for item in response.get("Responses", {}).get(table_name, []):
+                outcomes[item[key_attribute]] = True
+
+            pending = response.get("UnprocessedKeys", {}).get(table_name, {}).get("Keys", [])
+            if not pending:
+                break
+            if attempt + 1 < max_attempts:
+                sleep(backoff_delay(attempt))
+
+        unresolved = {key[key_attribute] for key in pending}
+        for value in chunk:
+            if value in unresolved:
+                outcomes[value] = None
+            else:
+                outcomes.setdefault(value, False)
+
+    return outcomes
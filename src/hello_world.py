@@ -1,41 +1,22 @@
-import json
-import logging
+from metrics import metered_handler
+from router import Router, json_response
+from structured_logging import logged_handler
 
-# Configure logging
-logger = logging.getLogger()
-logger.setLevel(logging.INFO)
+HELLO_ROUTE_KEY = "GET /hello"
+HELLO_WORLD = json_response(200, {"message": "Hello world"})
 
+router = Router()
 
+
+@logged_handler("hello_world")
+@metered_handler("hello_world")
 def lambda_handler(event, context):
+    return router.dispatch(event, context)
+
+
+@router.route(HELLO_ROUTE_KEY, default=True)
+def hello_handler(event, context):
     """
-    Simple Lambda function that returns 'Hello world' for Milestone 1
+    Simple route that returns 'Hello world' for Milestone 1
     """
-    logger.info("Hello World Lambda function invoked")
-    logger.info(f"Event: {json.dumps(event)}")
-    
-    try:
-        # Simple response for Milestone 1
-        response = {
-            "statusCode": 200,
-            "headers": {
-                "Content-Type": "application/json"
-            },
-            "body": json.dumps({
-                "message": "Hello world"
-            })
-        }
-        
-        logger.info("Successfully returning Hello world response")
-        return response
-        
-    except Exception as e:
-        logger.error(f"Error in Lambda function: {str(e)}")
-        return {
-            "statusCode": 500,
-            "headers": {
-                "Content-Type": "application/json"
-            },
-            "body": json.dumps({
-                "message": "Internal server error"
-            })
-        }
+    return HELLO_WORLD
@@ -0,0 +1,120 @@
+"""
+Per-container cache of DynamoDB key lookups used by verify_user.is_key_in_db.
+
+Recent hits and recent misses are kept in two bounded, TTL-based LRUs so that
+repeated lookups of the same userId (scrapers, retrying clients) do not each
+cost a GetItem. Misses get a shorter TTL because a user registered through
+another container cannot invalidate this one; verify_user only records a
+miss that a strongly consistent read confirmed.
+"""
+import threading
+import time
+from collections import OrderedDict
+from os import getenv
+
+from metrics import put_metric
+
+
+class TTLCache:
+    """A bounded LRU whose entries expire ``ttl_seconds`` after insertion."""
+
+    def __init__(self, max_entries, ttl_seconds, clock=time.monotonic):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._clock = clock
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __contains__(self, key):
+        with self._lock:
+            expires_at = self._entries.get(key)
+            if expires_at is None:
+                return False
+            if expires_at <= self._clock():
+                del self._entries[key]
+                return False
+            self._entries.move_to_end(key)
+            return True
+
+    def __len__(self):
+        return len(self._entries)
+
+    def add(self, key):
+        if self.max_entries <= 0 or self.ttl_seconds <= 0:
+            return
+        with self._lock:
+            self._entries[key] = self._clock() + self.ttl_seconds
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def discard(self, key):
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+def cache_key(db_key):
+    return tuple(sorted(db_key.items()))
+
+
+class LookupCache:
+    def __init__(self, max_entries, ttl_seconds, negative_ttl_seconds, clock=time.monotonic):
+        self.found = TTLCache(max_entries, ttl_seconds, clock)
+        self.not_found = TTLCache(max_entries, negative_ttl_seconds, clock)
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, db_key):
+        """Return True/False for a cached lookup, or None when the table must be read."""
+        cached = self.peek(db_key)
+        if cached is None:
+            self.misses += 1
+            put_metric("LookupCacheMisses", 1)
+        else:
+            self.hits += 1
+            put_metric("LookupCacheHits", 1)
+        return cached
+
+    def peek(self, db_key):
+        """Like ``get``, without counting towards the hit/miss statistics (for writers)."""
+        key = cache_key(db_key)
+        if key in self.found:
+            return True
+        if key in self.not_found:
+            return False
+        return None
+
+    def record(self, db_key, item_found):
+        key = cache_key(db_key)
+        if item_found:
+            self.not_found.discard(key)
+            self.found.add(key)
+        else:
+            self.found.discard(key)
+            self.not_found.add(key)
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {
+            "found_entries": len(self.found),
+            "not_found_entries": len(self.not_found),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+        }
+
+    def clear(self):
+        self.found.clear()
+        self.not_found.clear()
+        self.hits = self.misses = 0
+
+
+lookup_cache = LookupCache(
+    max_entries=int(getenv("LOOKUP_CACHE_MAX_ENTRIES", "1024")),
+    ttl_seconds=float(getenv("LOOKUP_CACHE_TTL_SECONDS", "60")),
+    negative_ttl_seconds=float(getenv("LOOKUP_CACHE_NEGATIVE_TTL_SECONDS", "10")),
+)
@@ -0,0 +1,152 @@
+"""
+CloudWatch metrics for the Lambda handlers in Embedded Metric Format (EMF).
+
+Each invocation wrapped with ``metered_handler`` writes one EMF JSON line to
+stdout. CloudWatch Logs extracts the metrics from the log stream, so emitting
+them costs no API call and adds no latency to the request. The line has the
+total and per-phase latency (parse, DynamoDB, S3, serialize), cache hits and
+misses, the cold-start flag, consumed read capacity and the 4xx/5xx outcome.
+Errors get one extra line each, with an ``ErrorClass`` dimension.
+
+Metrics use the ``Function`` dimension (the Lambda function name) under
+``METRICS_NAMESPACE``. Set ``METRICS=off`` to disable them.
+
+The lines are written directly to stdout, not through ``logging``: the Lambda
+runtime prefixes logging output, and EMF needs each log event to be pure JSON.
+"""
+import functools
+import json
+import sys
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from os import getenv
+
+from aws_clients import error_code
+from router import status_of
+
+METRICS_ENABLED = getenv("METRICS", "on") == "on"
+NAMESPACE = getenv("METRICS_NAMESPACE", "UserService")
+
+MILLISECONDS = "Milliseconds"
+COUNT = "Count"
+
+# Latency metric of each AWS service called through resilience.call
+SERVICE_PHASES = {"dynamodb": "DynamoDB", "s3": "S3"}
+
+_current = ContextVar("request_metrics", default=None)
+_cold_start = True
+
+
+class RequestMetrics:
+    """Metric values and error classes collected during one invocation."""
+
+    __slots__ = ("values", "units", "errors")
+
+    def __init__(self):
+        self.values = {}
+        self.units = {}
+        self.errors = []
+
+    def add(self, name, value, unit):
+        self.values[name] = self.values.get(name, 0) + value
+        self.units[name] = unit
+
+
+def put_metric(name, value, unit=COUNT):
+    """Add ``value`` to metric ``name`` of the current invocation."""
+    current = _current.get()
+    if current is not None:
+        current.add(name, value, unit)
+
+
+def record_latency(phase, seconds):
+    put_metric(f"{phase}Latency", round(seconds * 1000, 3), MILLISECONDS)
+
+
+@contextmanager
+def phase(name):
+    """Time the enclosed block as ``<name>Latency``."""
+    if _current.get() is None:
+        yield
+        return
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        record_latency(name, time.perf_counter() - start)
+
+
+def record_call(operation, seconds):
+    """Record an AWS call such as "dynamodb.get_item" under its service's phase."""
+    phase_name = SERVICE_PHASES.get(operation.partition(".")[0])
+    if phase_name is not None:
+        record_latency(phase_name, seconds)
+
+
+def record_error(error):
+    """Count ``error`` under its AWS error code, or its exception class."""
+    current = _current.get()
+    if current is not None:
+        code = error_code(error)
+        current.errors.append(code or type(error).__name__)
+
+
+def metered_handler(handler_name):
+    """Wrap a Lambda handler so each invocation emits its metrics as EMF."""
+    def decorator(handler):
+        if not METRICS_ENABLED:
+            return handler
+
+        @functools.wraps(handler)
+        def wrapper(event, context):
+            global _cold_start
+            cold_start, _cold_start = _cold_start, False
+            current = RequestMetrics()
+            token = _current.set(current)
+            start = time.perf_counter()
+            status = 500
+            try:
+                response = handler(event, context)
+                status = status_of(response)
+                return response
+            finally:
+                _current.reset(token)
+                current.add("Latency", round((time.perf_counter() - start) * 1000, 3), MILLISECONDS)
+                current.add("ColdStart", int(cold_start), COUNT)
+                current.add("4XXError", int(400 <= status < 500), COUNT)
+                current.add("5XXError", int(status >= 500), COUNT)
+                function_name = getenv("AWS_LAMBDA_FUNCTION_NAME", handler_name)
+                route = event.get("routeKey") if isinstance(event, dict) else None
+                emit(function_name, current, {"Route": route, "Handler": handler_name})
+        return wrapper
+    return decorator
+
+
+def emit(function_name, current, properties, stream=None):
+    """Write the EMF lines for one invocation."""
+    stream = stream or sys.stdout
+    timestamp = int(time.time() * 1000)
+    lines = [_document(timestamp, ["Function"], {"Function": function_name, **properties},
+                       current.values, current.units)]
+    for error_class in current.errors:
+        lines.append(_document(timestamp, ["Function", "ErrorClass"],
+                               {"Function": function_name, "ErrorClass": error_class, **properties},
+                               {"Errors": 1}, {"Errors": COUNT}))
+    stream.write("".join(lines))
+
+
+def _document(timestamp, dimensions, properties, values, units):
+    document = {
+        "_aws": {
+            "Timestamp": timestamp,
+            "CloudWatchMetrics": [{
+                "Namespace": NAMESPACE,
+                "Dimensions": [dimensions],
+                "Metrics": [{"Name": name, "Unit": units[name]} for name in values],
+            }],
+        },
+        **properties,
+        **values,
+    }
+    return json.dumps(document, separators=(",", ":")) + "\n"
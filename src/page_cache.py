@@ -0,0 +1,204 @@
+"""
+Per-container cache of the HTML pages served by verify_user.
+
+Pages are kept in memory for ``PAGE_CACHE_TTL_SECONDS``. Once an entry expires
+it is revalidated with a conditional GET on its ETag, so an unchanged object
+costs a 304 instead of a full body transfer.
+
+With ``PAGE_SOURCE=bundled`` the pages packaged next to the handler are loaded
+once at import time and served without any I/O; S3 is only used for pages that
+were not bundled.
+
+Compressed variants of a page (gzip, and Brotli when the ``brotli`` package is
+available, e.g. from the dependency layer) are computed once per page body and
+kept base64-encoded, ready to be returned with ``isBase64Encoded``.
+"""
+import base64
+import gzip
+import hashlib
+import threading
+import time
+from os import getenv
+from pathlib import Path
+
+from aws_clients import error_code, get_s3_client, get_website_bucket
+from metrics import put_metric
+from resilience import call
+
+try:
+    import brotli
+except ImportError:  # not part of the Lambda runtime
+    brotli = None
+
+DEFAULT_TTL_SECONDS = 300
+PAGE_FILES = ("index.html", "error.html")
+MAX_DERIVED_VALUES = 32
+
+_derived = {}
+
+# Content codings in order of preference
+COMPRESSORS = {}
+if brotli is not None:
+    COMPRESSORS["br"] = lambda data: brotli.compress(data, mode=brotli.MODE_TEXT, quality=11)
+COMPRESSORS["gzip"] = lambda data: gzip.compress(data, compresslevel=9, mtime=0)
+ENCODINGS = tuple(COMPRESSORS)
+
+
+class CachedPage:
+    __slots__ = ("body", "etag", "fetched_at")
+
+    def __init__(self, body, etag, fetched_at):
+        self.body = body
+        self.etag = etag
+        self.fetched_at = fetched_at
+
+
+def fetch_s3_page(key, etag=None):
+    """
+    Fetch ``key`` from the website bucket.
+
+    Returns ``(body, etag)``, or ``None`` when ``etag`` is given and S3 answers
+    304 Not Modified.
+    """
+    request = {"Bucket": get_website_bucket(), "Key": key}
+    if etag:
+        request["IfNoneMatch"] = etag
+    try:
+        return call("s3.get_object", _get_object, request, idempotent=True)
+    except Exception as err:
+        # botocore raises ClientError for a 304
+        if etag and error_code(err) in ("304", "NotModified"):
+            return None
+        raise
+
+
+def _get_object(request):
+    response = get_s3_client().get_object(**request)
+    return response["Body"].read().decode("utf-8"), response.get("ETag")
+
+
+def load_bundled_pages(directory=Path(__file__).parent, names=PAGE_FILES):
+    """Read the pages packaged in ``directory``, skipping any that are missing."""
+    pages = {}
+    for name in names:
+        path = Path(directory) / name
+        if path.is_file():
+            pages[name] = path.read_text(encoding="utf-8")
+    return pages
+
+
+def derive(body, kind, compute):
+    """
+    Return ``compute(body)``, computed once per page body and ``kind``.
+
+    Used for values derived from a page such as its ETag, so they cost a dict
+    lookup per request instead of hashing the body again. The cached bodies
+    are the same str objects on every hit, so the lookup never compares the
+    page contents.
+    """
+    key = (kind, body)
+    value = _derived.get(key)
+    if value is None:
+        if len(_derived) >= MAX_DERIVED_VALUES:
+            _derived.clear()
+        value = _derived[key] = compute(body)
+    return value
+
+
+def content_etag(body):
+    """A strong ETag for ``body``, derived from its content."""
+    return derive(body, "etag", lambda text: f'"{hashlib.sha256(text.encode("utf-8")).hexdigest()[:32]}"')
+
+
+def compressed_body(body, encoding):
+    """
+    ``body`` compressed with ``encoding`` and base64-encoded, or None when
+    compressing would not make it smaller.
+    """
+    def compress(text):
+        raw = text.encode("utf-8")
+        data = COMPRESSORS[encoding](raw)
+        # False rather than None so derive() remembers the result
+        return base64.b64encode(data).decode("ascii") if len(data) < len(raw) else False
+
+    return derive(body, encoding, compress) or None
+
+
+class PageCache:
+    def __init__(self, fetch=fetch_s3_page, ttl_seconds=None, clock=time.monotonic, bundled=None):
+        if ttl_seconds is None:
+            ttl_seconds = float(getenv("PAGE_CACHE_TTL_SECONDS", DEFAULT_TTL_SECONDS))
+        self.ttl_seconds = ttl_seconds
+        self.bundled = dict(bundled or {})
+        self._fetch = fetch
+        self._clock = clock
+        self._pages = {}
+        self._lock = threading.Lock()
+        self.bundled_hits = 0
+        self.hits = 0
+        self.misses = 0
+        self.revalidations = 0
+        self.not_modified = 0
+
+    def get(self, key):
+        """Return the body of ``key``, going to the origin only when needed."""
+        bundled_body = self.bundled.get(key)
+        if bundled_body is not None:
+            self.bundled_hits += 1
+            put_metric("PageCacheHits", 1)
+            return bundled_body
+
+        now = self._clock()
+        page = self._pages.get(key)
+        if page is not None and now - page.fetched_at < self.ttl_seconds:
+            self.hits += 1
+            put_metric("PageCacheHits", 1)
+            return page.body
+
+        put_metric("PageCacheMisses", 1)
+
+        if page is None:
+            self.misses += 1
+            body, etag = self._fetch(key)
+        else:
+            self.revalidations += 1
+            fetched = self._fetch(key, page.etag)
+            if fetched is None:
+                self.not_modified += 1
+                body, etag = page.body, page.etag
+            else:
+                body, etag = fetched
+
+        with self._lock:
+            self._pages[key] = CachedPage(body, etag, now)
+        return body
+
+    def needs_origin(self, key):
+        """Whether get(key) would have to go to the origin right now."""
+        if key in self.bundled:
+            return False
+        page = self._pages.get(key)
+        return page is None or self._clock() - page.fetched_at >= self.ttl_seconds
+
+    def stats(self):
+        served_from_memory = self.bundled_hits + self.hits
+        lookups = served_from_memory + self.misses + self.revalidations
+        return {
+            "bundled_hits": self.bundled_hits,
+            "hits": self.hits,
+            "misses": self.misses,
+            "revalidations": self.revalidations,
+            "not_modified": self.not_modified,
+            "origin_gets": self.misses + self.revalidations,
+            "hit_ratio": round(served_from_memory / lookups, 4) if lookups else 0.0,
+        }
+
+    def clear(self):
+        with self._lock:
+            self._pages.clear()
+        self.bundled_hits = self.hits = self.misses = self.revalidations = self.not_modified = 0
+
+
+page_cache = PageCache(
+    bundled=load_bundled_pages() if getenv("PAGE_SOURCE", "s3") == "bundled" else None
+)
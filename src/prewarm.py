@@ -0,0 +1,44 @@
+"""
+Warm-up work run while a Lambda execution environment initializes.
+
+Provisioned-concurrency (and SnapStart) environments are initialized before
+any request arrives, so work done at import time there is free: handlers
+pass the steps that would otherwise slow their first request (creating
+clients, filling caches) to ``prewarm``. On on-demand environments the init
+phase is part of the cold start, so by default nothing runs there.
+
+PREWARM=auto (default) warms only when AWS_LAMBDA_INITIALIZATION_TYPE says
+the environment is pre-initialized, PREWARM=on always warms and PREWARM=off
+never does.
+"""
+import logging
+import time
+from os import getenv
+
+from structured_logging import log
+
+PREINITIALIZED_TYPES = ("provisioned-concurrency", "snap-start")
+
+
+def should_prewarm():
+    mode = getenv("PREWARM", "auto")
+    if mode == "auto":
+        return getenv("AWS_LAMBDA_INITIALIZATION_TYPE") in PREINITIALIZED_TYPES
+    return mode == "on"
+
+
+def prewarm(*steps):
+    """Run each warm-up step once; failures are logged and left for the first request."""
+    if not should_prewarm():
+        return False
+    start = time.perf_counter()
+    failed = []
+    for step in steps:
+        try:
+            step()
+        except Exception as error_details:
+            failed.append(getattr(step, "__name__", repr(step)))
+            log(logging.WARNING, "Prewarm step failed", step=failed[-1], error=str(error_details))
+    log(logging.INFO, "Prewarmed", duration_ms=round((time.perf_counter() - start) * 1000, 3),
+        steps=len(steps), failed=failed)
+    return True
@@ -1,15 +1,210 @@
-import boto3
+import json
+import logging
+import time
 from os import getenv
-from urllib.parse import parse_qsl
 
+from aws_clients import error_code, get_dynamodb_table
+from dynamodb_batch import batch_write_items
+from lookup_cache import lookup_cache
+from metrics import metered_handler, phase, record_error
+from prewarm import prewarm
+from request_body import parse_batch_body
+from resilience import call, request_deadline
+from request_schema import (
+    HASH_KEY,
+    IDEMPOTENCY_KEY_PREFIX,
+    ValidationError,
+    parse_query_string,
+    validate_user,
+)
+from router import Router, json_response
+from structured_logging import annotate, log, logged_handler
 
+ROUTE_KEY = "PUT /register"
+BATCH_ROUTE_KEY = "POST /register/batch"
+MAX_BATCH_ITEMS = int(getenv("MAX_BATCH_ITEMS", "1000"))
+# "conditional" never rewrites an existing user, "overwrite" always puts the item
+REGISTER_MODE = getenv("REGISTER_MODE", "conditional")
+IDEMPOTENCY_TTL_SECONDS = int(getenv("IDEMPOTENCY_TTL_SECONDS", "0"))
+IDEMPOTENCY_TTL_ATTRIBUTE = getenv("IDEMPOTENCY_TTL_ATTRIBUTE", "expiresAt")
+
+REGISTERED = json_response(200, {"message": "Registered User Successfully"})
+ALREADY_REGISTERED = json_response(200, {"message": "User Already Registered"})
+REGISTER_ERROR = json_response(500, {"message": "Error registering user. Check Logs for more details."})
+
+router = Router()
+
+
+@logged_handler("register_user")
+@metered_handler("register_user")
 def lambda_handler(event, context):
-    query_string = dict(parse_qsl(event["rawQueryString"]))
-    client = boto3.resource("dynamodb")
-    db_table = client.Table(getenv("DB_TABLE_NAME"))
+    with request_deadline(context):
+        return router.dispatch(event, context)
+
+
+@router.route(ROUTE_KEY, default=True)
+def register_handler(event, context):
+    try:
+        with phase("Parse"):
+            user = validate_user(parse_query_string(event.get("rawQueryString")))
+    except ValidationError as error_details:
+        annotate(validation_error=str(error_details))
+        return json_response(400, {"message": f"Error registering user: {error_details}"})
+
+    idempotency_key = (event.get("headers") or {}).get("idempotency-key")
+    if not idempotency_key or IDEMPOTENCY_TTL_SECONDS <= 0:
+        return register(user)
+
+    replayed = load_idempotent_response(idempotency_key)
+    if replayed is not None:
+        annotate(idempotent_replay=True)
+        return replayed
+    response = register(user)
+    if response is not REGISTER_ERROR:
+        save_idempotent_response(idempotency_key, response)
+    return response
+
+
+def register(user):
+    """Write ``user`` according to REGISTER_MODE and return the response."""
+    conditional = REGISTER_MODE == "conditional"
+    if conditional and lookup_cache.peek({HASH_KEY: user[HASH_KEY]}) is True:
+        annotate(register_result="already_registered", write="skipped")
+        return ALREADY_REGISTERED
+
+    try:
+        status = put_user(user, conditional)
+    except Exception as error_details:
+        log(logging.ERROR, "Error registering user", error=str(error_details))
+        record_error(error_details)
+        return REGISTER_ERROR
+    annotate(register_result=status)
+    return REGISTERED if status == "registered" else ALREADY_REGISTERED
+
+
+def put_user(user, conditional):
+    """
+    Put ``user`` and return "registered", or "already_registered" when
+    ``conditional`` and the user exists. Other write errors are raised.
+    """
+    options = {}
+    if conditional:
+        options = {
+            "ConditionExpression": "attribute_not_exists(#k)",
+            "ExpressionAttributeNames": {"#k": HASH_KEY},
+        }
+    try:
+        call("dynamodb.put_item", get_dynamodb_table().put_item, Item=user, **options)
+    except Exception as error_details:
+        if error_code(error_details) != "ConditionalCheckFailedException":
+            raise
+        status = "already_registered"
+    else:
+        status = "registered"
+    lookup_cache.record({HASH_KEY: user[HASH_KEY]}, True)
+    return status
+
+
+def _idempotency_item_key(idempotency_key):
+    return {HASH_KEY: f"{IDEMPOTENCY_KEY_PREFIX}{idempotency_key}"}
+
+
+def load_idempotent_response(idempotency_key):
+    """Return the stored response for ``idempotency_key``, or None if there is none."""
+    try:
+        # Not marked idempotent: the Table resource is not thread-safe, so this read is never hedged
+        item = call(
+            "dynamodb.get_item", get_dynamodb_table().get_item,
+            Key=_idempotency_item_key(idempotency_key), ConsistentRead=True,
+        ).get("Item")
+    except Exception as error_details:
+        log(logging.WARNING, "Error reading idempotency record", error=str(error_details))
+        return None
+    # DynamoDB deletes expired items lazily, so the expiry is checked here too
+    if item is None or item.get(IDEMPOTENCY_TTL_ATTRIBUTE, 0) <= time.time():
+        return None
+    return json.loads(item["response"])
+
+
+def save_idempotent_response(idempotency_key, response):
+    record = {
+        **_idempotency_item_key(idempotency_key),
+        "response": json.dumps(response),
+        IDEMPOTENCY_TTL_ATTRIBUTE: int(time.time()) + IDEMPOTENCY_TTL_SECONDS,
+    }
     try:
-        response = db_table.put_item(Item=query_string)
-        return { "message": "Registered User Successfully" }
+        call("dynamodb.put_item", get_dynamodb_table().put_item, Item=record)
     except Exception as error_details:
-        print(error_details)
-        return { "message": "Error registering user. Check Logs for more details." }
+        log(logging.WARNING, "Error storing idempotency record", error=str(error_details))
+
+
+@router.route(BATCH_ROUTE_KEY)
+def batch_lambda_handler(event, context):
+    try:
+        with phase("Parse"):
+            users = parse_batch_body(event, "users")
+    except ValueError as error_details:
+        log(logging.WARNING, "Invalid batch body", error=str(error_details))
+        return json_response(400, {"message": f"Invalid batch body: {error_details}"})
+
+    if len(users) > MAX_BATCH_ITEMS:
+        return json_response(400, {"message": f"Batch exceeds {MAX_BATCH_ITEMS} users"})
+
+    results = []
+    items = {}
+    for user in users:
+        try:
+            validate_user(user)
+        except ValidationError as error_details:
+            user_id = user.get(HASH_KEY) if isinstance(user, dict) else None
+            results.append({HASH_KEY: user_id, "status": "invalid", "error": str(error_details)})
+            continue
+        if REGISTER_MODE == "conditional" and lookup_cache.peek({HASH_KEY: user[HASH_KEY]}) is True:
+            results.append({HASH_KEY: user[HASH_KEY], "status": "already_registered"})
+            continue
+        # A batch may not contain the same key twice, so the last entry wins
+        items[user[HASH_KEY]] = user
+
+    if REGISTER_MODE == "conditional":
+        results.extend(conditional_put_users(items.values()))
+    else:
+        outcomes = batch_write_items(list(items.values()), key_attribute=HASH_KEY)
+        for user_id, error in outcomes.items():
+            if error is None:
+                lookup_cache.record({HASH_KEY: user_id}, True)
+                results.append({HASH_KEY: user_id, "status": "registered"})
+            else:
+                results.append({HASH_KEY: user_id, "status": "failed", "error": error})
+
+    registered = sum(1 for result in results if result["status"] in ("registered", "already_registered"))
+    annotate(batch_size=len(results), registered=registered)
+    status_code = 200 if registered == len(results) else 207
+    with phase("Serialize"):
+        return json_response(status_code, {
+            "registered": registered,
+            "failed": len(results) - registered,
+            "results": results,
+        })
+
+
+def conditional_put_users(users):
+    """
+    Results of writing each of ``users`` with a conditional PutItem.
+
+    BatchWriteItem cannot take a condition and would silently rewrite existing
+    users, so conditional mode pays one PutItem per user instead.
+    """
+    results = []
+    for user in users:
+        try:
+            status = put_user(user, conditional=True)
+        except Exception as error_details:
+            log(logging.ERROR, "Error registering user", error=str(error_details), user_id=user[HASH_KEY])
+            record_error(error_details)
+            results.append({HASH_KEY: user[HASH_KEY], "status": "failed", "error": str(error_details)})
+        else:
+            results.append({HASH_KEY: user[HASH_KEY], "status": status})
+    return results
+
+
+prewarm(get_dynamodb_table)
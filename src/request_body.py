@@ -0,0 +1,39 @@
+"""
+Helpers for reading API Gateway payload v2 request bodies.
+"""
+import base64
+import json
+
+
+def read_body(event):
+    """Return the request body as text, decoding base64 bodies."""
+    body = event.get("body") or ""
+    if event.get("isBase64Encoded"):
+        body = base64.b64decode(body).decode("utf-8")
+    return body
+
+
+def parse_batch_body(event, list_field):
+    """
+    Parse a batch request body into a list of entries.
+
+    Accepts a JSON array, a JSON object holding the array under ``list_field``,
+    or NDJSON with one JSON value per line. Raises ValueError otherwise.
+    """
+    body = read_body(event)
+    if not body.strip():
+        raise ValueError("empty body")
+
+    try:
+        parsed = json.loads(body)
+    except json.JSONDecodeError:
+        try:
+            return [json.loads(line) for line in body.splitlines() if line.strip()]
+        except json.JSONDecodeError as err:
+            raise ValueError(f"not JSON or NDJSON ({err})")
+
+    if isinstance(parsed, dict):
+        parsed = parsed.get(list_field, [parsed])
+    if not isinstance(parsed, list):
+        raise ValueError(f"expected a list of {list_field}")
+    return parsed
@@ -0,0 +1,73 @@
+"""
+Request schema shared by register_user and verify_user.
+
+Query strings are parsed the same way by both handlers and validated before
+any AWS call: the hash key is required, only whitelisted attributes are
+accepted, keys may not repeat, and values and whole items are size-capped so
+clients cannot grow items (and every later read of them) without bound.
+"""
+from os import getenv
+from urllib.parse import parse_qsl
+
+HASH_KEY = getenv("DB_HASH_KEY", "userId")
+ALLOWED_ATTRIBUTES = frozenset(
+    name.strip()
+    for name in getenv("REGISTER_ALLOWED_ATTRIBUTES", HASH_KEY).split(",")
+    if name.strip()
+) | {HASH_KEY}
+MAX_VALUE_LENGTH = int(getenv("MAX_ATTRIBUTE_LENGTH", "256"))
+MAX_ITEM_BYTES = int(getenv("MAX_ITEM_BYTES", "2048"))
+# Hash key values with this prefix hold register_user idempotency records
+IDEMPOTENCY_KEY_PREFIX = "idempotency#"
+
+
+class ValidationError(ValueError):
+    pass
+
+
+def parse_query_string(raw_query_string):
+    """Parse a raw query string into a dict, rejecting repeated keys."""
+    pairs = parse_qsl(raw_query_string or "", keep_blank_values=True)
+    attributes = {}
+    for name, value in pairs:
+        if name in attributes:
+            raise ValidationError(f"Duplicate parameter: {name}")
+        attributes[name] = value
+    return attributes
+
+
+def _check_value(name, value):
+    if not isinstance(value, str):
+        raise ValidationError(f"{name} must be a string")
+    if not value:
+        raise ValidationError(f"{name} must not be empty")
+    if len(value) > MAX_VALUE_LENGTH:
+        raise ValidationError(f"{name} exceeds {MAX_VALUE_LENGTH} characters")
+    if name == HASH_KEY and value.startswith(IDEMPOTENCY_KEY_PREFIX):
+        raise ValidationError(f"{name} may not start with {IDEMPOTENCY_KEY_PREFIX}")
+
+
+def validate_user(attributes):
+    """Validate a user item for registration and return it."""
+    if not isinstance(attributes, dict):
+        raise ValidationError("User must be an object")
+    if HASH_KEY not in attributes:
+        raise ValidationError(f"Missing {HASH_KEY}")
+    unknown = sorted(set(attributes) - ALLOWED_ATTRIBUTES)
+    if unknown:
+        raise ValidationError(f"Unsupported attributes: {', '.join(unknown)}")
+    for name, value in attributes.items():
+        _check_value(name, value)
+    item_bytes = sum(len(name.encode("utf-8")) + len(value.encode("utf-8"))
+                     for name, value in attributes.items())
+    if item_bytes > MAX_ITEM_BYTES:
+        raise ValidationError(f"Item exceeds {MAX_ITEM_BYTES} bytes")
+    return attributes
+
+
+def validate_key(attributes):
+    """Validate a lookup key, which must hold exactly the hash key, and return it."""
+    if set(attributes) != {HASH_KEY}:
+        raise ValidationError(f"Expected exactly one parameter: {HASH_KEY}")
+    _check_value(HASH_KEY, attributes[HASH_KEY])
+    return attributes
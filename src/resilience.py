@@ -0,0 +1,174 @@
+"""
+Deadline and hedging policy for the DynamoDB and S3 calls of the handlers.
+
+Clients already use explicit connect/read timeouts and botocore's adaptive
+retry mode (see aws_clients.client_config). On top of that, each call goes
+through ``call``, which:
+
+- enforces the deadline that ``request_deadline`` derives from the Lambda
+  context's remaining time, minus ``DEADLINE_MARGIN_MS`` kept back to build
+  the response: no call is started once it has passed, and a hedged call
+  that is still outstanding at the deadline is abandoned;
+- with ``HEDGE_READS=on``, sends a second identical request for idempotent
+  reads that are still outstanding after the operation's observed p95
+  latency (``HEDGE_PERCENTILE``), and returns whichever answers first.
+
+Only hedged calls go through the worker pool, since the two attempts run at
+the same time; their function must therefore be thread-safe (a low-level
+client method, not a boto3 resource/Table one). Every other call runs inline
+on the calling thread, bounded by the client timeouts.
+"""
+import contextvars
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from contextlib import contextmanager
+from os import getenv
+
+from metrics import record_call
+from structured_logging import annotate
+from tracing import subsegment
+
+DEADLINE_ENABLED = getenv("REQUEST_DEADLINE", "on") == "on"
+DEADLINE_MARGIN_MS = float(getenv("DEADLINE_MARGIN_MS", "200"))
+HEDGE_READS = getenv("HEDGE_READS", "off") == "on"
+HEDGE_PERCENTILE = float(getenv("HEDGE_PERCENTILE", "0.95"))
+HEDGE_MIN_SAMPLES = int(getenv("HEDGE_MIN_SAMPLES", "20"))
+HEDGE_MIN_DELAY_MS = float(getenv("HEDGE_MIN_DELAY_MS", "5"))
+LATENCY_WINDOW = 200
+MAX_WORKERS = int(getenv("RESILIENCE_MAX_WORKERS", "8"))
+
+_deadline = contextvars.ContextVar("request_deadline", default=None)
+_executor = None
+_executor_lock = threading.Lock()
+
+
+class DeadlineExceeded(Exception):
+    """The request ran out of time before an AWS call returned."""
+
+
+class LatencyTracker:
+    """Rolling window of recent call latencies per operation."""
+
+    def __init__(self, window=LATENCY_WINDOW):
+        self.window = window
+        self._samples = {}
+        self._lock = threading.Lock()
+
+    def record(self, operation, seconds):
+        with self._lock:
+            samples = self._samples.get(operation)
+            if samples is None:
+                samples = self._samples[operation] = deque(maxlen=self.window)
+            samples.append(seconds)
+
+    def percentile(self, operation, fraction):
+        """The ``fraction`` latency percentile of ``operation``, or None with too few samples."""
+        with self._lock:
+            samples = sorted(self._samples.get(operation, ()))
+        if len(samples) < HEDGE_MIN_SAMPLES:
+            return None
+        return samples[min(len(samples) - 1, int(fraction * len(samples)))]
+
+    def clear(self):
+        with self._lock:
+            self._samples.clear()
+
+
+latencies = LatencyTracker()
+
+
+@contextmanager
+def request_deadline(context):
+    """Bound the AWS calls made while handling a request by ``context``'s remaining time."""
+    deadline = None
+    get_remaining = getattr(context, "get_remaining_time_in_millis", None)
+    if DEADLINE_ENABLED and get_remaining is not None:
+        deadline = time.monotonic() + (get_remaining() - DEADLINE_MARGIN_MS) / 1000
+    token = _deadline.set(deadline)
+    try:
+        yield
+    finally:
+        _deadline.reset(token)
+
+
+def remaining_seconds():
+    """Seconds left before the current request's deadline, or None without one."""
+    deadline = _deadline.get()
+    return None if deadline is None else deadline - time.monotonic()
+
+
+def call(operation, function, *args, idempotent=False, **kwargs):
+    """
+    Run ``function(*args, **kwargs)`` within the current request's deadline.
+
+    ``operation`` (e.g. "dynamodb.get_item") keys the latency statistics,
+    metrics and trace subsegment. Only ``idempotent`` calls are ever hedged,
+    so ``function`` must be thread-safe when ``idempotent`` is set.
+    """
+    start = time.perf_counter()
+    try:
+        with subsegment(operation):
+            return _call(operation, function, args, kwargs, idempotent)
+    finally:
+        record_call(operation, time.perf_counter() - start)
+
+
+def _call(operation, function, args, kwargs, idempotent):
+    remaining = remaining_seconds()
+    if remaining is not None and remaining <= 0:
+        raise DeadlineExceeded(f"No time left for {operation}")
+    hedge_delay = _hedge_delay(operation) if idempotent and HEDGE_READS else None
+    if hedge_delay is None or (remaining is not None and remaining <= hedge_delay):
+        return _timed(operation, function, args, kwargs)
+
+    executor = _get_executor()
+    futures = {executor.submit(_timed, operation, function, args, kwargs)}
+    done, _ = wait(futures, timeout=hedge_delay)
+    if not done:
+        annotate(hedged=operation)
+        futures.add(executor.submit(_timed, operation, function, args, kwargs))
+    return _first_result(futures, operation)
+
+
+def _timed(operation, function, args, kwargs):
+    start = time.perf_counter()
+    result = function(*args, **kwargs)
+    latencies.record(operation, time.perf_counter() - start)
+    return result
+
+
+def _hedge_delay(operation):
+    """Seconds to wait before hedging ``operation``, or None while there is no baseline."""
+    threshold = latencies.percentile(operation, HEDGE_PERCENTILE)
+    if threshold is None:
+        return None
+    return max(threshold, HEDGE_MIN_DELAY_MS / 1000)
+
+
+def _first_result(futures, operation):
+    """The first successful result of ``futures``, or the last error if all fail."""
+    error = None
+    pending = set(futures)
+    while pending:
+        remaining = remaining_seconds()
+        timeout = None if remaining is None else max(0.0, remaining)
+        done, pending = wait(pending, timeout=timeout, return_when=FIRST_COMPLETED)
+        if not done:
+            # The abandoned call finishes on its worker thread and is ignored
+            raise DeadlineExceeded(f"{operation} did not finish before the request deadline")
+        for future in done:
+            error = future.exception()
+            if error is None:
+                return future.result()
+    raise error
+
+
+def _get_executor():
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                _executor = ThreadPoolExecutor(max_workers=MAX_WORKERS, thread_name_prefix="resilience")
+    return _executor
@@ -0,0 +1,113 @@
+"""
+Shared response and routing layer for the Lambda handlers.
+
+Handlers register their routes on a ``Router`` keyed by the payload v2
+``routeKey`` and return responses built here, so every route answers with an
+explicit status code and content type. Headers and responses that never
+change are built once at import time; they are shared between invocations and
+must not be mutated. Routers can be combined with ``include`` so that one
+function serves every route (see app.py).
+"""
+import json
+
+JSON_HEADERS = {"Content-Type": "application/json"}
+HTML_HEADERS = {"Content-Type": "text/html"}
+
+
+def json_response(status_code, payload):
+    return {"statusCode": status_code, "headers": JSON_HEADERS, "body": json.dumps(payload)}
+
+
+def html_response(status_code, html_body, headers=None, is_base64_encoded=False):
+    response = {
+        "statusCode": status_code,
+        "headers": {**HTML_HEADERS, **headers} if headers else HTML_HEADERS,
+        "body": html_body,
+    }
+    if is_base64_encoded:
+        response["isBase64Encoded"] = True
+    return response
+
+
+def status_of(response):
+    """The status code of a handler's return value (API Gateway treats a non-dict as 200)."""
+    if isinstance(response, dict):
+        return response.get("statusCode", 200)
+    return 200
+
+
+def not_modified(headers):
+    """A 304 response, which carries the validators and caching headers but no body."""
+    return {"statusCode": 304, "headers": headers}
+
+
+def etag_matches(event, etag):
+    """Whether the request's If-None-Match header lists ``etag`` (weak comparison)."""
+    header = (event.get("headers") or {}).get("if-none-match")
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    return any(tag.strip().removeprefix("W/") == etag for tag in header.split(","))
+
+
+def negotiate_encoding(event, available):
+    """
+    The coding in ``available`` that the request's Accept-Encoding header
+    prefers, or None for an uncompressed response.
+
+    Ties on the q-value go to the earliest coding in ``available``.
+    """
+    header = (event.get("headers") or {}).get("accept-encoding")
+    if not header:
+        return None
+    weights = {}
+    for part in header.split(","):
+        coding, _, params = part.partition(";")
+        params = params.replace(" ", "")
+        try:
+            weight = float(params[2:]) if params.startswith("q=") else 1.0
+        except ValueError:
+            weight = 0.0
+        weights[coding.strip().lower()] = weight
+
+    best, best_weight = None, 0.0
+    for coding in available:
+        weight = weights.get(coding, weights.get("*", 0.0))
+        if weight > best_weight:
+            best, best_weight = coding, weight
+    return best
+
+
+NOT_FOUND = json_response(404, {"message": "Not Found"})
+
+
+class Router:
+    """Dispatch payload v2 events to handlers by ``routeKey``."""
+
+    def __init__(self):
+        self.routes = {}
+        self.default = None
+
+    def route(self, *route_keys, default=False):
+        """Register a handler for ``route_keys``; ``default`` also serves unknown routes."""
+        def decorator(handler):
+            for route_key in route_keys:
+                self.routes[route_key] = handler
+            if default:
+                self.default = handler
+            return handler
+        return decorator
+
+    def include(self, other):
+        """Serve every route of ``other`` from this router as well."""
+        self.routes.update(other.routes)
+
+    def resolve(self, route_key):
+        return self.routes.get(route_key, self.default)
+
+    def dispatch(self, event, context):
+        handler = self.resolve(event.get("routeKey"))
+        if handler is None:
+            return NOT_FOUND
+        return handler(event, context)
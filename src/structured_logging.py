@@ -0,0 +1,78 @@
+"""
+Structured, low-overhead logging for the Lambda handlers.
+
+Every invocation wrapped with ``logged_handler`` emits exactly one JSON line
+with the route, status, duration, cold-start flag and any fields the handler
+attached with ``annotate``. Full event payloads are only serialized for a
+sampled fraction of requests (``LOG_EVENT_SAMPLE_RATE``, 0.0-1.0), and
+nothing is formatted at all when the level is disabled.
+"""
+import functools
+import json
+import logging
+import random
+import time
+from contextvars import ContextVar
+from os import getenv
+
+from router import status_of
+
+logger = logging.getLogger()
+logger.setLevel(getenv("LOG_LEVEL", "INFO").upper())
+
+EVENT_SAMPLE_RATE = float(getenv("LOG_EVENT_SAMPLE_RATE", "0"))
+
+_current_fields = ContextVar("request_log_fields", default=None)
+_cold_start = True
+
+
+def log(level, message, **fields):
+    """Log ``message`` and ``fields`` as one JSON line, formatting only if enabled."""
+    if logger.isEnabledFor(level):
+        logger.log(level, json.dumps({"message": message, **fields}, default=str))
+
+
+def annotate(**fields):
+    """Attach fields to the current request's log line."""
+    current = _current_fields.get()
+    if current is not None:
+        current.update(fields)
+
+
+def logged_handler(handler_name):
+    """Wrap a Lambda handler so each invocation emits one structured log line."""
+    def decorator(handler):
+        @functools.wraps(handler)
+        def wrapper(event, context):
+            global _cold_start
+            cold_start, _cold_start = _cold_start, False
+            fields = {}
+            token = _current_fields.set(fields)
+            start = time.perf_counter()
+            status = 500
+            try:
+                response = handler(event, context)
+                status = status_of(response)
+                return response
+            finally:
+                _current_fields.reset(token)
+                if logger.isEnabledFor(logging.INFO):
+                    record = {
+                        "message": "request",
+                        "handler": handler_name,
+                        "request_id": getattr(context, "aws_request_id", None),
+                        "route": event.get("routeKey") if isinstance(event, dict) else None,
+                        "status": status,
+                        "duration_ms": round((time.perf_counter() - start) * 1000, 3),
+                        "cold_start": cold_start,
+                        **fields,
+                    }
+                    # Set by Lambda for each invocation; links the line to its X-Ray trace
+                    trace_id = getenv("_X_AMZN_TRACE_ID")
+                    if trace_id:
+                        record["trace_id"] = trace_id
+                    if EVENT_SAMPLE_RATE and random.random() < EVENT_SAMPLE_RATE:
+                        record["event"] = event
+                    logger.info(json.dumps(record, default=str))
+        return wrapper
+    return decorator
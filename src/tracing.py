@@ -0,0 +1,82 @@
+"""
+Optional X-Ray subsegments around the AWS calls of the handlers.
+
+With ``TRACING=xray`` (set when the function's tracing mode is Active), every
+call made through resilience.call is recorded as a subsegment of the Lambda
+invocation's segment. The trace then separates API Gateway, Lambda init,
+DynamoDB and S3 time. The X-Ray SDK is imported on the first traced call, and
+only when tracing is on, so a disabled tracer costs no imports and a shared
+no-op context manager per call. Without the SDK (it ships in the dependency
+layer, not the runtime) tracing logs one warning and stays off.
+
+Tests and local tools install a stand-in recorder with ``install_recorder``.
+It needs the ``begin_subsegment``/``end_subsegment`` subset of the SDK's
+recorder API.
+"""
+import logging
+import threading
+import traceback
+from contextlib import contextmanager, nullcontext
+from os import getenv
+
+from structured_logging import log
+
+TRACING_ENABLED = getenv("TRACING", "off") == "xray"
+
+_NOT_TRACED = nullcontext()
+_lock = threading.Lock()
+_recorder = None
+_loaded = False
+
+
+def get_recorder():
+    """The recorder to trace with, or None when tracing is off."""
+    global _recorder, _loaded
+    if _recorder is not None or _loaded or not TRACING_ENABLED:
+        return _recorder
+    with _lock:
+        if not _loaded:
+            _loaded = True
+            try:
+                from aws_xray_sdk.core import xray_recorder
+            except ImportError:
+                log(logging.WARNING, "TRACING=xray but aws_xray_sdk is not installed, tracing is off")
+            else:
+                # Fan-out threads record their calls under the invocation's segment too; a
+                # call with no segment at all (e.g. during init) is dropped instead of raising
+                xray_recorder.configure(context_missing="IGNORE_ERROR")
+                _recorder = xray_recorder
+    return _recorder
+
+
+def subsegment(name, **annotations):
+    """Trace the enclosed block as subsegment ``name`` (a no-op when tracing is off)."""
+    recorder = get_recorder()
+    if recorder is None:
+        return _NOT_TRACED
+    return _traced(recorder, name, annotations)
+
+
+@contextmanager
+def _traced(recorder, name, annotations):
+    segment = recorder.begin_subsegment(name, "aws")
+    if segment is None:
+        yield None
+        return
+    for key, value in annotations.items():
+        segment.put_annotation(key, value)
+    try:
+        yield segment
+    except Exception as error:
+        segment.add_exception(error, traceback.extract_stack())
+        raise
+    finally:
+        recorder.end_subsegment()
+
+
+def install_recorder(recorder):
+    """Trace with ``recorder`` (local stand-ins for tests), or stop tracing with None."""
+    global _recorder, _loaded
+    with _lock:
+        _recorder = recorder
+        _loaded = recorder is not None
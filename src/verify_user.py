@@ -1,36 +1,249 @@
-import boto3
+import contextvars
+import logging
+from concurrent.futures import ThreadPoolExecutor
 from os import getenv
-from urllib.parse import parse_qsl
 
+from aws_clients import get_dynamodb_client
+from dynamodb_batch import batch_get_keys
+from lookup_cache import lookup_cache
+from metrics import metered_handler, phase, put_metric, record_error
+from page_cache import ENCODINGS, PAGE_FILES, compressed_body, content_etag, page_cache
+from prewarm import prewarm
+from request_body import parse_batch_body
+from resilience import call, request_deadline
+from request_schema import HASH_KEY, ValidationError, parse_query_string, validate_key
+from router import Router, etag_matches, html_response, json_response, negotiate_encoding, not_modified
+from structured_logging import annotate, log, logged_handler
 
+ROUTE_KEY = "GET /"
+BATCH_ROUTE_KEY = "POST /verify/batch"
+MAX_BATCH_KEYS = int(getenv("MAX_BATCH_KEYS", "1000"))
+FANOUT_ENABLED = getenv("VERIFY_FANOUT", "on") == "on"
+# "projection" only reads back the key attributes, "full" reads the whole item
+READ_MODE = getenv("DB_READ_MODE", "projection")
+CONSISTENT_READ = getenv("DB_CONSISTENT_READ", "false") == "true"
+RETURN_CONSUMED_CAPACITY = getenv("DB_RETURN_CONSUMED_CAPACITY", "TOTAL")
+# Browser/CDN cache lifetime of the verify pages; misses get a shorter one since
+# the user may register at any moment. 0 makes clients revalidate on the ETag.
+CACHE_MAX_AGE = int(getenv("VERIFY_CACHE_MAX_AGE", "0"))
+NEGATIVE_CACHE_MAX_AGE = int(getenv("VERIFY_NEGATIVE_CACHE_MAX_AGE", "0"))
+# Content codings the pages may be sent with, negotiated on Accept-Encoding
+RESPONSE_ENCODINGS = ENCODINGS if getenv("VERIFY_COMPRESSION", "on") == "on" else ()
+
+VERIFY_ERROR = json_response(500, {"message": "Error verifying user. Check Logs for more details."})
+
+
+def _cache_control(max_age):
+    return f"public, max-age={max_age}" if max_age > 0 else "no-cache"
+
+
+CACHE_CONTROL = {
+    "index.html": _cache_control(CACHE_MAX_AGE),
+    "error.html": _cache_control(NEGATIVE_CACHE_MAX_AGE),
+}
+
+_executor = None
+router = Router()
+
+
+@logged_handler("verify_user")
+@metered_handler("verify_user")
 def lambda_handler(event, context):
-    s3_client = boto3.client("s3")
+    with request_deadline(context):
+        return router.dispatch(event, context)
+
+
+@router.route(ROUTE_KEY, default=True)
+def verify_handler(event, context):
     try:
-        query_string = dict(parse_qsl(event["rawQueryString"]))
-        item_found = is_key_in_db(db_key=query_string)
-        result_file = "index.html" if item_found else "error.html"
-        response = s3_client.get_object(Bucket=getenv("WEBSITE_S3"), Key=result_file)
-        html_body = response["Body"].read().decode("utf-8")
-        return {
-            "statusCode": 200,
-            "headers": {"Content-Type": "text/html"},
-            "body": html_body,
-        }
+        try:
+            with phase("Parse"):
+                db_key = validate_key(parse_query_string(event.get("rawQueryString")))
+        except ValidationError as error_details:
+            # Invalid lookups get the error page without touching DynamoDB
+            annotate(validation_error=str(error_details))
+            status_code, page_name, html_body = 400, "error.html", page_cache.get("error.html")
+        else:
+            status_code = 200
+            page_name, html_body = lookup_and_render(db_key)
+        annotate(page_cache=page_cache.stats(), lookup_cache=lookup_cache.stats())
+
+        with phase("Serialize"):
+            return render_response(event, status_code, page_name, html_body)
     except Exception as error_details:
-        print(error_details)
-        return "Error verifying user. Check Logs for more details."
+        log(logging.ERROR, "Error verifying user", error=str(error_details))
+        record_error(error_details)
+        return VERIFY_ERROR
+
+
+def render_response(event, status_code, page_name, html_body):
+    """The response for ``html_body``, compressed and validated as the request allows."""
+    headers = {"Cache-Control": CACHE_CONTROL[page_name], "ETag": content_etag(html_body)}
+    encoding = negotiate_encoding(event, RESPONSE_ENCODINGS)
+    encoded_body = compressed_body(html_body, encoding) if encoding else None
+    if RESPONSE_ENCODINGS:
+        headers["Vary"] = "Accept-Encoding"
+    if encoded_body is not None:
+        # Each coding is a different representation, so it gets its own ETag
+        headers["Content-Encoding"] = encoding
+        headers["ETag"] = f'{headers["ETag"][:-1]}-{encoding}"'
+
+    if status_code == 200 and etag_matches(event, headers["ETag"]):
+        return not_modified(headers)
+    if encoded_body is not None:
+        return html_response(status_code, encoded_body, headers, is_base64_encoded=True)
+    return html_response(status_code, html_body, headers)
+
+
+def lookup_and_render(db_key):
+    """
+    Return ``(page_name, body)`` for ``db_key``: index.html when the user
+    exists, error.html otherwise.
+
+    When a page has to come from S3, both pages are fetched on worker threads
+    while the DynamoDB lookup is in flight, so a cold request costs roughly
+    max(GetItem, GetObject) instead of their sum.
+    """
+    stale_pages = [name for name in PAGE_FILES if page_cache.needs_origin(name)]
+    if not FANOUT_ENABLED or not stale_pages:
+        result_file = "index.html" if is_key_in_db(db_key=db_key) else "error.html"
+        return result_file, page_cache.get(result_file)
+
+    executor = _get_executor()
+    # Each prefetch runs in a copy of the request context so it keeps the deadline
+    prefetches = {
+        name: executor.submit(contextvars.copy_context().run, page_cache.get, name)
+        for name in stale_pages
+    }
+    item_found = is_key_in_db(db_key=db_key)
+    result_file = "index.html" if item_found else "error.html"
+    if result_file in prefetches:
+        return result_file, prefetches[result_file].result()
+    return result_file, page_cache.get(result_file)
+
+
+def _get_executor():
+    global _executor
+    if _executor is None:
+        _executor = ThreadPoolExecutor(max_workers=len(PAGE_FILES), thread_name_prefix="verify-fanout")
+    return _executor
+
+
+@router.route(BATCH_ROUTE_KEY)
+def batch_lambda_handler(event, context):
+    try:
+        with phase("Parse"):
+            user_ids = parse_batch_body(event, "userIds")
+    except ValueError as error_details:
+        log(logging.WARNING, "Invalid batch body", error=str(error_details))
+        return json_response(400, {"message": f"Invalid batch body: {error_details}"})
+
+    if len(user_ids) > MAX_BATCH_KEYS:
+        return json_response(400, {"message": f"Batch exceeds {MAX_BATCH_KEYS} userIds"})
+    try:
+        for user_id in user_ids:
+            validate_key({HASH_KEY: user_id})
+    except ValidationError as error_details:
+        return json_response(400, {"message": f"Invalid userId: {error_details}"})
+
+    results = are_keys_in_db(user_ids)
+    unresolved = [user_id for user_id, found in results.items() if found is None]
+    with phase("Serialize"):
+        return json_response(200 if not unresolved else 207, {
+            "results": {user_id: found for user_id, found in results.items() if found is not None},
+            "unresolved": unresolved,
+        })
 
 
 def is_key_in_db(db_key):
-    db_client = boto3.resource("dynamodb")
-    db_table = db_client.Table(getenv("DB_TABLE_NAME"))
+    cached = lookup_cache.get(db_key)
+    if cached is not None:
+        annotate(user_found=cached, lookup="cache")
+        return cached
+
     try:
-        response = db_table.get_item(Key=db_key)
+        response = get_item(db_key, CONSISTENT_READ)
+        consumed_units = consumed_read_units(response)
+        if "Item" not in response and not CONSISTENT_READ:
+            # An eventually consistent miss may be a registration that has not
+            # propagated yet; confirm it before it is negative-cached
+            response = get_item(db_key, consistent=True)
+            consumed_units += consumed_read_units(response)
+            annotate(consistent_recheck=True)
+        if consumed_units:
+            annotate(consumed_read_units=consumed_units)
+            put_metric("ConsumedReadCapacity", consumed_units)
         if "Item" not in response:
-            print(f"Item with key: {db_key} not found")
+            annotate(user_found=False, lookup="dynamodb")
+            lookup_cache.record(db_key, False)
             return False
     except Exception as err:
-        print(f"Error Getting Item: {err}")
+        log(logging.ERROR, "Error getting item", error=str(err))
+        record_error(err)
         return False
     else:
+        annotate(user_found=True, lookup="dynamodb")
+        lookup_cache.record(db_key, True)
         return True
+
+
+def get_item(db_key, consistent):
+    """GetItem ``db_key`` through the low-level client, which is thread-safe so the read can be hedged."""
+    return call("dynamodb.get_item", get_dynamodb_client().get_item, idempotent=True,
+                TableName=getenv("DB_TABLE_NAME"),
+                Key={name: {"S": value} for name, value in db_key.items()},
+                **get_item_options(db_key, consistent))
+
+
+def consumed_read_units(response):
+    return (response.get("ConsumedCapacity") or {}).get("CapacityUnits", 0)
+
+
+def get_item_options(db_key, consistent):
+    """GetItem parameters for the configured read mode."""
+    options = {
+        "ConsistentRead": consistent,
+        "ReturnConsumedCapacity": RETURN_CONSUMED_CAPACITY,
+    }
+    if READ_MODE == "projection":
+        names = {f"#k{index}": name for index, name in enumerate(db_key)}
+        options["ProjectionExpression"] = ", ".join(names)
+        options["ExpressionAttributeNames"] = names
+    return options
+
+
+def are_keys_in_db(user_ids):
+    """
+    Bulk version of is_key_in_db: map each userId to True, False or None.
+
+    Cached lookups are answered locally and the rest go to BatchGetItem.
+    """
+    results = {}
+    to_fetch = []
+    for user_id in dict.fromkeys(user_ids):
+        cached = lookup_cache.get({HASH_KEY: user_id})
+        if cached is None:
+            to_fetch.append(user_id)
+        results[user_id] = cached
+
+    if to_fetch:
+        for user_id, found in batch_get_keys(to_fetch, key_attribute=HASH_KEY).items():
+            # BatchGetItem reads are eventually consistent, so a miss may be a
+            # registration that has not propagated yet and is not cached
+            if found:
+                lookup_cache.record({HASH_KEY: user_id}, True)
+            results[user_id] = found
+    annotate(batch_size=len(results), lookup_cache=lookup_cache.stats())
+    return results
+
+
+def warm_pages():
+    """Load every page into the page cache and compute its ETag and compressed variants."""
+    for name in PAGE_FILES:
+        body = page_cache.get(name)
+        content_etag(body)
+        for encoding in RESPONSE_ENCODINGS:
+            compressed_body(body, encoding)
+
+
+prewarm(get_dynamodb_client, warm_pages)
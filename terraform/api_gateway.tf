@@ -20,16 +20,25 @@ module "api_gateway" {
       route_key  = "PUT /register"
       lambda_key = "register-user"
     }
+    register_batch = {
+      route_key  = "POST /register/batch"
+      lambda_key = "register-user"
+    }
     verify = {
       route_key  = "GET /"
       lambda_key = "verify-user"
     }
+    verify_batch = {
+      route_key  = "POST /verify/batch"
+      lambda_key = "verify-user"
+    }
   }
 
   lambda_functions = {
     for key, func in module.lambda_functions.functions : key => {
-      invoke_arn       = func.invoke_arn
-      source_code_hash = func.source_code_hash
+      invoke_arn           = func.invoke_arn
+      qualified_invoke_arn = module.lambda_functions.qualified_invoke_arns[key]
+      source_code_hash     = func.source_code_hash
     }
   }
 
@@ -42,5 +51,15 @@ module "api_gateway" {
     max_age           = 86400
   }
 
+  # Per-route latency and error metrics for the stage
+  enable_detailed_metrics = var.api_detailed_metrics
+
+  # Optional CloudFront cache for GET / lookups; writes and batch routes bypass it
+  edge_cache = {
+    enabled                = var.edge_cache_enabled
+    max_ttl                = var.edge_cache_max_ttl
+    uncached_path_patterns = ["/register*", "/verify/batch"]
+  }
+
   common_tags = local.common_tags
 }
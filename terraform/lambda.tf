@@ -2,20 +2,87 @@
 # This replaces the previous inline Lambda function resources with a reusable module
 
 locals {
+  # Shared Python modules packaged alongside every handler that imports them
+  shared_modules = {
+    "aws_clients.py"        = "${path.module}/../src/aws_clients.py"
+    "dynamodb_batch.py"     = "${path.module}/../src/dynamodb_batch.py"
+    "lookup_cache.py"       = "${path.module}/../src/lookup_cache.py"
+    "metrics.py"            = "${path.module}/../src/metrics.py"
+    "prewarm.py"            = "${path.module}/../src/prewarm.py"
+    "request_body.py"       = "${path.module}/../src/request_body.py"
+    "request_schema.py"     = "${path.module}/../src/request_schema.py"
+    "resilience.py"         = "${path.module}/../src/resilience.py"
+    "router.py"             = "${path.module}/../src/router.py"
+    "structured_logging.py" = "${path.module}/../src/structured_logging.py"
+    "tracing.py"            = "${path.module}/../src/tracing.py"
+  }
+
+  # Environment shared by every handler
+  common_environment = {
+    LOG_LEVEL                   = var.log_level
+    LOG_EVENT_SAMPLE_RATE       = tostring(var.log_event_sample_rate)
+    REGISTER_ALLOWED_ATTRIBUTES = join(",", var.register_allowed_attributes)
+    AWS_CONNECT_TIMEOUT_SECONDS = tostring(var.aws_connect_timeout_seconds)
+    AWS_READ_TIMEOUT_SECONDS    = tostring(var.aws_read_timeout_seconds)
+    AWS_RETRY_MODE              = var.aws_retry_mode
+    AWS_MAX_ATTEMPTS            = tostring(var.aws_max_attempts)
+    DEADLINE_MARGIN_MS          = tostring(var.request_deadline_margin_ms)
+    HEDGE_READS                 = var.hedge_reads ? "on" : "off"
+    METRICS                     = var.enable_monitoring ? "on" : "off"
+    METRICS_NAMESPACE           = local.metrics_namespace
+    TRACING                     = var.lambda_tracing_mode == "Active" ? "xray" : "off"
+  }
+
+  # CloudWatch namespace of the handlers' EMF metrics (see monitoring.tf)
+  metrics_namespace = "${var.prefix}-${var.project_name}"
+
+  # HTML pages bundled into verify-user when bundle_html_pages is enabled
+  html_pages = {
+    for name in ["index.html", "error.html"] : name => "${path.module}/../html/${name}"
+    if var.bundle_html_pages
+  }
+
+  # Deterministic packages built by packaging/build.py when use_prebuilt_packages is set
+  functions_package = var.use_prebuilt_packages ? "${path.module}/../packaging/dist/functions.zip" : null
+  # The layer carries C extensions, so each function gets the build for its architecture
+  function_architectures = {
+    for key in ["register-user", "verify-user"] : key => lookup(var.lambda_architecture, key, "x86_64")
+  }
+  dependency_layers = {
+    for key, architecture in local.function_architectures : key =>
+    var.use_prebuilt_packages ? [aws_lambda_layer_version.dependencies[architecture].arn] : []
+  }
+
+  # TTL attribute of the register-user idempotency records
+  idempotency_ttl_attribute = "expiresAt"
+
   lambda_functions = {
     register-user = {
       source_file = "${path.module}/../src/register_user.py"
       handler     = "register_user.lambda_handler"
       description = "Register new users in DynamoDB"
-      environment_vars = {
-        DB_TABLE_NAME = module.user_storage.dynamodb_table_name
-      }
+      extra_files = local.shared_modules
+      environment_vars = merge(local.common_environment, {
+        DB_TABLE_NAME             = module.user_storage.dynamodb_table_name
+        REGISTER_MODE             = var.register_mode
+        IDEMPOTENCY_TTL_SECONDS   = tostring(var.register_idempotency_ttl_seconds)
+        IDEMPOTENCY_TTL_ATTRIBUTE = local.idempotency_ttl_attribute
+      })
+      alias                   = var.lambda_alias
+      provisioned_concurrency = lookup(var.lambda_provisioned_concurrency, "register-user", 0)
+      reserved_concurrency    = lookup(var.lambda_reserved_concurrency, "register-user", -1)
+      memory_size             = lookup(var.lambda_memory_size, "register-user", null)
+      architectures           = [local.function_architectures["register-user"]]
+      package_file            = local.functions_package
+      layers                  = local.dependency_layers["register-user"]
       iam_policies = [
         {
           effect = "Allow"
-          actions = [
-            "dynamodb:PutItem"
-          ]
+          # GetItem is only needed to replay Idempotency-Key responses
+          actions = concat(
+            ["dynamodb:PutItem", "dynamodb:BatchWriteItem"],
+            var.register_idempotency_ttl_seconds > 0 ? ["dynamodb:GetItem"] : []
+          )
           resources = [module.user_storage.dynamodb_table_arn]
         }
       ]
@@ -24,15 +91,34 @@ locals {
       source_file = "${path.module}/../src/verify_user.py"
       handler     = "verify_user.lambda_handler"
       description = "Verify users and return HTML from S3"
-      environment_vars = {
-        DB_TABLE_NAME = module.user_storage.dynamodb_table_name
-        WEBSITE_S3    = module.user_storage.s3_bucket_id
-      }
+      extra_files = merge(local.shared_modules, local.html_pages, {
+        "page_cache.py" = "${path.module}/../src/page_cache.py"
+      })
+      environment_vars = merge(local.common_environment, {
+        DB_TABLE_NAME                 = module.user_storage.dynamodb_table_name
+        WEBSITE_S3                    = module.user_storage.s3_bucket_id
+        PAGE_CACHE_TTL_SECONDS        = tostring(var.page_cache_ttl_seconds)
+        PAGE_SOURCE                   = var.bundle_html_pages ? "bundled" : "s3"
+        VERIFY_FANOUT                 = var.verify_fanout ? "on" : "off"
+        DB_READ_MODE                  = var.verify_read_mode
+        DB_CONSISTENT_READ            = tostring(var.verify_consistent_read)
+        VERIFY_CACHE_MAX_AGE          = tostring(var.verify_cache_max_age)
+        VERIFY_NEGATIVE_CACHE_MAX_AGE = tostring(var.verify_negative_cache_max_age)
+        VERIFY_COMPRESSION            = var.verify_compression ? "on" : "off"
+      })
+      alias                   = var.lambda_alias
+      provisioned_concurrency = lookup(var.lambda_provisioned_concurrency, "verify-user", 0)
+      reserved_concurrency    = lookup(var.lambda_reserved_concurrency, "verify-user", -1)
+      memory_size             = lookup(var.lambda_memory_size, "verify-user", null)
+      architectures           = [local.function_architectures["verify-user"]]
+      package_file            = local.functions_package
+      layers                  = local.dependency_layers["verify-user"]
       iam_policies = [
         {
           effect = "Allow"
           actions = [
-            "dynamodb:GetItem"
+            "dynamodb:GetItem",
+            "dynamodb:BatchGetItem"
           ]
           resources = [module.user_storage.dynamodb_table_arn]
         },
@@ -48,6 +134,17 @@ locals {
   }
 }
 
+# Pinned, trimmed dependencies with precompiled bytecode (see packaging/build.py)
+resource "aws_lambda_layer_version" "dependencies" {
+  for_each = var.use_prebuilt_packages ? toset(values(local.function_architectures)) : toset([])
+
+  layer_name               = "${var.prefix}-${var.project_name}-dependencies-${each.key}"
+  filename                 = "${path.module}/../packaging/dist/dependencies-layer-${each.key}.zip"
+  source_code_hash         = filebase64sha256("${path.module}/../packaging/dist/dependencies-layer-${each.key}.zip")
+  compatible_runtimes      = ["python3.9"]
+  compatible_architectures = [each.key]
+}
+
 # Lambda Functions Module
 module "lambda_functions" {
   source = "../modules/lambda-function"
@@ -57,6 +154,18 @@ module "lambda_functions" {
   aws_region                = var.aws_region
   functions                 = local.lambda_functions
   api_gateway_execution_arn = module.api_gateway.api_gateway_execution_arn
+  tracing_mode              = var.lambda_tracing_mode
+
+  # One function serving every route when lambda_monolith is enabled
+  monolith = {
+    enabled      = var.lambda_monolith
+    source_file  = "${path.module}/../src/app.py"
+    handler      = "app.lambda_handler"
+    package_file = local.functions_package
+    extra_files = {
+      "hello_world.py" = "${path.module}/../src/hello_world.py"
+    }
+  }
 
   # Optional configurations
   runtime            = "python3.9"
@@ -0,0 +1,18 @@
+# Dashboard and alarms over the handlers' Embedded Metric Format metrics
+module "monitoring" {
+  source = "../modules/monitoring"
+  count  = var.enable_monitoring ? 1 : 0
+
+  prefix            = var.prefix
+  project_name      = var.project_name
+  aws_region        = var.aws_region
+  function_names    = module.lambda_functions.function_names
+  metrics_namespace = local.metrics_namespace
+  api_id            = module.api_gateway.api_gateway_id
+
+  latency_alarm_threshold_ms          = var.latency_alarm_threshold_ms
+  dynamodb_latency_alarm_threshold_ms = var.dynamodb_latency_alarm_threshold_ms
+  alarm_actions                       = var.alarm_actions
+
+  common_tags = local.common_tags
+}
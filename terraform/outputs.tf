@@ -4,6 +4,11 @@ output "api_gateway_url" {
   value       = module.api_gateway.api_gateway_url
 }
 
+output "edge_cache_url" {
+  description = "URL of the CloudFront edge cache in front of the API (null when disabled)"
+  value       = module.api_gateway.edge_cache_url
+}
+
 # S3 outputs
 output "s3_bucket_arn" {
   description = "ARN of the S3 bucket for website hosting"
@@ -47,3 +52,9 @@ output "storage_resources" {
   description = "Combined storage resources information"
   value       = module.user_storage.storage_resources
 }
+
+# Monitoring outputs
+output "dashboard_url" {
+  description = "Console URL of the CloudWatch dashboard (null when monitoring is disabled)"
+  value       = var.enable_monitoring ? module.monitoring[0].dashboard_url : null
+}
@@ -8,6 +8,9 @@ module "user_storage" {
   # DynamoDB Configuration
   hash_key = "userId"
 
+  # Expires register-user idempotency records
+  ttl_attribute = var.register_idempotency_ttl_seconds > 0 ? local.idempotency_ttl_attribute : null
+
   # S3 Configuration
   s3_website_config = {
     index_document = "index.html"
@@ -21,3 +21,232 @@ variable "environment" {
   type        = string
   default     = "dev"
 }
+
+variable "page_cache_ttl_seconds" {
+  description = "Seconds verify-user serves HTML pages from memory before revalidating them against S3"
+  type        = number
+  default     = 300
+}
+
+variable "bundle_html_pages" {
+  description = "Package html/index.html and html/error.html with verify-user and serve them from memory, using S3 only as a fallback"
+  type        = bool
+  default     = false
+}
+
+variable "verify_fanout" {
+  description = "Fetch the HTML pages from S3 concurrently with the DynamoDB lookup in verify-user"
+  type        = bool
+  default     = true
+}
+
+variable "log_level" {
+  description = "Log level for the Lambda handlers"
+  type        = string
+  default     = "INFO"
+}
+
+variable "log_event_sample_rate" {
+  description = "Fraction of requests (0.0-1.0) whose full API Gateway event is included in the request log line"
+  type        = number
+  default     = 0
+}
+
+variable "verify_read_mode" {
+  description = "How verify-user reads users: projection (key attribute only) or full (whole item)"
+  type        = string
+  default     = "projection"
+  validation {
+    condition     = contains(["projection", "full"], var.verify_read_mode)
+    error_message = "Read mode must be either projection or full."
+  }
+}
+
+variable "verify_consistent_read" {
+  description = "Use strongly consistent reads (2x read capacity) in verify-user"
+  type        = bool
+  default     = false
+}
+
+variable "register_allowed_attributes" {
+  description = "Attributes a registration may set on a user item (userId is always allowed)"
+  type        = list(string)
+  default     = ["userId"]
+}
+
+variable "register_mode" {
+  description = "How register-user writes users: conditional (never rewrite an existing user) or overwrite"
+  type        = string
+  default     = "conditional"
+  validation {
+    condition     = contains(["conditional", "overwrite"], var.register_mode)
+    error_message = "Register mode must be either conditional or overwrite."
+  }
+}
+
+variable "register_idempotency_ttl_seconds" {
+  description = "How long register-user remembers Idempotency-Key responses (0 disables the header)"
+  type        = number
+  default     = 0
+}
+
+variable "lambda_monolith" {
+  description = "Deploy register-user and verify-user as one Lambda function that dispatches on the route"
+  type        = bool
+  default     = false
+}
+
+variable "lambda_alias" {
+  description = "Alias that API Gateway invokes, pointing at the latest published version (null invokes $LATEST)"
+  type        = string
+  default     = null
+}
+
+variable "lambda_provisioned_concurrency" {
+  description = "Provisioned concurrency per function key, e.g. { verify-user = 2 }. Requires lambda_alias"
+  type        = map(number)
+  default     = {}
+}
+
+variable "lambda_reserved_concurrency" {
+  description = "Reserved concurrency per function key (-1 or unset leaves the function unreserved)"
+  type        = map(number)
+  default     = {}
+}
+
+variable "lambda_memory_size" {
+  description = "Memory in MB per function key, e.g. { verify-user = 256 }. Unset functions get 128 MB (see tests/power_tuning.py)"
+  type        = map(number)
+  default     = {}
+}
+
+variable "lambda_architecture" {
+  description = "Instruction set architecture per function key: x86_64 (default) or arm64"
+  type        = map(string)
+  default     = {}
+  validation {
+    condition     = alltrue([for architecture in values(var.lambda_architecture) : contains(["x86_64", "arm64"], architecture)])
+    error_message = "Architecture must be either x86_64 or arm64."
+  }
+}
+
+variable "use_prebuilt_packages" {
+  description = "Deploy packaging/dist/functions.zip and the dependency layer built by packaging/build.py instead of zipping src/ at plan time"
+  type        = bool
+  default     = false
+}
+
+variable "verify_cache_max_age" {
+  description = "Cache-Control max-age (seconds) of verify-user success pages; 0 makes clients revalidate on the ETag"
+  type        = number
+  default     = 0
+  validation {
+    # With no-cache pages CloudFront would forward every lookup to Lambda
+    condition     = var.verify_cache_max_age > 0 || !var.edge_cache_enabled
+    error_message = "verify_cache_max_age must be positive when edge_cache_enabled is true, otherwise the edge cache stores nothing."
+  }
+}
+
+variable "verify_negative_cache_max_age" {
+  description = "Cache-Control max-age (seconds) of verify-user error pages, kept short since the user may register"
+  type        = number
+  default     = 0
+}
+
+variable "edge_cache_enabled" {
+  description = "Put a CloudFront cache in front of the API so repeated lookups are served from the edge"
+  type        = bool
+  default     = false
+}
+
+variable "edge_cache_max_ttl" {
+  description = "Upper bound (seconds) on how long CloudFront keeps a cached verify response"
+  type        = number
+  default     = 300
+}
+
+variable "verify_compression" {
+  description = "Send verify-user pages gzip or Brotli compressed when the client's Accept-Encoding allows it"
+  type        = bool
+  default     = true
+}
+
+variable "aws_connect_timeout_seconds" {
+  description = "Connect timeout of the boto3 clients used by the handlers"
+  type        = number
+  default     = 1
+}
+
+variable "aws_read_timeout_seconds" {
+  description = "Read timeout of the boto3 clients used by the handlers"
+  type        = number
+  default     = 2
+}
+
+variable "aws_retry_mode" {
+  description = "botocore retry mode of the handlers' clients (standard or adaptive)"
+  type        = string
+  default     = "adaptive"
+  validation {
+    condition     = contains(["standard", "adaptive"], var.aws_retry_mode)
+    error_message = "aws_retry_mode must be standard or adaptive."
+  }
+}
+
+variable "aws_max_attempts" {
+  description = "Total attempts (first call included) per AWS call before the handler gives up"
+  type        = number
+  default     = 3
+}
+
+variable "request_deadline_margin_ms" {
+  description = "Milliseconds of the Lambda timeout kept back to build a response after AWS calls are cut off"
+  type        = number
+  default     = 200
+}
+
+variable "hedge_reads" {
+  description = "Send a second GetItem/GetObject when a read is slower than its recent p95, using whichever answers first"
+  type        = bool
+  default     = false
+}
+
+variable "enable_monitoring" {
+  description = "Emit EMF metrics from the handlers and create the CloudWatch dashboard and alarms (opt-in)"
+  type        = bool
+  default     = false
+}
+
+variable "latency_alarm_threshold_ms" {
+  description = "p99 handler latency (ms) above which a function's latency alarm fires"
+  type        = number
+  default     = 1000
+}
+
+variable "dynamodb_latency_alarm_threshold_ms" {
+  description = "p99 DynamoDB call latency (ms) above which a function's DynamoDB latency alarm fires"
+  type        = number
+  default     = 100
+}
+
+variable "alarm_actions" {
+  description = "List of ARNs (e.g. SNS topics) to notify when a monitoring alarm triggers"
+  type        = list(string)
+  default     = []
+}
+
+variable "lambda_tracing_mode" {
+  description = "X-Ray tracing mode of the Lambda functions; Active also traces each DynamoDB/S3 call as a subsegment"
+  type        = string
+  default     = "PassThrough"
+  validation {
+    condition     = contains(["Active", "PassThrough"], var.lambda_tracing_mode)
+    error_message = "lambda_tracing_mode must be Active or PassThrough."
+  }
+}
+
+variable "api_detailed_metrics" {
+  description = "Publish per-route API Gateway latency and error metrics"
+  type        = bool
+  default     = false
+}
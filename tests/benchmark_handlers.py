@@ -0,0 +1,358 @@
+#!/usr/bin/env python3
+"""
+Load-testing harness for the register/verify flow
+
+Drives register_user.lambda_handler and verify_user.lambda_handler in-process
+against the local DynamoDB/S3 stand-ins in tests/local_aws.py, or a deployed
+API Gateway with --live. Each scenario reports p50/p95/p99 latency,
+requests/second and a cold-vs-warm breakdown. Results are written to a JSON
+file, and --baseline compares them with an earlier run to catch regressions
+between commits.
+
+Usage:
+    python tests/benchmark_handlers.py --requests 2000 --concurrency 8
+    python tests/benchmark_handlers.py --latency-ms 5 --output bench.json
+    python tests/benchmark_handlers.py --baseline bench.json --max-regression 0.2
+    python tests/benchmark_handlers.py --live --api-url https://<api-id>.execute-api.<region>.amazonaws.com
+"""
+
+import argparse
+import importlib
+import json
+import os
+import subprocess
+import sys
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(Path(__file__).parent))
+# Keep the handlers' EMF metric lines out of the report
+os.environ.setdefault("METRICS", "off")
+
+# local_aws (and with it aws_clients) is imported where it is used, so a
+# --cold-child interpreter imports the handler before any of src/ is loaded
+SCENARIOS = ("register", "verify_found", "verify_missing")
+MAX_ERROR_SAMPLES = 5
+
+
+def percentile(sorted_values, fraction):
+    """Nearest-rank percentile of an already sorted list"""
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, max(0, int(round(fraction * len(sorted_values))) - 1))
+    return sorted_values[index]
+
+
+def summarize(latencies_ms, wall_seconds=None):
+    ordered = sorted(latencies_ms)
+    summary = {
+        "count": len(ordered),
+        "mean_ms": round(sum(ordered) / len(ordered), 3) if ordered else 0.0,
+        "p50_ms": round(percentile(ordered, 0.50), 3),
+        "p95_ms": round(percentile(ordered, 0.95), 3),
+        "p99_ms": round(percentile(ordered, 0.99), 3),
+        "max_ms": round(ordered[-1], 3) if ordered else 0.0,
+    }
+    if wall_seconds:
+        summary["requests_per_second"] = round(len(ordered) / wall_seconds, 1)
+    return summary
+
+
+def scenario_request(scenario, user_id):
+    """Return (method, path, query) for one request of ``scenario``"""
+    if scenario == "register":
+        return "PUT", "/register", f"userId={user_id}"
+    return "GET", "/", f"userId={user_id}"
+
+
+def run_load(invoke, scenario, user_ids, concurrency):
+    """
+    Invoke ``scenario`` once per user id across ``concurrency`` threads.
+
+    Returns the latencies, the wall time, the number of failed requests and
+    up to MAX_ERROR_SAMPLES of their error messages.
+    """
+    failed = 0
+    samples = []
+    lock = threading.Lock()
+
+    def timed(user_id):
+        nonlocal failed
+        start = time.perf_counter()
+        try:
+            ok, error = invoke(scenario, user_id), None
+        except Exception as e:
+            ok, error = False, str(e)
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        if not ok:
+            with lock:
+                failed += 1
+                if len(samples) < MAX_ERROR_SAMPLES:
+                    samples.append(error or f"{scenario} failed for {user_id}")
+        return elapsed_ms
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        latencies = list(pool.map(timed, user_ids))
+    wall = time.perf_counter() - start
+    return latencies, wall, failed, samples
+
+
+HANDLER_MODULES = {"register": "register_user", "verify": "verify_user"}
+
+
+def handler_module_name(scenario):
+    return HANDLER_MODULES["register" if scenario == "register" else "verify"]
+
+
+def response_ok(scenario, response):
+    if scenario == "register":
+        return "Error" not in json.dumps(response)
+    expected = "User Verification Successful" if scenario == "verify_found" else "User Verification Failed"
+    return isinstance(response, dict) and expected in response.get("body", "")
+
+
+class InProcessTarget:
+    """Calls the handlers directly against local stand-ins"""
+
+    def __init__(self, latency_ms):
+        import local_aws
+
+        self.local_aws = local_aws
+        self.latency_ms = latency_ms
+        self.backend = local_aws.install_local_aws(latency_ms=latency_ms)
+        self.modules = {key: importlib.import_module(name) for key, name in HANDLER_MODULES.items()}
+
+    def invoke(self, scenario, user_id):
+        method, path, query = scenario_request(scenario, user_id)
+        module = self.modules["register" if scenario == "register" else "verify"]
+        return response_ok(scenario, module.lambda_handler(self.local_aws.make_event(method, path, query), None))
+
+    def cold_invoke(self, scenario, user_id):
+        """
+        First request of a fresh execution environment: a new interpreter
+        imports the handler and serves one request, so the handler's imports,
+        module-level setup and caches all start cold.
+        """
+        result = subprocess.run(
+            [sys.executable, __file__, "--cold-child", scenario, user_id, "--latency-ms", str(self.latency_ms)],
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+        measured = json.loads(result.stdout.splitlines()[-1])
+        return measured["elapsed_ms"], measured["ok"]
+
+
+def cold_child(scenario, user_id, latency_ms):
+    """
+    Runs in the fresh interpreter and prints the cold request's timing as JSON.
+
+    The handler import is timed before the local stand-ins are installed, so
+    it includes every src/ module; setting up the stand-ins is not timed.
+    """
+    sys.path.insert(0, str(project_root / "src"))
+    start = time.perf_counter()
+    module = importlib.import_module(handler_module_name(scenario))
+    import_ms = (time.perf_counter() - start) * 1000
+
+    from local_aws import install_local_aws, make_event
+
+    backend = install_local_aws(latency_ms=latency_ms)
+    if scenario == "verify_found":
+        # The parent's registrations live in its own process
+        backend.dynamodb.Table("local-users").items[user_id] = {"userId": user_id}
+    method, path, query = scenario_request(scenario, user_id)
+    event = make_event(method, path, query)
+
+    start = time.perf_counter()
+    response = module.lambda_handler(event, None)
+    request_ms = (time.perf_counter() - start) * 1000
+    print(json.dumps({
+        "elapsed_ms": round(import_ms + request_ms, 3),
+        "import_ms": round(import_ms, 3),
+        "ok": response_ok(scenario, response),
+    }))
+
+
+class LiveTarget:
+    """Sends real HTTP requests to a deployed API Gateway"""
+
+    def __init__(self, api_url, timeout):
+        import requests
+
+        self.requests = requests
+        self.api_url = api_url.rstrip("/")
+        self.timeout = timeout
+        self._local = threading.local()
+
+    def _session(self):
+        session = getattr(self._local, "session", None)
+        if session is None:
+            session = self._local.session = self.requests.Session()
+        return session
+
+    def invoke(self, scenario, user_id):
+        method, path, query = scenario_request(scenario, user_id)
+        response = self._session().request(method, f"{self.api_url}{path}?{query}", timeout=self.timeout)
+        if scenario == "register":
+            return response.status_code == 200 and (
+                "Registered User Successfully" in response.text or "User Already Registered" in response.text
+            )
+        expected = "User Verification Successful" if scenario == "verify_found" else "User Verification Failed"
+        return expected in response.text
+
+    def cold_invoke(self, scenario, user_id):
+        """First request on a brand-new session, i.e. including connection setup"""
+        self._local.session = None
+        start = time.perf_counter()
+        ok = self.invoke(scenario, user_id)
+        return (time.perf_counter() - start) * 1000, ok
+
+
+def get_api_gateway_url():
+    url = os.getenv("API_GATEWAY_URL")
+    if url:
+        return url
+    result = subprocess.run(
+        ["terraform", "output", "-raw", "api_gateway_url"],
+        cwd=project_root / "terraform",
+        capture_output=True,
+        text=True,
+        timeout=30,
+    )
+    return result.stdout.strip() if result.returncode == 0 else None
+
+
+def run_benchmark(target, requests_per_scenario, concurrency, cold_samples):
+    run_id = uuid.uuid4().hex[:8]
+    registered = [f"bench-{run_id}-{i}" for i in range(requests_per_scenario)]
+    missing = [f"bench-missing-{run_id}-{i}" for i in range(requests_per_scenario)]
+    user_ids = {"register": registered, "verify_found": registered, "verify_missing": missing}
+
+    results = {}
+    for scenario in SCENARIOS:
+        print(f"📋 Running: {scenario}")
+        cold = []
+        cold_failed = 0
+        for i in range(cold_samples):
+            try:
+                elapsed_ms, ok = target.cold_invoke(scenario, user_ids[scenario][i % len(user_ids[scenario])])
+            except Exception as e:
+                print(f"❌ Cold {scenario} request failed: {e}")
+                cold_failed += 1
+                continue
+            if not ok:
+                print(f"❌ Cold {scenario} request failed")
+                cold_failed += 1
+            cold.append(elapsed_ms)
+
+        warm, wall, failed, error_samples = run_load(target.invoke, scenario, user_ids[scenario], concurrency)
+        results[scenario] = {
+            "warm": summarize(warm, wall),
+            "cold": summarize(cold),
+            "errors": failed,
+            "cold_errors": cold_failed,
+        }
+        for error in error_samples:
+            print(f"❌ {error}")
+        if failed > len(error_samples):
+            print(f"❌ ... {failed} failed requests in total")
+
+        warm_summary = results[scenario]["warm"]
+        print(f"📊 p50 {warm_summary['p50_ms']}ms  p95 {warm_summary['p95_ms']}ms  "
+              f"p99 {warm_summary['p99_ms']}ms  {warm_summary.get('requests_per_second', 0)} req/s  "
+              f"cold p50 {results[scenario]['cold']['p50_ms']}ms")
+    return results
+
+
+def compare_with_baseline(results, baseline, max_regression):
+    """Return a list of regressions where warm p95/p99 grew by more than max_regression"""
+    regressions = []
+    for scenario, current in results.items():
+        previous = baseline.get("scenarios", {}).get(scenario)
+        if not previous:
+            continue
+        for metric in ("p95_ms", "p99_ms"):
+            before, after = previous["warm"][metric], current["warm"][metric]
+            if before and (after - before) / before > max_regression:
+                regressions.append(f"{scenario} warm {metric}: {before}ms -> {after}ms")
+    return regressions
+
+
+def git_commit():
+    try:
+        result = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=project_root,
+                                capture_output=True, text=True, timeout=10)
+        return result.stdout.strip() or None
+    except (OSError, subprocess.TimeoutExpired):
+        return None
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the register/verify Lambda handlers")
+    parser.add_argument("--requests", type=int, default=500, help="Requests per scenario")
+    parser.add_argument("--concurrency", type=int, default=4, help="Concurrent workers")
+    parser.add_argument("--cold-samples", type=int, default=5, help="Cold invocations per scenario")
+    parser.add_argument("--latency-ms", type=float, default=0.0,
+                        help="Simulated latency per local DynamoDB/S3 call")
+    parser.add_argument("--live", action="store_true", help="Benchmark the deployed API Gateway instead")
+    parser.add_argument("--api-url", help="API Gateway URL (defaults to API_GATEWAY_URL or terraform output)")
+    parser.add_argument("--timeout", type=float, default=30, help="HTTP timeout for --live")
+    parser.add_argument("--output", default="benchmark-results.json", help="Where to write the JSON results")
+    parser.add_argument("--baseline", help="Earlier results file to compare against")
+    parser.add_argument("--max-regression", type=float, default=0.2,
+                        help="Allowed relative growth of warm p95/p99 versus the baseline")
+    parser.add_argument("--cold-child", nargs=2, metavar=("SCENARIO", "USER_ID"), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.cold_child:
+        cold_child(*args.cold_child, args.latency_ms)
+        return
+
+    if args.live:
+        api_url = args.api_url or get_api_gateway_url()
+        if not api_url:
+            print("❌ Failed to get API Gateway URL")
+            sys.exit(1)
+        target = LiveTarget(api_url, args.timeout)
+    else:
+        target = InProcessTarget(args.latency_ms)
+
+    print("🚀 Starting handler benchmark")
+    print("=" * 60)
+    results = run_benchmark(target, args.requests, args.concurrency, args.cold_samples)
+
+    report = {
+        "commit": git_commit(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+        "config": {
+            "mode": "live" if args.live else "in-process",
+            "requests": args.requests,
+            "concurrency": args.concurrency,
+            "cold_samples": args.cold_samples,
+            "latency_ms": args.latency_ms,
+        },
+        "scenarios": results,
+    }
+    with open(args.output, "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"\n📝 Results written to {args.output}")
+
+    failed = any(result["errors"] or result["cold_errors"] for result in results.values())
+    if args.baseline:
+        with open(args.baseline) as f:
+            regressions = compare_with_baseline(results, json.load(f), args.max_regression)
+        for regression in regressions:
+            print(f"❌ Regression: {regression}")
+        failed = failed or bool(regressions)
+
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,26 @@
+"""
+Shared fixtures for the local unit tests
+"""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+from local_aws import install_local_aws
+
+from lookup_cache import lookup_cache
+from page_cache import page_cache
+
+
+@pytest.fixture
+def backend():
+    """Fresh local DynamoDB/S3 with user "alice" registered, and empty handler caches"""
+    page_cache.clear()
+    lookup_cache.clear()
+    backend = install_local_aws()
+    backend.dynamodb.Table("local-users").items["alice"] = {"userId": "alice"}
+    yield backend
+    lookup_cache.clear()
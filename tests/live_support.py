@@ -0,0 +1,135 @@
+"""
+Shared plumbing for the live integration suites (test_milestone2/3)
+
+The suites share one pooled HTTP session, so checks reuse TLS connections
+to API Gateway instead of opening one per request. Terraform outputs are read
+with a single `terraform output -json` per root module and cached for the
+rest of the run. run_concurrently executes independent checks on a thread
+pool and prints each check's output as one block, in the order the checks
+were listed.
+"""
+import io
+import json
+import os
+import subprocess
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+project_root = Path(__file__).parent.parent
+
+DEFAULT_WORKERS = int(os.getenv("LIVE_TEST_WORKERS", "8"))
+TERRAFORM_TIMEOUT = 30
+# Outputs that CI passes in the environment instead of running terraform
+OUTPUT_ENVIRONMENT = {"api_gateway_url": "API_GATEWAY_URL"}
+
+_lock = threading.Lock()
+_outputs = {}
+_session = None
+
+
+def terraform_outputs(directory="terraform"):
+    """All outputs of the root module in ``directory`` as {name: value}, or None without terraform state"""
+    with _lock:
+        if directory not in _outputs:
+            _outputs[directory] = _read_outputs(project_root / directory)
+        return _outputs[directory]
+
+
+def _read_outputs(path):
+    try:
+        result = subprocess.run(
+            ["terraform", "output", "-json"],
+            cwd=path,
+            capture_output=True,
+            text=True,
+            timeout=TERRAFORM_TIMEOUT,
+        )
+    except (subprocess.TimeoutExpired, FileNotFoundError):
+        return None
+    if result.returncode != 0:
+        return None
+    try:
+        return {name: output.get("value") for name, output in json.loads(result.stdout).items()}
+    except ValueError:
+        return None
+
+
+def terraform_output(name, directory="terraform"):
+    """One output, preferring its environment variable (see OUTPUT_ENVIRONMENT) when set"""
+    variable = OUTPUT_ENVIRONMENT.get(name)
+    if variable and os.getenv(variable):
+        return os.getenv(variable)
+    return (terraform_outputs(directory) or {}).get(name)
+
+
+def http_session(pool_size=DEFAULT_WORKERS):
+    """The shared requests Session; ``pool_size`` applies to the first call, which creates it"""
+    global _session
+    with _lock:
+        if _session is None:
+            import requests
+            from requests.adapters import HTTPAdapter
+
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=4, pool_maxsize=max(pool_size, 1))
+            session.mount("https://", adapter)
+            session.mount("http://", adapter)
+            _session = session
+        return _session
+
+
+class _ThreadOutput(io.TextIOBase):
+    """sys.stdout stand-in that buffers what each check thread prints"""
+
+    def __init__(self, stream):
+        self.stream = stream
+        self.local = threading.local()
+
+    def write(self, text):
+        buffer = getattr(self.local, "buffer", None)
+        return (self.stream if buffer is None else buffer).write(text)
+
+    def flush(self):
+        self.stream.flush()
+
+
+def run_concurrently(checks, workers=DEFAULT_WORKERS):
+    """Run (name, function) checks on ``workers`` threads.
+
+    Returns [(name, result)] in the order of ``checks``. A check that raises
+    yields the exception as its result.
+    """
+    if workers <= 1:
+        return [(name, _call(function)) for name, function in checks]
+
+    output = _ThreadOutput(sys.stdout)
+
+    def captured(function):
+        output.local.buffer = io.StringIO()
+        try:
+            return _call(function), output.local.buffer.getvalue()
+        finally:
+            output.local.buffer = None
+
+    results = []
+    sys.stdout = output
+    try:
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            futures = [(name, executor.submit(captured, function)) for name, function in checks]
+            for name, future in futures:
+                result, printed = future.result()
+                output.stream.write(printed)
+                output.stream.flush()
+                results.append((name, result))
+    finally:
+        sys.stdout = output.stream
+    return results
+
+
+def _call(function):
+    try:
+        return function()
+    except Exception as e:
+        return e
@@ -0,0 +1,249 @@
+#!/usr/bin/env python3
+"""
+Local stand-ins for the DynamoDB and S3 APIs used by the Lambda handlers.
+
+They implement just enough of the boto3 surface (Table.get_item/put_item,
+batch_write_item/batch_get_item, the low-level dynamodb.get_item,
+s3.get_object with IfNoneMatch) for the
+handlers to run in-process, with an optional simulated per-call latency so
+benchmarks see realistic network waits. LocalTraceCollector stands in for the
+X-Ray recorder used by src/tracing.py.
+
+Usage:
+    from local_aws import install_local_aws
+    backend = install_local_aws(latency_ms=5)
+"""
+
+import hashlib
+import io
+import os
+import sys
+import threading
+import time
+from pathlib import Path
+
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root / "src"))
+
+from botocore.exceptions import ClientError
+
+import aws_clients
+
+
+class LocalTable:
+    """In-memory DynamoDB table keyed on a single hash key"""
+
+    def __init__(self, name, hash_key="userId", latency_ms=0.0):
+        self.name = name
+        self.hash_key = hash_key
+        self.latency_ms = latency_ms
+        self.items = {}
+        self.calls = {"get_item": 0, "put_item": 0}
+        self._lock = threading.Lock()
+
+    def _wait(self):
+        if self.latency_ms:
+            time.sleep(self.latency_ms / 1000)
+
+    def _key_of(self, key):
+        if self.hash_key not in key:
+            raise ClientError(
+                {"Error": {"Code": "ValidationException",
+                           "Message": "The provided key element does not match the schema"}},
+                "GetItem",
+            )
+        return key[self.hash_key]
+
+    def get_item(self, Key, ConsistentRead=False, ReturnConsumedCapacity="NONE",
+                 ProjectionExpression=None, ExpressionAttributeNames=None, **kwargs):
+        self._wait()
+        self.calls["get_item"] += 1
+        item = self.items.get(self._key_of(Key))
+        response = {"ResponseMetadata": {"HTTPStatusCode": 200}}
+        if item is not None:
+            if ProjectionExpression:
+                names = ExpressionAttributeNames or {}
+                wanted = [names.get(name.strip(), name.strip()) for name in ProjectionExpression.split(",")]
+                response["Item"] = {name: item[name] for name in wanted if name in item}
+            else:
+                response["Item"] = dict(item)
+        if ReturnConsumedCapacity != "NONE":
+            # Reads are billed on the full item size in 4 KB units, whatever is projected
+            size = sum(len(str(k)) + len(str(v)) for k, v in (item or {}).items())
+            units = max(1, -(-size // 4096)) * (1.0 if ConsistentRead else 0.5)
+            response["ConsumedCapacity"] = {"TableName": self.name, "CapacityUnits": units}
+        return response
+
+    def put_item(self, Item, ConditionExpression=None, ExpressionAttributeNames=None, **kwargs):
+        self._wait()
+        self.calls["put_item"] += 1
+        key = self._key_of(Item)
+        with self._lock:
+            # Only the attribute_not_exists(<hash key>) condition is supported
+            if ConditionExpression and key in self.items:
+                raise ClientError(
+                    {"Error": {"Code": "ConditionalCheckFailedException",
+                               "Message": "The conditional request failed"}},
+                    "PutItem",
+                )
+            self.items[key] = dict(Item)
+        return {"ResponseMetadata": {"HTTPStatusCode": 200}}
+
+
+class LocalDynamoDB:
+    """Stand-in for boto3.resource("dynamodb")"""
+
+    def __init__(self, latency_ms=0.0):
+        self.latency_ms = latency_ms
+        self.tables = {}
+
+    def Table(self, name):
+        if name not in self.tables:
+            self.tables[name] = LocalTable(name, latency_ms=self.latency_ms)
+        return self.tables[name]
+
+    def batch_write_item(self, RequestItems):
+        for table_name, requests in RequestItems.items():
+            table = self.Table(table_name)
+            table._wait()
+            for request in requests:
+                item = request["PutRequest"]["Item"]
+                table.items[table._key_of(item)] = dict(item)
+        return {"UnprocessedItems": {}}
+
+    def batch_get_item(self, RequestItems):
+        responses = {}
+        for table_name, request in RequestItems.items():
+            table = self.Table(table_name)
+            table._wait()
+            responses[table_name] = [
+                {table.hash_key: key[table.hash_key]}
+                for key in request["Keys"] if key[table.hash_key] in table.items
+            ]
+        return {"Responses": responses, "UnprocessedKeys": {}}
+
+
+class LocalDynamoDBClient:
+    """Stand-in for boto3.client("dynamodb"), backed by a LocalDynamoDB's tables"""
+
+    def __init__(self, dynamodb):
+        self.dynamodb = dynamodb
+
+    def get_item(self, TableName, Key, **kwargs):
+        # Only string attributes are stored, so {"S": value} is the whole type mapping
+        table = self.dynamodb.Table(TableName)
+        response = table.get_item(Key={name: value["S"] for name, value in Key.items()}, **kwargs)
+        if "Item" in response:
+            response["Item"] = {name: {"S": str(value)} for name, value in response["Item"].items()}
+        return response
+
+
+class LocalS3:
+    """Stand-in for boto3.client("s3") serving objects from memory"""
+
+    def __init__(self, objects=None, latency_ms=0.0):
+        self.objects = dict(objects or {})
+        self.latency_ms = latency_ms
+        self.calls = {"get_object": 0, "not_modified": 0}
+
+    def get_object(self, Bucket, Key, IfNoneMatch=None, **kwargs):
+        if self.latency_ms:
+            time.sleep(self.latency_ms / 1000)
+        self.calls["get_object"] += 1
+        if Key not in self.objects:
+            raise ClientError({"Error": {"Code": "NoSuchKey", "Message": Key}}, "GetObject")
+        body = self.objects[Key]
+        etag = f'"{hashlib.md5(body).hexdigest()}"'
+        if IfNoneMatch == etag:
+            self.calls["not_modified"] += 1
+            raise ClientError({"Error": {"Code": "304", "Message": "Not Modified"}}, "GetObject")
+        return {"Body": io.BytesIO(body), "ETag": etag, "ContentLength": len(body)}
+
+
+def make_event(method, path="/", query="", body=None, headers=None):
+    """Build an API Gateway HTTP API payload v2 event"""
+    return {
+        "version": "2.0",
+        "routeKey": f"{method} {path}",
+        "rawPath": path,
+        "rawQueryString": query,
+        "headers": dict(headers or {}),
+        "requestContext": {
+            "http": {"method": method, "path": path},
+            "timeEpoch": int(time.time() * 1000),
+        },
+        "body": body,
+        "isBase64Encoded": False,
+    }
+
+
+class LocalSubsegment:
+    """A finished or open subsegment recorded by LocalTraceCollector"""
+
+    def __init__(self, name, namespace, parent):
+        self.name = name
+        self.namespace = namespace
+        self.parent = parent
+        self.annotations = {}
+        self.exceptions = []
+        self.start_time = time.time()
+        self.end_time = None
+
+    def put_annotation(self, key, value):
+        self.annotations[key] = value
+
+    def add_exception(self, exception, stack, remote=False):
+        self.exceptions.append(exception)
+
+
+class LocalTraceCollector:
+    """Stand-in for the X-Ray recorder that keeps every finished subsegment"""
+
+    def __init__(self):
+        self.subsegments = []
+        self._lock = threading.Lock()
+        self._local = threading.local()
+
+    def _stack(self):
+        if not hasattr(self._local, "stack"):
+            self._local.stack = []
+        return self._local.stack
+
+    def begin_subsegment(self, name, namespace="local"):
+        stack = self._stack()
+        subsegment = LocalSubsegment(name, namespace, stack[-1].name if stack else None)
+        stack.append(subsegment)
+        return subsegment
+
+    def end_subsegment(self):
+        subsegment = self._stack().pop()
+        subsegment.end_time = time.time()
+        with self._lock:
+            self.subsegments.append(subsegment)
+
+    def names(self):
+        return [subsegment.name for subsegment in self.subsegments]
+
+
+class LocalBackend:
+    def __init__(self, dynamodb, s3):
+        self.dynamodb = dynamodb
+        self.s3 = s3
+
+
+def load_html_pages(html_dir=project_root / "html"):
+    return {path.name: path.read_bytes() for path in Path(html_dir).glob("*.html")}
+
+
+def install_local_aws(latency_ms=0.0, table_name="local-users", bucket_name="local-website"):
+    """Point the handlers' shared AWS client layer at fresh local stand-ins."""
+    os.environ["DB_TABLE_NAME"] = table_name
+    os.environ["WEBSITE_S3"] = bucket_name
+    os.environ.setdefault("AWS_DEFAULT_REGION", "eu-central-1")
+
+    backend = LocalBackend(LocalDynamoDB(latency_ms), LocalS3(load_html_pages(), latency_ms))
+    aws_clients.reset_clients()
+    aws_clients.install_resource("dynamodb", backend.dynamodb)
+    aws_clients.install_client("dynamodb", LocalDynamoDBClient(backend.dynamodb))
+    aws_clients.install_client("s3", backend.s3)
+    return backend
@@ -0,0 +1,248 @@
+#!/usr/bin/env python3
+"""
+Power-tuning benchmark for the Lambda handlers
+
+Replays API Gateway events through each handler in-process against the local
+DynamoDB/S3 stand-ins in tests/local_aws.py and recommends a memory size and
+architecture per function.
+
+Lambda allocates CPU in proportion to memory (one full vCPU at 1769 MB), so
+each invocation is measured once as CPU time plus waiting time, and then
+projected onto every candidate setting. The CPU part is stretched by the
+CPU share of that memory size, while the waiting part (simulated with
+--latency-ms) is not. Each setting is scored by its duration cost (GB-seconds,
+without the flat per-request price every setting pays alike) x latency, and
+the lowest score wins.
+
+Measurements run on this machine's architecture. The other architecture is
+only evaluated with a measured relative speed: pass --compare with the
+--output report of a run on the other architecture (the CPU time of each
+function is compared), or --arm64-speedup with a speed measured elsewhere.
+
+Events come from a JSONL file with one payload v2 event per line, as
+recorded from API Gateway or built with local_aws.make_event. Without
+--events a synthetic register/verify mix is used.
+
+Usage:
+    python tests/power_tuning.py
+    python tests/power_tuning.py --events recorded-events.jsonl --latency-ms 5
+    python tests/power_tuning.py --memory 128 256 512 1024 --output tuning-x86_64.json
+    python tests/power_tuning.py --compare tuning-x86_64.json    # run on an arm64 machine
+"""
+
+import argparse
+import importlib
+import json
+import math
+import os
+import platform
+import sys
+import time
+import uuid
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent))
+# Keep the handlers' EMF metric lines out of the report
+os.environ.setdefault("METRICS", "off")
+
+from local_aws import install_local_aws, make_event
+
+# Handler module behind each deployed function
+FUNCTIONS = {
+    "register-user": "register_user",
+    "verify-user": "verify_user",
+}
+
+FULL_VCPU_MEMORY_MB = 1769
+DEFAULT_MEMORY_SIZES = (128, 256, 512, 1024, 1769)
+
+# USD, eu-central-1 on-demand pricing
+PRICE_PER_GB_SECOND = {"x86_64": 0.0000166667, "arm64": 0.0000133334}
+PRICE_PER_REQUEST = 0.0000002
+
+
+def synthetic_events(count):
+    run_id = uuid.uuid4().hex[:8]
+    events = []
+    for i in range(count):
+        user_id = f"tune-{run_id}-{i}"
+        events.append(make_event("PUT", "/register", f"userId={user_id}"))
+        events.append(make_event("GET", "/", f"userId={user_id}"))
+        events.append(make_event("GET", "/", f"userId=tune-missing-{run_id}-{i}"))
+    return events
+
+
+def load_events(path):
+    with open(path) as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def function_for(event, modules):
+    """The function whose router serves ``event``'s routeKey"""
+    route_key = event.get("routeKey")
+    for function_key, module in modules.items():
+        if route_key in module.router.routes:
+            return function_key
+    return None
+
+
+def measure(handler, event, repeat):
+    """Median (cpu_ms, wait_ms) of ``repeat`` invocations"""
+    samples = []
+    for _ in range(repeat):
+        wall_start, cpu_start = time.perf_counter(), time.process_time()
+        handler(event, None)
+        cpu_ms = (time.process_time() - cpu_start) * 1000
+        wall_ms = (time.perf_counter() - wall_start) * 1000
+        samples.append((cpu_ms, max(0.0, wall_ms - cpu_ms)))
+    samples.sort()
+    return samples[len(samples) // 2]
+
+
+def host_architecture():
+    return "arm64" if platform.machine().lower() in ("arm64", "aarch64") else "x86_64"
+
+
+def architecture_speeds(host, arm64_speedup):
+    """CPU speed of each evaluable architecture relative to ``host`` (arm64 needs a measured speedup)"""
+    if arm64_speedup is None:
+        return {host: 1.0}
+    relative = {"x86_64": 1.0, "arm64": arm64_speedup}
+    return {architecture: speed / relative[host] for architecture, speed in relative.items()}
+
+
+def measured_arm64_speedup(function_key, cpu_ms_mean, host, comparison):
+    """x86_64 CPU time over arm64 CPU time, from a report of a run on the other architecture"""
+    other = (comparison or {}).get(function_key)
+    if not other or other.get("measured_on") == host or not other.get("cpu_ms_mean") or not cpu_ms_mean:
+        return None
+    if host == "x86_64":
+        return cpu_ms_mean / other["cpu_ms_mean"]
+    return other["cpu_ms_mean"] / cpu_ms_mean
+
+
+def project(measurements, memory_mb, architecture, speed):
+    """Projected latency and cost of ``measurements`` at one memory/architecture setting"""
+    cpu_share = min(1.0, memory_mb / FULL_VCPU_MEMORY_MB)
+    durations = sorted(cpu_ms / (cpu_share * speed) + wait_ms for cpu_ms, wait_ms in measurements)
+    mean_ms = sum(durations) / len(durations)
+    # Lambda bills duration in 1 ms increments
+    gb_seconds = sum(math.ceil(d) for d in durations) / 1000 * memory_mb / 1024
+    duration_cost_per_million = gb_seconds * PRICE_PER_GB_SECOND[architecture] / len(durations) * 1_000_000
+    return {
+        "memory_mb": memory_mb,
+        "architecture": architecture,
+        "mean_ms": round(mean_ms, 3),
+        "p95_ms": round(durations[min(len(durations) - 1, int(0.95 * len(durations)))], 3),
+        "cost_per_million_usd": round(duration_cost_per_million + PRICE_PER_REQUEST * 1_000_000, 4),
+        # The per-request price is the same for every setting, so only duration cost is weighed
+        "score": round(duration_cost_per_million * mean_ms, 4),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Recommend Lambda memory/architecture settings")
+    parser.add_argument("--events", help="JSONL file of API Gateway payload v2 events")
+    parser.add_argument("--synthetic", type=int, default=100, help="Synthetic users when --events is not given")
+    parser.add_argument("--repeat", type=int, default=1,
+                        help="Invocations per event, the median is used (repeats are served from the caches)")
+    parser.add_argument("--latency-ms", type=float, default=2.0,
+                        help="Simulated latency per local DynamoDB/S3 call")
+    parser.add_argument("--memory", type=int, nargs="+", default=list(DEFAULT_MEMORY_SIZES),
+                        help="Memory sizes (MB) to evaluate")
+    parser.add_argument("--architectures", nargs="+", default=["x86_64", "arm64"],
+                        choices=sorted(PRICE_PER_GB_SECOND), help="Architectures to evaluate")
+    parser.add_argument("--arm64-speedup", type=float,
+                        help="Measured CPU speed of arm64 relative to x86_64 for this code")
+    parser.add_argument("--compare",
+                        help="--output report of a run on the other architecture, to measure the arm64 speedup")
+    parser.add_argument("--output", help="Write the full report as JSON")
+    args = parser.parse_args()
+
+    host = host_architecture()
+    comparison = None
+    if args.compare:
+        with open(args.compare) as f:
+            comparison = json.load(f)
+
+    install_local_aws(latency_ms=args.latency_ms)
+    modules = {key: importlib.import_module(name) for key, name in FUNCTIONS.items()}
+    events = load_events(args.events) if args.events else synthetic_events(args.synthetic)
+
+    measurements = {key: [] for key in modules}
+    skipped = 0
+    for event in events:
+        function_key = function_for(event, modules)
+        if function_key is None:
+            skipped += 1
+            continue
+        measurements[function_key].append(measure(modules[function_key].lambda_handler, event, args.repeat))
+
+    print("🚀 Power tuning Lambda handlers")
+    print("=" * 60)
+    if skipped:
+        print(f"⚠️  Skipped {skipped} events with no matching function")
+
+    print(f"Measured on {host}")
+
+    report = {}
+    for function_key, samples in measurements.items():
+        if not samples:
+            continue
+        cpu_ms_mean = sum(cpu_ms for cpu_ms, _ in samples) / len(samples)
+        arm64_speedup = args.arm64_speedup
+        if arm64_speedup is None:
+            arm64_speedup = measured_arm64_speedup(function_key, cpu_ms_mean, host, comparison)
+        speeds = architecture_speeds(host, arm64_speedup)
+        architectures = [architecture for architecture in args.architectures if architecture in speeds]
+        if not architectures:
+            print(f"⚠️  {function_key}: no measured speed for {', '.join(args.architectures)}, skipped")
+            continue
+        settings = [
+            project(samples, memory_mb, architecture, speeds[architecture])
+            for architecture in architectures
+            for memory_mb in args.memory
+        ]
+        best = min(settings, key=lambda setting: setting["score"])
+        report[function_key] = {
+            "events": len(samples),
+            "measured_on": host,
+            "cpu_ms_mean": round(cpu_ms_mean, 4),
+            "arm64_speedup": round(arm64_speedup, 3) if arm64_speedup is not None else None,
+            "settings": settings,
+            "recommended": best,
+        }
+
+        print(f"\n📋 {function_key} ({len(samples)} events)")
+        print("-" * 60)
+        skipped_architectures = sorted(set(args.architectures) - set(architectures))
+        if skipped_architectures:
+            print(f"  ⚠️  {', '.join(skipped_architectures)} not evaluated: "
+                  f"pass --compare or --arm64-speedup with a measured speed")
+        elif arm64_speedup is not None:
+            print(f"  arm64 speed relative to x86_64: {arm64_speedup:.2f}")
+        print(f"  {'memory':>7} {'arch':>7} {'mean ms':>9} {'p95 ms':>9} {'$/1M':>9} {'score':>10}")
+        for setting in settings:
+            marker = " ⬅" if setting is best else ""
+            print(f"  {setting['memory_mb']:>7} {setting['architecture']:>7} {setting['mean_ms']:>9.2f} "
+                  f"{setting['p95_ms']:>9.2f} {setting['cost_per_million_usd']:>9.4f} {setting['score']:>10.4f}{marker}")
+
+    if report:
+        print("\n✅ Recommended terraform.tfvars:")
+        print("lambda_memory_size = {")
+        for function_key, result in report.items():
+            print(f'  {function_key} = {result["recommended"]["memory_mb"]}')
+        print("}")
+        print("lambda_architecture = {")
+        for function_key, result in report.items():
+            print(f'  {function_key} = "{result["recommended"]["architecture"]}"')
+        print("}")
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"\n📝 Report written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,231 @@
+#!/usr/bin/env python3
+"""
+Cold-start profiler for the Lambda handlers in src/
+
+Each handler is profiled in a fresh Python process (run with -X importtime)
+that measures three phases of a cold start:
+
+1. import      - importing the handler module
+2. first_client - building the real boto3 clients the handler uses
+3. first_request - the first invocation, served by the local stand-ins
+
+The -X importtime output is folded into a per-module breakdown. A handler
+fails the check when its total cold start exceeds the configured budget.
+
+Like /var/task on Lambda, the code is imported from a fresh directory
+without writing bytecode, so source modules are compiled on every cold start.
+Pass --package to profile a zip built by packaging/build.py instead (which
+ships precompiled bytecode), and --layer to import boto3 from the dependency
+layer. Comparing the two runs shows the init time the packaging saves.
+
+Usage:
+    python tests/profile_cold_start.py
+    python tests/profile_cold_start.py --budget-ms 800 --budget verify_user=1000
+    python tests/profile_cold_start.py --top 15 --output cold-start.json
+    python tests/profile_cold_start.py --package packaging/dist/functions.zip \
+        --layer packaging/dist/dependencies-layer-x86_64.zip
+"""
+
+import argparse
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+import zipfile
+from pathlib import Path
+
+project_root = Path(__file__).parent.parent
+src_dir = project_root / "src"
+
+# AWS services each handler talks to on its first request
+HANDLER_CLIENTS = {
+    "hello_world": [],
+    "register_user": [("resource", "dynamodb")],
+    # verify reads through the low-level client so its lookups can be hedged
+    "verify_user": [("client", "dynamodb"), ("client", "s3")],
+    "app": [("client", "dynamodb"), ("client", "s3")],
+}
+
+FIRST_REQUESTS = {
+    "hello_world": ("GET", "/", ""),
+    "register_user": ("PUT", "/register", "userId=cold-start-profile"),
+    "verify_user": ("GET", "/", "userId=cold-start-profile"),
+    "app": ("GET", "/", "userId=cold-start-profile"),
+}
+
+
+def discover_handlers():
+    """Every module in src/ that defines a lambda_handler"""
+    return sorted(
+        path.stem for path in src_dir.glob("*.py")
+        if "def lambda_handler" in path.read_text(encoding="utf-8")
+    )
+
+
+def child(module_name):
+    """Runs inside the profiled interpreter and prints the phase timings as JSON"""
+    os.environ.setdefault("AWS_DEFAULT_REGION", "eu-central-1")
+    os.environ.setdefault("DB_TABLE_NAME", "cold-start-profile")
+    os.environ.setdefault("WEBSITE_S3", "cold-start-profile")
+    if os.getenv("COLD_START_LAYER_DIR"):
+        sys.path.insert(0, os.environ["COLD_START_LAYER_DIR"])
+    sys.path.insert(0, os.getenv("COLD_START_CODE_DIR", str(src_dir)))
+
+    start = time.perf_counter()
+    handler = __import__(module_name)
+    import_ms = (time.perf_counter() - start) * 1000
+
+    start = time.perf_counter()
+    clients = HANDLER_CLIENTS.get(module_name, [])
+    if clients:
+        import aws_clients
+
+        for kind, service_name in clients:
+            if kind == "resource":
+                aws_clients.get_resource(service_name)
+            else:
+                aws_clients.get_client(service_name)
+    first_client_ms = (time.perf_counter() - start) * 1000
+
+    sys.path.insert(0, str(Path(__file__).parent))
+    from local_aws import install_local_aws, make_event
+
+    install_local_aws()
+    method, path, query = FIRST_REQUESTS.get(module_name, ("GET", "/", ""))
+    start = time.perf_counter()
+    handler.lambda_handler(make_event(method, path, query), None)
+    first_request_ms = (time.perf_counter() - start) * 1000
+
+    print(json.dumps({
+        "import_ms": round(import_ms, 3),
+        "first_client_ms": round(first_client_ms, 3),
+        "first_request_ms": round(first_request_ms, 3),
+    }))
+
+
+def parse_importtime(stderr):
+    """Parse -X importtime lines into (self_us, cumulative_us, depth, module) tuples"""
+    entries = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|", 2)
+        depth = (len(name) - len(name.lstrip())) // 2
+        entries.append((int(self_us), int(cumulative_us), depth, name.strip()))
+    return entries
+
+
+def import_breakdown(entries, top):
+    """Top-level imports by cumulative time and the heaviest modules by self time"""
+    top_level = sorted((e for e in entries if e[2] == 0), key=lambda e: e[1], reverse=True)
+    heaviest = sorted(entries, key=lambda e: e[0], reverse=True)
+    return {
+        "total_import_ms": round(sum(e[0] for e in entries) / 1000, 3),
+        "top_level": [{"module": e[3], "cumulative_ms": round(e[1] / 1000, 3)} for e in top_level[:top]],
+        "self_time": [{"module": e[3], "self_ms": round(e[0] / 1000, 3)} for e in heaviest[:top]],
+    }
+
+
+def prepare_code(work_dir, package, layer):
+    """Lay out the function code (and layer) like the Lambda runtime would see them"""
+    code_dir = work_dir / "task"
+    if package:
+        with zipfile.ZipFile(package) as archive:
+            archive.extractall(code_dir)
+    else:
+        code_dir.mkdir()
+        for path in src_dir.glob("*.py"):
+            shutil.copyfile(path, code_dir / path.name)
+    env = dict(os.environ, COLD_START_CODE_DIR=str(code_dir))
+    if layer:
+        with zipfile.ZipFile(layer) as archive:
+            archive.extractall(work_dir / "opt")
+        env["COLD_START_LAYER_DIR"] = str(work_dir / "opt" / "python")
+    return env
+
+
+def profile(module_name, top, package=None, layer=None):
+    with tempfile.TemporaryDirectory() as tmp:
+        env = prepare_code(Path(tmp), package, layer)
+        result = subprocess.run(
+            [sys.executable, "-B", "-X", "importtime", __file__, "--child", module_name],
+            capture_output=True,
+            text=True,
+            timeout=120,
+            env=env,
+        )
+    if result.returncode != 0:
+        raise RuntimeError(f"profiling {module_name} failed:\n{result.stderr[-2000:]}")
+    phases = json.loads(result.stdout.strip().splitlines()[-1])
+    phases["total_ms"] = round(sum(phases.values()), 3)
+    phases["imports"] = import_breakdown(parse_importtime(result.stderr), top)
+    return phases
+
+
+def parse_budgets(values):
+    budgets = {}
+    for value in values:
+        name, _, ms = value.partition("=")
+        budgets[name] = float(ms)
+    return budgets
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Profile Lambda handler cold starts")
+    parser.add_argument("--child", help=argparse.SUPPRESS)
+    parser.add_argument("--handler", action="append", help="Handler module to profile (default: all in src/)")
+    parser.add_argument("--budget-ms", type=float, help="Cold-start budget applied to every handler")
+    parser.add_argument("--budget", action="append", default=[], metavar="HANDLER=MS",
+                        help="Per-handler cold-start budget, overrides --budget-ms")
+    parser.add_argument("--top", type=int, default=10, help="Modules to show in the import breakdown")
+    parser.add_argument("--package", help="Profile a functions.zip built by packaging/build.py")
+    parser.add_argument("--layer", help="Import dependencies from a layer zip built by packaging/build.py")
+    parser.add_argument("--output", help="Write the full report as JSON")
+    args = parser.parse_args()
+
+    if args.child:
+        child(args.child)
+        return
+
+    budgets = parse_budgets(args.budget)
+    report = {}
+    over_budget = []
+
+    print(f"🚀 Profiling handler cold starts ({'package ' + args.package if args.package else 'source'})")
+    print("=" * 60)
+    for module_name in args.handler or discover_handlers():
+        phases = profile(module_name, args.top, args.package, args.layer)
+        report[module_name] = phases
+
+        print(f"\n📋 {module_name}")
+        print("-" * 40)
+        print(f"  import         {phases['import_ms']:>9.1f} ms")
+        print(f"  first client   {phases['first_client_ms']:>9.1f} ms")
+        print(f"  first request  {phases['first_request_ms']:>9.1f} ms")
+        print(f"  total          {phases['total_ms']:>9.1f} ms")
+        print("  heaviest imports (cumulative):")
+        for entry in phases["imports"]["top_level"]:
+            print(f"    {entry['cumulative_ms']:>9.1f} ms  {entry['module']}")
+
+        budget = budgets.get(module_name, args.budget_ms)
+        if budget is not None:
+            phases["budget_ms"] = budget
+            if phases["total_ms"] > budget:
+                over_budget.append(module_name)
+                print(f"❌ {module_name} cold start {phases['total_ms']:.1f} ms exceeds budget {budget:.1f} ms")
+            else:
+                print(f"✅ {module_name} within budget {budget:.1f} ms")
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"\n📝 Report written to {args.output}")
+
+    sys.exit(1 if over_budget else 0)
+
+
+if __name__ == "__main__":
+    main()
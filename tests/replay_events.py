@@ -0,0 +1,391 @@
+#!/usr/bin/env python3
+"""
+Offline replay of recorded API Gateway events against the Lambda handlers
+
+Streams a JSONL file of payload v2 events, one per line, and invokes the
+handler serving each event's routeKey (hello_world, register_user or
+verify_user) in-process against the local DynamoDB/S3 stand-ins in
+tests/local_aws.py. The file is read line by line and never loaded as a whole,
+and latencies go into fixed-size histograms, so memory stays flat however
+long the recording is.
+
+A line is either a bare event or {"event": {...}, "expected": {...}}. When a
+response is expected, the replayed one is compared with it and the
+differences are reported. --record writes every event with its response in
+that format, so a replay of today's code can be diffed against tomorrow's:
+
+    python tests/replay_events.py --events traffic.jsonl --record baseline.jsonl
+    python tests/replay_events.py --events baseline.jsonl
+
+--workers N replays across N processes, each with its own local table. Writes
+(the register routes) are replayed on every worker and reported once, so each
+table holds every registration made earlier in the file and reads (sharded by
+userId) see the same data as in a single-process replay.
+
+Usage:
+    python tests/replay_events.py --events traffic.jsonl
+    python tests/replay_events.py --events traffic.jsonl --workers 4 --latency-ms 2
+    python tests/replay_events.py --events traffic.jsonl --deadline-ms 3000 --output replay.json
+"""
+
+import argparse
+import importlib
+import json
+import math
+import multiprocessing
+import os
+import sys
+import threading
+import time
+import zlib
+from pathlib import Path
+from urllib.parse import parse_qs
+
+sys.path.insert(0, str(Path(__file__).parent))
+# Keep the handlers' EMF metric lines out of the report
+os.environ.setdefault("METRICS", "off")
+
+from local_aws import install_local_aws
+
+HANDLER_MODULES = ("hello_world", "register_user", "verify_user")
+# Compared between the expected and the replayed response
+COMPARED_FIELDS = ("statusCode", "headers", "body", "isBase64Encoded")
+QUEUE_SIZE = 1000
+MAX_REPORTED_DIFFS = 20
+
+
+class LatencyHistogram:
+    """Log-bucketed latency histogram (about 9% resolution) with constant memory"""
+
+    BUCKETS_PER_DOUBLING = 8
+    MIN_MS = 0.001
+
+    def __init__(self):
+        self.buckets = {}
+        self.count = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+
+    def add(self, value_ms):
+        index = self._index(value_ms)
+        self.buckets[index] = self.buckets.get(index, 0) + 1
+        self.count += 1
+        self.total_ms += value_ms
+        self.max_ms = max(self.max_ms, value_ms)
+
+    def merge(self, other):
+        for index, count in other.buckets.items():
+            self.buckets[index] = self.buckets.get(index, 0) + count
+        self.count += other.count
+        self.total_ms += other.total_ms
+        self.max_ms = max(self.max_ms, other.max_ms)
+
+    def _index(self, value_ms):
+        return max(0, math.ceil(math.log2(max(value_ms, self.MIN_MS) / self.MIN_MS) * self.BUCKETS_PER_DOUBLING))
+
+    def upper_bound(self, index):
+        return self.MIN_MS * 2 ** (index / self.BUCKETS_PER_DOUBLING)
+
+    def percentile(self, fraction):
+        """Upper bound of the bucket holding the ``fraction`` percentile"""
+        if not self.count:
+            return 0.0
+        rank = max(1, math.ceil(fraction * self.count))
+        seen = 0
+        for index in sorted(self.buckets):
+            seen += self.buckets[index]
+            if seen >= rank:
+                return min(self.upper_bound(index), self.max_ms)
+        return self.max_ms
+
+    def summary(self):
+        return {
+            "count": self.count,
+            "mean_ms": round(self.total_ms / self.count, 3) if self.count else 0.0,
+            "p50_ms": round(self.percentile(0.50), 3),
+            "p95_ms": round(self.percentile(0.95), 3),
+            "p99_ms": round(self.percentile(0.99), 3),
+            "max_ms": round(self.max_ms, 3),
+        }
+
+    def render(self, rows=12, width=40):
+        """ASCII bars over ``rows`` ranges of roughly equal log width"""
+        if not self.count:
+            return []
+        low, high = min(self.buckets), max(self.buckets)
+        step = max(1, math.ceil((high - low + 1) / rows))
+        ranges = []
+        for start in range(low, high + 1, step):
+            count = sum(self.buckets.get(index, 0) for index in range(start, start + step))
+            ranges.append((self.upper_bound(start + step - 1), count))
+        peak = max(count for _, count in ranges)
+        return [
+            f"  ≤ {bound:>10.3f} ms {count:>8} {'█' * max(1 if count else 0, round(width * count / peak))}"
+            for bound, count in ranges
+        ]
+
+
+class FakeContext:
+    """Lambda context whose remaining time starts at ``deadline_ms`` for each invocation"""
+
+    def __init__(self, deadline_ms):
+        self.aws_request_id = "replay"
+        self._deadline = time.monotonic() + deadline_ms / 1000
+
+    def get_remaining_time_in_millis(self):
+        return int((self._deadline - time.monotonic()) * 1000)
+
+
+def read_events(path):
+    """Yield (line_number, event, expected) for each non-blank line of ``path``"""
+    stream = sys.stdin if path == "-" else open(path)
+    try:
+        for line_number, line in enumerate(stream, 1):
+            if not line.strip():
+                continue
+            try:
+                record = json.loads(line)
+            except ValueError as e:
+                yield line_number, None, {"error": f"invalid JSON: {e}"}
+                continue
+            if "event" in record:
+                yield line_number, record["event"], record.get("expected")
+            else:
+                yield line_number, record, None
+    finally:
+        if stream is not sys.stdin:
+            stream.close()
+
+
+def shard_of(event, line_number, workers):
+    """Worker for a read: by userId, falling back to the line for events without one"""
+    query = parse_qs((event or {}).get("rawQueryString") or "")
+    user_id = (query.get("userId") or [""])[0]
+    if not user_id:
+        return line_number % workers
+    return zlib.crc32(user_id.encode("utf-8")) % workers
+
+
+def diff_response(expected, actual):
+    """Fields of ``actual`` that differ from ``expected``, as {field: {expected, actual}}"""
+    differences = {}
+    for field in COMPARED_FIELDS:
+        if expected.get(field) != actual.get(field):
+            differences[field] = {"expected": expected.get(field), "actual": actual.get(field)}
+    return differences
+
+
+class Replayer:
+    """Invokes the handlers for replayed events inside one process"""
+
+    def __init__(self, latency_ms, deadline_ms):
+        self.deadline_ms = deadline_ms
+        install_local_aws(latency_ms=latency_ms)
+        modules = [importlib.import_module(name) for name in HANDLER_MODULES]
+        self.routes = {}
+        for module in modules:
+            for route_key in module.router.routes:
+                self.routes[route_key] = module.lambda_handler
+
+    def replay(self, line_number, event, expected, record):
+        """Return the outcome of one event as a small picklable dict"""
+        if event is None:
+            return {"line": line_number, "route": None, "error": expected["error"]}
+        route = event.get("routeKey")
+        handler = self.routes.get(route)
+        if handler is None:
+            return {"line": line_number, "route": route, "error": "no handler for route"}
+
+        context = FakeContext(self.deadline_ms) if self.deadline_ms else None
+        start = time.perf_counter()
+        try:
+            response = handler(event, context)
+        except Exception as e:
+            return {"line": line_number, "route": route, "error": f"{type(e).__name__}: {e}"}
+        outcome = {
+            "line": line_number,
+            "route": route,
+            "duration_ms": (time.perf_counter() - start) * 1000,
+            "status": response.get("statusCode"),
+        }
+        if expected is not None:
+            outcome["diff"] = diff_response(expected, response)
+        if record:
+            outcome["record"] = {"event": event, "expected": response}
+        return outcome
+
+
+def worker_loop(tasks, results, latency_ms, deadline_ms, record):
+    replayer = Replayer(latency_ms, deadline_ms)
+    while True:
+        task = tasks.get()
+        if task is None:
+            results.put(None)
+            return
+        *event_task, report = task
+        outcome = replayer.replay(*event_task, record)
+        if report:
+            results.put(outcome)
+
+
+class Report:
+    """Aggregates replay outcomes as they arrive"""
+
+    def __init__(self, record_path=None):
+        self.histograms = {}
+        self.statuses = {}
+        self.errors = []
+        self.error_count = 0
+        self.diffs = []
+        self.matched = 0
+        self.mismatched = 0
+        self.record_file = open(record_path, "w") if record_path else None
+
+    def add(self, outcome):
+        if "error" in outcome:
+            self.error_count += 1
+            if len(self.errors) < MAX_REPORTED_DIFFS:
+                self.errors.append(outcome)
+            return
+        route = outcome["route"]
+        self.histograms.setdefault(route, LatencyHistogram()).add(outcome["duration_ms"])
+        route_statuses = self.statuses.setdefault(route, {})
+        route_statuses[outcome["status"]] = route_statuses.get(outcome["status"], 0) + 1
+        if "diff" in outcome:
+            if outcome["diff"]:
+                self.mismatched += 1
+                if len(self.diffs) < MAX_REPORTED_DIFFS:
+                    self.diffs.append({"line": outcome["line"], "route": route, "diff": outcome["diff"]})
+            else:
+                self.matched += 1
+        if self.record_file is not None:
+            self.record_file.write(json.dumps(outcome["record"]) + "\n")
+
+    def close(self):
+        if self.record_file is not None:
+            self.record_file.close()
+
+
+def replay_in_process(events, args, report):
+    replayer = Replayer(args.latency_ms, args.deadline_ms)
+    for line_number, event, expected in events:
+        report.add(replayer.replay(line_number, event, expected, bool(args.record)))
+
+
+def replay_in_pool(events, args, report):
+    """Shard events over worker processes through bounded queues"""
+    context = multiprocessing.get_context("spawn")
+    task_queues = [context.Queue(QUEUE_SIZE) for _ in range(args.workers)]
+    results = context.Queue()
+    workers = [
+        context.Process(target=worker_loop,
+                        args=(task_queues[i], results, args.latency_ms, args.deadline_ms, bool(args.record)))
+        for i in range(args.workers)
+    ]
+    for worker in workers:
+        worker.start()
+
+    def collect():
+        finished = 0
+        while finished < len(workers):
+            outcome = results.get()
+            if outcome is None:
+                finished += 1
+            else:
+                report.add(outcome)
+
+    collector = threading.Thread(target=collect)
+    collector.start()
+    # Every route of the register handler writes to the table
+    write_routes = set(importlib.import_module("register_user").router.routes)
+    for line_number, event, expected in events:
+        # put() blocks while a worker is QUEUE_SIZE events behind, which bounds memory
+        if event is not None and event.get("routeKey") in write_routes:
+            # Replay writes everywhere, in file order, and report them from one worker
+            for index, task_queue in enumerate(task_queues):
+                task_queue.put((line_number, event, expected, index == 0))
+        else:
+            task_queues[shard_of(event, line_number, args.workers)].put((line_number, event, expected, True))
+    for task_queue in task_queues:
+        task_queue.put(None)
+    collector.join()
+    for worker in workers:
+        worker.join()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Replay recorded API Gateway events against the handlers")
+    parser.add_argument("--events", required=True, help="JSONL file of payload v2 events ('-' for stdin)")
+    parser.add_argument("--workers", type=int, default=1, help="Worker processes (1 replays in this process)")
+    parser.add_argument("--latency-ms", type=float, default=0.0,
+                        help="Simulated latency per local DynamoDB/S3 call")
+    parser.add_argument("--deadline-ms", type=float, default=0,
+                        help="Remaining time reported by the Lambda context (0 passes no context)")
+    parser.add_argument("--record", help="Write each event with its replayed response to this JSONL file")
+    parser.add_argument("--output", help="Write the report as JSON")
+    args = parser.parse_args()
+
+    print("🚀 Replaying events")
+    print("=" * 60)
+    report = Report(args.record)
+    start = time.perf_counter()
+    try:
+        events = read_events(args.events)
+        if args.workers > 1:
+            replay_in_pool(events, args, report)
+        else:
+            replay_in_process(events, args, report)
+    finally:
+        report.close()
+    wall = time.perf_counter() - start
+
+    total = sum(histogram.count for histogram in report.histograms.values())
+    print(f"Replayed {total} events in {wall:.2f}s ({total / wall if wall else 0:.1f}/s) "
+          f"with {args.workers} worker(s)")
+    for route, histogram in sorted(report.histograms.items()):
+        summary = histogram.summary()
+        statuses = ", ".join(f"{status}: {count}" for status, count in sorted(report.statuses[route].items()))
+        print(f"\n📋 {route} ({summary['count']} events; {statuses})")
+        print("-" * 60)
+        print(f"  mean {summary['mean_ms']:.3f} ms  p50 {summary['p50_ms']:.3f}  p95 {summary['p95_ms']:.3f}  "
+              f"p99 {summary['p99_ms']:.3f}  max {summary['max_ms']:.3f}")
+        for line in histogram.render():
+            print(line)
+
+    if report.matched or report.mismatched:
+        print(f"\n🔍 Responses: {report.matched} matched, {report.mismatched} differ")
+        for entry in report.diffs:
+            fields = ", ".join(entry["diff"])
+            print(f"  ❌ line {entry['line']} ({entry['route']}): {fields}")
+            for field, values in entry["diff"].items():
+                print(f"       {field}: expected {str(values['expected'])[:80]!r}")
+                print(f"       {' ' * len(field)}  actual   {str(values['actual'])[:80]!r}")
+    if report.error_count:
+        print(f"\n⚠️  {report.error_count} events could not be replayed")
+        for error in report.errors:
+            print(f"  line {error['line']} ({error['route']}): {error['error']}")
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump({
+                "events": total,
+                "wall_seconds": round(wall, 3),
+                "workers": args.workers,
+                "routes": {
+                    route: {**histogram.summary(), "statuses": report.statuses[route]}
+                    for route, histogram in report.histograms.items()
+                },
+                "matched": report.matched,
+                "mismatched": report.mismatched,
+                "diffs": report.diffs,
+                "errors": report.error_count,
+            }, f, indent=2, default=str)
+        print(f"\n📝 Report written to {args.output}")
+    if args.record:
+        print(f"📝 Responses recorded to {args.record}")
+
+    sys.exit(1 if report.mismatched or report.error_count else 0)
+
+
+if __name__ == "__main__":
+    main()
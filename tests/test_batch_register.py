@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the batch registration path (POST /register/batch)
+
+In overwrite mode DynamoDB is replaced by an in-memory fake that leaves the
+first attempt of selected items unprocessed, as a throttled table would.
+Conditional mode runs against the local stand-ins in tests/local_aws.py.
+"""
+
+import json
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+import dynamodb_batch
+import register_user
+from lookup_cache import lookup_cache
+
+
+class FlakyDynamoDB:
+    def __init__(self, throttle_once=()):
+        self.items = {}
+        self.calls = []
+        self.throttle_once = set(throttle_once)
+
+    def batch_write_item(self, RequestItems):
+        (table_name, requests), = RequestItems.items()
+        self.calls.append(len(requests))
+        assert len(requests) <= dynamodb_batch.BATCH_WRITE_LIMIT
+        unprocessed = []
+        for request in requests:
+            item = request["PutRequest"]["Item"]
+            if item["userId"] in self.throttle_once:
+                self.throttle_once.discard(item["userId"])
+                unprocessed.append(request)
+            else:
+                self.items[item["userId"]] = item
+        return {"UnprocessedItems": {table_name: unprocessed} if unprocessed else {}}
+
+
+def _install(monkeypatch, fake):
+    monkeypatch.setattr(dynamodb_batch, "get_resource", lambda service_name: fake)
+    monkeypatch.setattr(dynamodb_batch.time, "sleep", lambda seconds: None)
+    monkeypatch.setenv("DB_TABLE_NAME", "users")
+    monkeypatch.setattr(register_user, "REGISTER_MODE", "overwrite")
+
+
+def test_batch_is_chunked_and_unprocessed_items_are_retried(monkeypatch):
+    fake = FlakyDynamoDB(throttle_once={"user-3", "user-40"})
+    _install(monkeypatch, fake)
+    body = json.dumps([{"userId": f"user-{i}"} for i in range(60)])
+
+    response = register_user.lambda_handler(
+        {"routeKey": "POST /register/batch", "body": body}, None)
+
+    payload = json.loads(response["body"])
+    assert response["statusCode"] == 200
+    assert payload["registered"] == 60
+    assert len(fake.items) == 60
+    assert fake.calls == [25, 1, 25, 1, 10]
+
+
+def test_ndjson_body_reports_invalid_entries(monkeypatch):
+    fake = FlakyDynamoDB()
+    _install(monkeypatch, fake)
+    body = '{"userId": "a"}\n{"name": "no id"}\n{"userId": "b"}\n'
+
+    response = register_user.lambda_handler(
+        {"routeKey": "POST /register/batch", "body": body}, None)
+
+    payload = json.loads(response["body"])
+    assert response["statusCode"] == 207
+    assert payload["registered"] == 2
+    assert [r["status"] for r in payload["results"]] == ["invalid", "registered", "registered"]
+
+
+def test_unparseable_body_is_rejected():
+    response = register_user.lambda_handler(
+        {"routeKey": "POST /register/batch", "body": "not json\nat all"}, None)
+
+    assert response["statusCode"] == 400
+
+
+def test_conditional_batch_does_not_rewrite_existing_users(backend):
+    table = backend.dynamodb.Table("local-users")
+    table.items["alice"]["registeredAt"] = "2024-01-01"
+    body = json.dumps([{"userId": "alice"}, {"userId": "bob"}])
+
+    response = register_user.lambda_handler(
+        {"routeKey": "POST /register/batch", "body": body}, None)
+
+    payload = json.loads(response["body"])
+    assert response["statusCode"] == 200
+    assert payload["results"] == [
+        {"userId": "alice", "status": "already_registered"},
+        {"userId": "bob", "status": "registered"},
+    ]
+    assert table.items["alice"] == {"userId": "alice", "registeredAt": "2024-01-01"}
+    assert table.calls["put_item"] == 2
+
+
+def test_registration_does_not_count_towards_lookup_statistics(backend):
+    body = json.dumps([{"userId": "bob"}, {"userId": "bob"}])
+    register_user.lambda_handler({"routeKey": "POST /register/batch", "body": body}, None)
+    register_user.lambda_handler({"routeKey": "POST /register/batch", "body": body}, None)
+
+    assert lookup_cache.stats()["hits"] == 0
+    assert lookup_cache.stats()["misses"] == 0
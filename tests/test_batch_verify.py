@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the batch verification path (POST /verify/batch)
+"""
+
+import json
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+import dynamodb_batch
+import verify_user
+from lookup_cache import lookup_cache
+
+
+class FakeDynamoDB:
+    def __init__(self, user_ids, unprocessed_once=()):
+        self.user_ids = set(user_ids)
+        self.unprocessed_once = set(unprocessed_once)
+        self.calls = []
+
+    def batch_get_item(self, RequestItems):
+        (table_name, request), = RequestItems.items()
+        keys = request["Keys"]
+        self.calls.append(len(keys))
+        assert len(keys) <= dynamodb_batch.BATCH_GET_LIMIT
+        found, unprocessed = [], []
+        for key in keys:
+            if key["userId"] in self.unprocessed_once:
+                self.unprocessed_once.discard(key["userId"])
+                unprocessed.append(key)
+            elif key["userId"] in self.user_ids:
+                found.append({"userId": key["userId"]})
+        response = {"Responses": {table_name: found}, "UnprocessedKeys": {}}
+        if unprocessed:
+            response["UnprocessedKeys"] = {table_name: {"Keys": unprocessed}}
+        return response
+
+
+def _verify_batch(monkeypatch, fake, body):
+    lookup_cache.clear()
+    monkeypatch.setattr(dynamodb_batch, "get_resource", lambda service_name: fake)
+    monkeypatch.setenv("DB_TABLE_NAME", "users")
+    response = verify_user.lambda_handler({"routeKey": "POST /verify/batch", "body": body}, None)
+    return response, json.loads(response["body"])
+
+
+def test_keys_are_chunked_and_unprocessed_keys_retried(monkeypatch):
+    registered = {f"user-{i}" for i in range(0, 250, 2)}
+    fake = FakeDynamoDB(registered, unprocessed_once={"user-10"})
+    user_ids = [f"user-{i}" for i in range(250)]
+
+    response, payload = _verify_batch(monkeypatch, fake, json.dumps({"userIds": user_ids}))
+
+    assert response["statusCode"] == 200
+    assert fake.calls == [100, 1, 100, 50]
+    assert payload["results"] == {user_id: user_id in registered for user_id in user_ids}
+    assert payload["unresolved"] == []
+
+
+def test_found_users_are_cached_and_misses_are_read_again(monkeypatch):
+    fake = FakeDynamoDB({"a"})
+    _verify_batch(monkeypatch, fake, '["a", "b"]')
+    fake.calls.clear()
+    fake.user_ids.add("b")
+
+    payload = json.loads(verify_user.lambda_handler(
+        {"routeKey": "POST /verify/batch", "body": '["a", "b"]'}, None)["body"])
+
+    # An eventually consistent miss is never cached, so a late registration shows up
+    assert fake.calls == [1]
+    assert payload["results"] == {"a": True, "b": True}
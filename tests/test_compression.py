@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""
+Unit tests for Accept-Encoding negotiation and compressed verify_user pages
+"""
+
+import base64
+import gzip
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+from local_aws import make_event
+
+import page_cache
+import verify_user
+from router import negotiate_encoding
+
+
+def verify(query, headers=None):
+    return verify_user.lambda_handler(make_event("GET", "/", query, headers=headers), None)
+
+
+def encoding_header(value):
+    return {"headers": {"accept-encoding": value}}
+
+
+def test_gzip_page_is_base64_encoded(backend):
+    plain = verify("userId=alice")
+    response = verify("userId=alice", {"accept-encoding": "gzip"})
+
+    assert response["isBase64Encoded"] is True
+    assert response["headers"]["Content-Encoding"] == "gzip"
+    assert response["headers"]["Vary"] == "Accept-Encoding"
+    assert gzip.decompress(base64.b64decode(response["body"])).decode("utf-8") == plain["body"]
+    assert "isBase64Encoded" not in plain
+    assert "Content-Encoding" not in plain["headers"]
+
+
+def test_each_coding_has_its_own_etag(backend):
+    plain_etag = verify("userId=alice")["headers"]["ETag"]
+    gzip_etag = verify("userId=alice", {"accept-encoding": "gzip"})["headers"]["ETag"]
+
+    assert gzip_etag != plain_etag
+    revalidated = verify("userId=alice", {"accept-encoding": "gzip", "if-none-match": gzip_etag})
+    assert revalidated["statusCode"] == 304
+    assert verify("userId=alice", {"if-none-match": gzip_etag})["statusCode"] == 200
+
+
+def test_compressed_variant_is_computed_once(backend, monkeypatch):
+    calls = []
+    compress = page_cache.COMPRESSORS["gzip"]
+    monkeypatch.setitem(page_cache.COMPRESSORS, "gzip", lambda data: calls.append(data) or compress(data))
+    page_cache._derived.clear()
+
+    for _ in range(3):
+        verify("userId=alice", {"accept-encoding": "gzip"})
+    assert len(calls) == 1
+
+
+def test_incompressible_bodies_are_sent_as_is():
+    assert page_cache.compressed_body("<p>", "gzip") is None
+
+
+def test_negotiate_encoding():
+    available = ("br", "gzip")
+    assert negotiate_encoding(encoding_header("gzip, deflate, br"), available) == "br"
+    assert negotiate_encoding(encoding_header("br;q=0.5, gzip"), available) == "gzip"
+    assert negotiate_encoding(encoding_header("*;q=0.1"), available) == "br"
+    assert negotiate_encoding(encoding_header("gzip;q=0, identity"), available) is None
+    assert negotiate_encoding(encoding_header("deflate"), available) is None
+    assert negotiate_encoding({}, available) is None
+
+
+def test_brotli_page_when_available(backend):
+    brotli = pytest.importorskip("brotli")
+    response = verify("userId=alice", {"accept-encoding": "gzip, br"})
+
+    assert response["headers"]["Content-Encoding"] == "br"
+    assert brotli.decompress(base64.b64decode(response["body"])).decode("utf-8") == verify("userId=alice")["body"]
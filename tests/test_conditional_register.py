@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""
+Unit tests for conditional and idempotent registration in register_user
+"""
+
+import json
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+from local_aws import install_local_aws, make_event
+
+import register_user
+from lookup_cache import lookup_cache
+
+
+@pytest.fixture
+def table():
+    lookup_cache.clear()
+    backend = install_local_aws()
+    yield backend.dynamodb.Table("local-users")
+    lookup_cache.clear()
+
+
+def register(query, headers=None):
+    return register_user.lambda_handler(make_event("PUT", "/register", query, headers=headers), None)
+
+
+def test_existing_user_is_not_rewritten(table):
+    assert register("userId=alice") == register_user.REGISTERED
+    lookup_cache.clear()
+
+    assert register("userId=alice") == register_user.ALREADY_REGISTERED
+    assert table.calls["put_item"] == 2
+
+
+def test_known_user_skips_the_write(table):
+    register("userId=bob")
+    assert register("userId=bob") == register_user.ALREADY_REGISTERED
+    assert table.calls["put_item"] == 1
+
+
+def test_overwrite_mode_always_writes(table, monkeypatch):
+    monkeypatch.setattr(register_user, "REGISTER_MODE", "overwrite")
+    register("userId=carol")
+    assert register("userId=carol") == register_user.REGISTERED
+    assert table.calls["put_item"] == 2
+
+
+def test_idempotency_key_replays_the_first_response(table, monkeypatch):
+    monkeypatch.setattr(register_user, "IDEMPOTENCY_TTL_SECONDS", 60)
+    headers = {"idempotency-key": "req-1"}
+
+    assert register("userId=dave", headers) == register_user.REGISTERED
+    lookup_cache.clear()
+    assert register("userId=dave", headers) == register_user.REGISTERED
+    assert register("userId=dave") == register_user.ALREADY_REGISTERED
+
+    record = table.items["idempotency#req-1"]
+    assert json.loads(record["response"]) == register_user.REGISTERED
+    assert record["expiresAt"] > 0
+
+
+def test_expired_idempotency_record_is_ignored(table, monkeypatch):
+    monkeypatch.setattr(register_user, "IDEMPOTENCY_TTL_SECONDS", 60)
+    table.items["idempotency#req-2"] = {
+        "userId": "idempotency#req-2",
+        "response": json.dumps({"message": "stale"}),
+        "expiresAt": 1,
+    }
+    assert register("userId=erin", {"idempotency-key": "req-2"}) == register_user.REGISTERED
+
+
+def test_idempotency_records_cannot_be_registered_directly(table):
+    response = register("userId=idempotency%23req-3")
+    assert response["statusCode"] == 400
+    assert table.calls["put_item"] == 0
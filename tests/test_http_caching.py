@@ -0,0 +1,60 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the Cache-Control/ETag headers and 304 responses of verify_user
+"""
+
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+from local_aws import make_event
+
+import page_cache
+import verify_user
+from router import etag_matches
+
+
+def verify(query, headers=None):
+    return verify_user.lambda_handler(make_event("GET", "/", query, headers=headers), None)
+
+
+def test_pages_carry_cache_headers(backend, monkeypatch):
+    monkeypatch.setitem(verify_user.CACHE_CONTROL, "index.html", "public, max-age=60")
+    found = verify("userId=alice")
+    missing = verify("userId=nobody")
+
+    assert found["headers"]["Cache-Control"] == "public, max-age=60"
+    assert missing["headers"]["Cache-Control"] == verify_user.CACHE_CONTROL["error.html"]
+    assert found["headers"]["ETag"] != missing["headers"]["ETag"]
+    assert found["headers"]["ETag"] == verify("userId=alice")["headers"]["ETag"]
+
+
+def test_matching_if_none_match_gets_a_304(backend):
+    etag = verify("userId=alice")["headers"]["ETag"]
+
+    response = verify("userId=alice", {"if-none-match": f'W/{etag}, "other"'})
+    assert response["statusCode"] == 304
+    assert "body" not in response
+    assert response["headers"]["ETag"] == etag
+
+    assert verify("userId=nobody", {"if-none-match": etag})["statusCode"] == 200
+
+
+def test_etag_matches_wildcard_and_missing_header():
+    assert etag_matches({"headers": {"if-none-match": "*"}}, '"a"')
+    assert not etag_matches({"headers": {}}, '"a"')
+    assert not etag_matches({}, '"a"')
+
+
+def test_derived_values_are_computed_once_per_body():
+    calls = []
+    body = "<html>page</html>"
+
+    def compute(text):
+        calls.append(text)
+        return len(text)
+
+    assert page_cache.derive(body, "length", compute) == len(body)
+    assert page_cache.derive(body, "length", compute) == len(body)
+    assert calls == [body]
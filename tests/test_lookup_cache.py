@@ -0,0 +1,58 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the verify_user lookup cache (src/lookup_cache.py)
+"""
+
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from lookup_cache import LookupCache, TTLCache
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_misses_and_hits_are_cached_until_ttl():
+    clock = FakeClock()
+    cache = LookupCache(max_entries=10, ttl_seconds=60, negative_ttl_seconds=10, clock=clock)
+
+    assert cache.get({"userId": "alice"}) is None
+    cache.record({"userId": "alice"}, True)
+    cache.record({"userId": "mallory"}, False)
+
+    assert cache.get({"userId": "alice"}) is True
+    assert cache.get({"userId": "mallory"}) is False
+
+    clock.now = 11
+    assert cache.get({"userId": "mallory"}) is None
+    assert cache.get({"userId": "alice"}) is True
+    assert cache.stats()["hits"] == 3
+
+
+def test_recording_a_registration_replaces_the_negative_entry():
+    cache = LookupCache(max_entries=10, ttl_seconds=60, negative_ttl_seconds=60, clock=FakeClock())
+    cache.record({"userId": "bob"}, False)
+
+    cache.record({"userId": "bob"}, True)
+
+    assert cache.get({"userId": "bob"}) is True
+    assert cache.stats()["not_found_entries"] == 0
+
+
+def test_ttl_cache_evicts_least_recently_used():
+    cache = TTLCache(max_entries=2, ttl_seconds=60, clock=FakeClock())
+    cache.add("a")
+    cache.add("b")
+    assert "a" in cache
+    cache.add("c")
+
+    assert "a" in cache
+    assert "b" not in cache
+    assert len(cache) == 2
@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the Embedded Metric Format lines emitted by the handlers
+"""
+
+import io
+import json
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+from local_aws import make_event
+
+import hello_world
+import metrics
+import register_user
+import verify_user
+
+
+def emitted(capsys):
+    return [json.loads(line) for line in capsys.readouterr().out.splitlines() if line.startswith("{")]
+
+
+def metric_names(document):
+    return {metric["Name"] for metric in document["_aws"]["CloudWatchMetrics"][0]["Metrics"]}
+
+
+def test_verify_emits_phase_latencies_and_cache_counts(backend, capsys):
+    verify_user.lambda_handler(make_event("GET", "/", "userId=alice"), None)
+    (document,) = emitted(capsys)
+
+    directive = document["_aws"]["CloudWatchMetrics"][0]
+    assert directive["Namespace"] == metrics.NAMESPACE
+    assert directive["Dimensions"] == [["Function"]]
+    assert document["Function"] == "verify_user"
+    assert document["Route"] == "GET /"
+    assert {"Latency", "ParseLatency", "DynamoDBLatency", "S3Latency", "SerializeLatency",
+            "LookupCacheMisses", "PageCacheMisses", "ConsumedReadCapacity"} <= metric_names(document)
+    assert document["4XXError"] == document["5XXError"] == 0
+    for name in metric_names(document):
+        assert isinstance(document[name], (int, float))
+
+
+def test_cached_lookup_counts_a_hit(backend, capsys):
+    verify_user.lambda_handler(make_event("GET", "/", "userId=alice"), None)
+    capsys.readouterr()
+    verify_user.lambda_handler(make_event("GET", "/", "userId=alice"), None)
+    (document,) = emitted(capsys)
+
+    assert document["LookupCacheHits"] == 1
+    assert document["PageCacheHits"] == 1
+    assert "DynamoDBLatency" not in document
+
+
+def test_errors_get_an_error_class_line(backend, capsys, monkeypatch):
+    def failing_put_item(**kwargs):
+        raise RuntimeError("boom")
+
+    monkeypatch.setattr(backend.dynamodb.Table("local-users"), "put_item", failing_put_item)
+    register_user.lambda_handler(make_event("PUT", "/register", "userId=bob"), None)
+    request, error = emitted(capsys)
+
+    assert request["5XXError"] == 1
+    assert error["ErrorClass"] == "RuntimeError"
+    assert error["Errors"] == 1
+    assert error["_aws"]["CloudWatchMetrics"][0]["Dimensions"] == [["Function", "ErrorClass"]]
+
+
+def test_validation_errors_count_as_4xx(backend, capsys):
+    verify_user.lambda_handler(make_event("GET", "/", "user=alice"), None)
+    (document,) = emitted(capsys)
+    assert document["4XXError"] == 1
+
+
+def test_hello_world_is_metered(capsys):
+    hello_world.lambda_handler(make_event("GET", "/hello"), None)
+    (document,) = emitted(capsys)
+    assert document["Function"] == "hello_world"
+    assert {"Latency", "ColdStart", "4XXError", "5XXError"} <= metric_names(document)
+
+
+def test_metrics_outside_a_request_are_ignored():
+    metrics.put_metric("Orphan", 1)
+    with metrics.phase("Orphan"):
+        pass
+
+    stream = io.StringIO()
+    metrics.emit("fn", metrics.RequestMetrics(), {}, stream=stream)
+    assert metric_names(json.loads(stream.getvalue())) == set()
@@ -14,6 +14,7 @@ Tests include:
 
 Usage:
     python tests/test_milestone3.py
+    python tests/test_milestone3.py --workers 1
 
 Requirements:
     - GitHub repository with Actions enabled
@@ -21,19 +22,24 @@ Requirements:
     - API Gateway URL from terraform output
 """
 
+import argparse
 import os
 import sys
 import time
-import json
+import threading
 import yaml
 import requests
 import subprocess
+from functools import cached_property
 from pathlib import Path
 from typing import Dict, Any, Optional
 
 # Add project root to path for imports
 project_root = Path(__file__).parent.parent
 sys.path.insert(0, str(project_root))
+sys.path.insert(0, str(Path(__file__).parent))
+
+from live_support import DEFAULT_WORKERS, run_concurrently, terraform_output, terraform_outputs
 
 class Colors:
     """ANSI color codes for terminal output"""
@@ -54,31 +60,19 @@ class Milestone3Tester:
         self.terraform_dir = self.project_root / "terraform"
         self.workflow_file = self.project_root / ".github" / "workflows" / "deploy.yaml"
         self.terraform_state_dir = self.project_root / "terraform-state"
-        self.api_gateway_url = self._get_api_gateway_url()
         self.test_results = []
-        
-    def _get_api_gateway_url(self) -> Optional[str]:
-        """Get API Gateway URL from terraform output or environment"""
-        # Try environment variable first (for CI/CD)
-        url = os.getenv('API_GATEWAY_URL')
-        if url:
-            return url
-            
-        # Try terraform output (for local testing)
-        try:
-            result = subprocess.run(
-                ['terraform', 'output', '-raw', 'api_gateway_url'],
-                cwd=self.terraform_dir,
-                capture_output=True,
-                text=True,
-                timeout=30
-            )
-            if result.returncode == 0:
-                return result.stdout.strip()
-        except (subprocess.TimeoutExpired, FileNotFoundError):
-            pass
-            
-        return None
+        self._current = threading.local()
+    
+    @cached_property
+    def api_gateway_url(self) -> Optional[str]:
+        """API Gateway URL from API_GATEWAY_URL (CI/CD) or terraform output, resolved on first use"""
+        return terraform_output('api_gateway_url')
+    
+    @cached_property
+    def workflow(self) -> Dict[str, Any]:
+        """Parsed deploy.yaml, shared by the workflow checks"""
+        with open(self.workflow_file, 'r') as f:
+            return yaml.safe_load(f)
     
     def _print_test_header(self, test_name: str):
         """Print formatted test header"""
@@ -102,7 +96,8 @@ class Milestone3Tester:
         self.test_results.append({
             'test': test_name,
             'passed': passed,
-            'message': message
+            'message': message,
+            'order': getattr(self._current, 'order', 0)
         })
         
         if passed:
@@ -120,8 +115,7 @@ class Milestone3Tester:
                 return
             
             # Load and validate YAML
-            with open(self.workflow_file, 'r') as f:
-                workflow = yaml.safe_load(f)
+            workflow = self.workflow
             
             # Check required sections (note: 'on' becomes True in YAML parsing)
             required_sections = ['name', 'jobs', 'permissions']
@@ -168,8 +162,7 @@ class Milestone3Tester:
             local_version = result.stdout.split('\n')[0].split('v')[1] if 'v' in result.stdout else "unknown"
             
             # Get workflow Terraform version
-            with open(self.workflow_file, 'r') as f:
-                workflow = yaml.safe_load(f)
+            workflow = self.workflow
             
             workflow_version = workflow.get('env', {}).get('TF_VERSION', 'unknown')
             
@@ -235,25 +228,17 @@ class Milestone3Tester:
                     return
             
             # Try to get outputs (if terraform is initialized)
-            try:
-                result = subprocess.run(
-                    ['terraform', 'output', '-json'],
-                    cwd=self.terraform_state_dir,
-                    capture_output=True,
-                    text=True,
-                    timeout=30
-                )
-                if result.returncode == 0:
-                    outputs = json.loads(result.stdout)
-                    required_outputs = ['github_actions_role_arn', 'terraform_state_bucket']
-                    for output in required_outputs:
-                        if output not in outputs:
-                            self._record_result("State Infrastructure Outputs", False, f"Missing {output} output")
-                            return
-                    
-                    self._print_info(f"GitHub Actions Role: {outputs.get('github_actions_role_arn', {}).get('value', 'N/A')}")
-                    self._print_info(f"State Bucket: {outputs.get('terraform_state_bucket', {}).get('value', 'N/A')}")
-            except:
+            outputs = terraform_outputs(self.terraform_state_dir.name)
+            if outputs is not None:
+                required_outputs = ['github_actions_role_arn', 'terraform_state_bucket']
+                for output in required_outputs:
+                    if output not in outputs:
+                        self._record_result("State Infrastructure Outputs", False, f"Missing {output} output")
+                        return
+                
+                self._print_info(f"GitHub Actions Role: {outputs.get('github_actions_role_arn', 'N/A')}")
+                self._print_info(f"State Bucket: {outputs.get('terraform_state_bucket', 'N/A')}")
+            else:
                 self._print_info("Terraform state not initialized - skipping output check")
             
             self._record_result("Terraform State Infrastructure", True)
@@ -266,8 +251,7 @@ class Milestone3Tester:
         self._print_test_header("Security Scanning Configuration")
         
         try:
-            with open(self.workflow_file, 'r') as f:
-                workflow = yaml.safe_load(f)
+            workflow = self.workflow
             
             # Check security-scan job exists
             jobs = workflow.get('jobs', {})
@@ -395,8 +379,8 @@ class Milestone3Tester:
         except Exception as e:
             self._record_result("Documentation Completeness", False, str(e))
     
-    def run_all_tests(self):
-        """Run all Milestone 3 tests"""
+    def run_all_tests(self, workers: int = DEFAULT_WORKERS):
+        """Run all Milestone 3 tests (independent, so up to ``workers`` at a time)"""
         print(f"{Colors.HEADER}🚀 Starting Milestone 3 Tests{Colors.ENDC}")
         print("=" * 60)
         
@@ -411,12 +395,22 @@ class Milestone3Tester:
             self.test_documentation_completeness
         ]
         
-        for test_method in test_methods:
-            try:
-                test_method()
-            except Exception as e:
-                test_name = test_method.__name__.replace('test_', '').replace('_', ' ').title()
-                self._record_result(test_name, False, f"Test execution error: {str(e)}")
+        def run_test(order, test_method):
+            def run():
+                self._current.order = order
+                try:
+                    test_method()
+                except Exception as e:
+                    test_name = test_method.__name__.replace('test_', '').replace('_', ' ').title()
+                    self._record_result(test_name, False, f"Test execution error: {str(e)}")
+            return run
+        
+        run_concurrently(
+            [(test_method.__name__, run_test(order, test_method)) for order, test_method in enumerate(test_methods)],
+            workers
+        )
+        # Results arrive in completion order; report them in test order
+        self.test_results.sort(key=lambda result: result['order'])
         
         # Print summary
         self._print_summary()
@@ -448,8 +442,13 @@ class Milestone3Tester:
 
 def main():
     """Main test execution"""
+    parser = argparse.ArgumentParser(description="Run the Milestone 3 tests")
+    parser.add_argument("--workers", type=int, default=DEFAULT_WORKERS,
+                        help="Tests run concurrently (defaults to LIVE_TEST_WORKERS or 8; 1 runs them in series)")
+    args = parser.parse_args()
+    
     tester = Milestone3Tester()
-    tester.run_all_tests()
+    tester.run_all_tests(args.workers)
     
     # Exit with appropriate code
     failed_tests = [r for r in tester.test_results if not r['passed']]
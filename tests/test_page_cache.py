@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the verify_user page cache (src/page_cache.py)
+
+These run locally without AWS: the S3 fetch is replaced by an in-memory origin.
+"""
+
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from page_cache import PageCache, load_bundled_pages
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class FakeOrigin:
+    """Serves pages by key and answers conditional requests like S3"""
+
+    def __init__(self, pages):
+        self.pages = pages
+        self.requests = []
+
+    def __call__(self, key, etag=None):
+        self.requests.append((key, etag))
+        body = self.pages[key]
+        current_etag = f'"{hash(body)}"'
+        if etag == current_etag:
+            return None
+        return body, current_etag
+
+
+def test_hit_within_ttl_skips_origin():
+    origin = FakeOrigin({"index.html": "<h1>Welcome!</h1>"})
+    cache = PageCache(fetch=origin, ttl_seconds=60, clock=FakeClock())
+
+    assert cache.get("index.html") == "<h1>Welcome!</h1>"
+    assert cache.get("index.html") == "<h1>Welcome!</h1>"
+
+    assert origin.requests == [("index.html", None)]
+    assert cache.stats()["hits"] == 1
+    assert cache.stats()["misses"] == 1
+
+
+def test_expired_entry_revalidates_with_etag():
+    clock = FakeClock()
+    origin = FakeOrigin({"error.html": "User not found"})
+    cache = PageCache(fetch=origin, ttl_seconds=60, clock=clock)
+
+    cache.get("error.html")
+    clock.now = 61
+    assert cache.get("error.html") == "User not found"
+
+    assert origin.requests[1] == ("error.html", f'"{hash("User not found")}"')
+    assert cache.stats()["not_modified"] == 1
+
+
+def test_changed_object_replaces_cached_body():
+    clock = FakeClock()
+    origin = FakeOrigin({"index.html": "v1"})
+    cache = PageCache(fetch=origin, ttl_seconds=60, clock=clock)
+
+    cache.get("index.html")
+    origin.pages["index.html"] = "v2"
+    clock.now = 61
+
+    assert cache.get("index.html") == "v2"
+    assert cache.stats()["not_modified"] == 0
+    assert cache.stats()["origin_gets"] == 2
+
+
+def test_bundled_pages_are_served_without_origin(tmp_path):
+    (tmp_path / "index.html").write_text("<h1>Bundled</h1>", encoding="utf-8")
+    origin = FakeOrigin({"index.html": "from s3", "error.html": "error from s3"})
+    cache = PageCache(fetch=origin, ttl_seconds=60, clock=FakeClock(),
+                      bundled=load_bundled_pages(tmp_path))
+
+    assert cache.get("index.html") == "<h1>Bundled</h1>"
+    assert cache.get("error.html") == "error from s3"
+
+    assert origin.requests == [("error.html", None)]
+    assert cache.stats()["bundled_hits"] == 1
@@ -0,0 +1,50 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the init-time warm-up hook
+"""
+
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+from local_aws import install_local_aws
+
+import verify_user
+from page_cache import PAGE_FILES, page_cache
+from prewarm import prewarm, should_prewarm
+
+
+def test_prewarm_follows_the_initialization_type(monkeypatch):
+    monkeypatch.delenv("PREWARM", raising=False)
+    monkeypatch.setenv("AWS_LAMBDA_INITIALIZATION_TYPE", "on-demand")
+    assert not should_prewarm()
+    monkeypatch.setenv("AWS_LAMBDA_INITIALIZATION_TYPE", "provisioned-concurrency")
+    assert should_prewarm()
+    monkeypatch.setenv("PREWARM", "off")
+    assert not should_prewarm()
+
+
+def test_failed_steps_do_not_stop_the_others(monkeypatch):
+    monkeypatch.setenv("PREWARM", "on")
+    ran = []
+
+    def broken():
+        raise RuntimeError("no network")
+
+    assert prewarm(broken, lambda: ran.append("after"))
+    assert ran == ["after"]
+
+
+def test_on_demand_environments_skip_prewarm(monkeypatch):
+    monkeypatch.setenv("PREWARM", "auto")
+    monkeypatch.delenv("AWS_LAMBDA_INITIALIZATION_TYPE", raising=False)
+    assert not prewarm(lambda: 1 / 0)
+
+
+def test_warm_pages_fills_the_page_cache():
+    page_cache.clear()
+    install_local_aws()
+    verify_user.warm_pages()
+    assert not any(page_cache.needs_origin(name) for name in PAGE_FILES)
+    page_cache.clear()
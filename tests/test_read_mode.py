@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the verify GetItem parameters (DB_READ_MODE), the consumed
+read capacity they report and the consistent re-check of misses
+"""
+
+import json
+import logging
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+from local_aws import make_event
+
+import aws_clients
+import verify_user
+
+
+@pytest.fixture
+def get_item_calls(backend, monkeypatch):
+    client = aws_clients.get_client("dynamodb")
+    calls = []
+    real_get_item = client.get_item
+
+    def recording_get_item(**kwargs):
+        calls.append(kwargs)
+        return real_get_item(**kwargs)
+
+    monkeypatch.setattr(client, "get_item", recording_get_item)
+    return calls
+
+
+def verify(user_id):
+    return verify_user.lambda_handler(make_event("GET", "/", f"userId={user_id}"), None)
+
+
+def test_projection_mode_reads_back_only_the_key(get_item_calls, monkeypatch):
+    monkeypatch.setattr(verify_user, "READ_MODE", "projection")
+    verify("alice")
+
+    (kwargs,) = get_item_calls
+    assert kwargs["TableName"] == "local-users"
+    assert kwargs["Key"] == {"userId": {"S": "alice"}}
+    assert kwargs["ProjectionExpression"] == "#k0"
+    assert kwargs["ExpressionAttributeNames"] == {"#k0": "userId"}
+    assert kwargs["ConsistentRead"] is False
+    assert kwargs["ReturnConsumedCapacity"] == "TOTAL"
+
+
+def test_full_mode_reads_the_whole_item(get_item_calls, monkeypatch):
+    monkeypatch.setattr(verify_user, "READ_MODE", "full")
+    verify("alice")
+
+    (kwargs,) = get_item_calls
+    assert "ProjectionExpression" not in kwargs
+    assert "ExpressionAttributeNames" not in kwargs
+    assert kwargs["ConsistentRead"] is False
+    assert kwargs["ReturnConsumedCapacity"] == "TOTAL"
+
+
+def test_consumed_capacity_reaches_the_log_and_metrics(get_item_calls, caplog, capsys):
+    caplog.set_level(logging.INFO)
+    verify("alice")
+
+    (line,) = [json.loads(record.getMessage()) for record in caplog.records
+               if record.name == "root" and '"request"' in record.getMessage()]
+    (document,) = [json.loads(out) for out in capsys.readouterr().out.splitlines() if out.startswith("{")]
+    # An eventually consistent read of an item under 4 KB costs half a unit
+    assert line["consumed_read_units"] == 0.5
+    assert document["ConsumedReadCapacity"] == 0.5
+
+
+def test_no_capacity_is_reported_when_disabled(get_item_calls, capsys, monkeypatch):
+    monkeypatch.setattr(verify_user, "RETURN_CONSUMED_CAPACITY", "NONE")
+    verify("alice")
+
+    assert get_item_calls[0]["ReturnConsumedCapacity"] == "NONE"
+    (document,) = [json.loads(out) for out in capsys.readouterr().out.splitlines() if out.startswith("{")]
+    assert "ConsumedReadCapacity" not in document
+
+
+def test_eventually_consistent_miss_is_confirmed_before_caching(get_item_calls, monkeypatch):
+    client = aws_clients.get_client("dynamodb")
+    recording_get_item = client.get_item
+
+    def lagging_get_item(**kwargs):
+        # The registration has not reached the replica an eventually consistent read hits
+        response = recording_get_item(**kwargs)
+        if not kwargs["ConsistentRead"]:
+            response.pop("Item", None)
+        return response
+
+    monkeypatch.setattr(client, "get_item", lagging_get_item)
+    response = verify("alice")
+
+    assert [kwargs["ConsistentRead"] for kwargs in get_item_calls] == [False, True]
+    assert "User Verification Successful" in response["body"]
+    assert verify_user.lookup_cache.peek({"userId": "alice"}) is True
+
+
+def test_confirmed_miss_is_negative_cached(get_item_calls, capsys):
+    verify("mallory")
+    verify("mallory")
+
+    assert [kwargs["ConsistentRead"] for kwargs in get_item_calls] == [False, True]
+    document = [json.loads(out) for out in capsys.readouterr().out.splitlines() if out.startswith("{")][0]
+    assert document["ConsumedReadCapacity"] == 1.5
+
+
+def test_consistent_read_mode_reads_once(get_item_calls, monkeypatch):
+    monkeypatch.setattr(verify_user, "CONSISTENT_READ", True)
+    verify("mallory")
+    assert [kwargs["ConsistentRead"] for kwargs in get_item_calls] == [True]
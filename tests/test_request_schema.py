@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the request schema shared by register_user and verify_user
+"""
+
+import json
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+from local_aws import install_local_aws, make_event
+
+import register_user
+import verify_user
+from request_schema import (MAX_ITEM_BYTES, MAX_VALUE_LENGTH, ValidationError,
+                            parse_query_string, validate_key, validate_user)
+
+
+def test_duplicate_parameters_are_rejected():
+    with pytest.raises(ValidationError):
+        parse_query_string("userId=a&userId=b")
+
+
+@pytest.mark.parametrize("attributes", [
+    {},
+    {"userId": ""},
+    {"userId": "a", "isAdmin": "true"},
+    {"userId": "x" * (MAX_VALUE_LENGTH + 1)},
+])
+def test_invalid_users_are_rejected(attributes):
+    with pytest.raises(ValidationError):
+        validate_user(attributes)
+
+
+def item_of_size(total_bytes):
+    """A user whose attribute names and values add up to ``total_bytes`` UTF-8 bytes"""
+    item = {"userId": "u"}
+    remaining = total_bytes - len("userId") - 1
+    index = 0
+    while remaining > 0:
+        name = f"a{index:03d}"
+        value = "x" * min(MAX_VALUE_LENGTH, remaining - len(name))
+        item[name] = value
+        remaining -= len(name) + len(value)
+        index += 1
+    assert remaining == 0
+    return item
+
+
+def test_item_byte_cap_rejects_an_item_just_over_the_limit(monkeypatch):
+    import request_schema
+
+    monkeypatch.setattr(request_schema, "ALLOWED_ATTRIBUTES", frozenset(
+        ["userId"] + [f"a{index:03d}" for index in range(100)]))
+    assert validate_user(item_of_size(MAX_ITEM_BYTES))
+    with pytest.raises(ValidationError, match="bytes"):
+        validate_user(item_of_size(MAX_ITEM_BYTES + 1))
+
+
+def test_item_byte_cap_counts_utf8_bytes(monkeypatch):
+    import request_schema
+
+    monkeypatch.setattr(request_schema, "MAX_ITEM_BYTES", 10)
+    # 9 characters, but 12 UTF-8 bytes
+    with pytest.raises(ValidationError):
+        validate_user({"userId": "ééé"})
+
+
+def test_lookup_key_must_be_exactly_the_hash_key():
+    assert validate_key({"userId": "a"}) == {"userId": "a"}
+    with pytest.raises(ValidationError):
+        validate_key({"userId": "a", "extra": "b"})
+
+
+def test_invalid_requests_never_reach_dynamodb():
+    backend = install_local_aws()
+    table = backend.dynamodb.Table("local-users")
+
+    register_response = register_user.lambda_handler(make_event("PUT", "/register", ""), None)
+    verify_response = verify_user.lambda_handler(make_event("GET", "/", "userId="), None)
+
+    assert register_response["statusCode"] == 400
+    assert "Error" in json.loads(register_response["body"])["message"]
+    assert verify_response["statusCode"] == 400
+    assert "User Verification Failed" in verify_response["body"]
+    assert table.calls == {"get_item": 0, "put_item": 0}
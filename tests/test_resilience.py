@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the request deadline, hedged reads and client timeouts
+"""
+
+import sys
+import threading
+import time
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+from local_aws import make_event
+
+import aws_clients
+import resilience
+import verify_user
+from lookup_cache import lookup_cache
+from page_cache import page_cache
+
+
+class FakeContext:
+    def __init__(self, remaining_ms):
+        self.remaining_ms = remaining_ms
+
+    def get_remaining_time_in_millis(self):
+        return self.remaining_ms
+
+
+@pytest.fixture(autouse=True)
+def clean_latencies():
+    resilience.latencies.clear()
+    yield
+    resilience.latencies.clear()
+
+
+def test_calls_outside_a_request_run_inline():
+    assert resilience.call("test.inline", threading.current_thread) is threading.current_thread()
+
+
+def test_unhedged_calls_run_on_the_calling_thread():
+    with resilience.request_deadline(FakeContext(10_000)):
+        assert resilience.call("test.inline", threading.current_thread) is threading.current_thread()
+        assert resilience.call("test.read", threading.current_thread, idempotent=True) is threading.current_thread()
+
+
+def test_slow_hedged_read_fails_at_the_deadline(monkeypatch):
+    monkeypatch.setattr(resilience, "DEADLINE_MARGIN_MS", 0)
+    monkeypatch.setattr(resilience, "HEDGE_READS", True)
+    monkeypatch.setattr(resilience, "HEDGE_MIN_SAMPLES", 5)
+    for _ in range(10):
+        resilience.latencies.record("test.slow", 0.01)
+
+    start = time.perf_counter()
+    with resilience.request_deadline(FakeContext(50)):
+        with pytest.raises(resilience.DeadlineExceeded):
+            resilience.call("test.slow", time.sleep, 1, idempotent=True)
+    assert time.perf_counter() - start < 0.5
+
+
+def test_no_call_is_started_once_the_deadline_has_passed():
+    calls = []
+    with resilience.request_deadline(FakeContext(resilience.DEADLINE_MARGIN_MS - 1)):
+        with pytest.raises(resilience.DeadlineExceeded):
+            resilience.call("test.late", calls.append, 1)
+    assert calls == []
+
+
+def test_slow_idempotent_read_is_hedged(monkeypatch):
+    monkeypatch.setattr(resilience, "HEDGE_READS", True)
+    monkeypatch.setattr(resilience, "HEDGE_MIN_SAMPLES", 5)
+    for _ in range(10):
+        resilience.latencies.record("test.read", 0.01)
+
+    attempts = []
+
+    def read():
+        attempts.append(1)
+        if len(attempts) == 1:
+            time.sleep(0.5)
+            return "slow"
+        return "fast"
+
+    start = time.perf_counter()
+    assert resilience.call("test.read", read, idempotent=True) == "fast"
+    assert time.perf_counter() - start < 0.3
+    assert len(attempts) == 2
+
+
+def test_writes_are_never_hedged(monkeypatch):
+    monkeypatch.setattr(resilience, "HEDGE_READS", True)
+    monkeypatch.setattr(resilience, "HEDGE_MIN_SAMPLES", 5)
+    for _ in range(10):
+        resilience.latencies.record("test.write", 0.001)
+
+    attempts = []
+    resilience.call("test.write", lambda: attempts.append(1) or time.sleep(0.05))
+    assert len(attempts) == 1
+
+
+def test_verify_gets_the_error_page_when_the_lookup_times_out(backend, monkeypatch):
+    verify_user.warm_pages()
+    table = backend.dynamodb.Table("local-users")
+    table.latency_ms = 300
+    monkeypatch.setattr(resilience, "DEADLINE_MARGIN_MS", 0)
+    monkeypatch.setattr(resilience, "HEDGE_READS", True)
+    monkeypatch.setattr(resilience, "HEDGE_MIN_SAMPLES", 5)
+    for _ in range(10):
+        resilience.latencies.record("dynamodb.get_item", 0.01)
+
+    start = time.perf_counter()
+    event = make_event("GET", "/", "userId=alice")
+    response = verify_user.lambda_handler(event, FakeContext(100))
+    assert time.perf_counter() - start < 0.25
+    assert response["statusCode"] == 200
+    assert response["headers"]["ETag"] == verify_user.content_etag(page_cache.get("error.html"))
+    assert lookup_cache.get({"userId": "alice"}) is None
+
+
+def test_clients_use_explicit_timeouts_and_adaptive_retries(monkeypatch):
+    monkeypatch.setattr(aws_clients, "_config", None)
+    config = aws_clients.client_config()
+    assert config.connect_timeout == 1.0
+    assert config.read_timeout == 2.0
+    assert config.retries == {"mode": "adaptive", "max_attempts": 3}
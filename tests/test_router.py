@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the shared router and the combined app handler
+"""
+
+import json
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+from local_aws import install_local_aws, make_event
+
+import app
+import verify_user
+from lookup_cache import lookup_cache
+from router import NOT_FOUND, Router, json_response
+
+
+def test_router_dispatches_on_route_key_and_falls_back_to_default():
+    router = Router()
+
+    @router.route("GET /a", default=True)
+    def a(event, context):
+        return "a"
+
+    @router.route("POST /b")
+    def b(event, context):
+        return "b"
+
+    assert router.dispatch({"routeKey": "POST /b"}, None) == "b"
+    assert router.dispatch({"routeKey": "GET /a"}, None) == "a"
+    assert router.dispatch({"routeKey": "DELETE /x"}, None) == "a"
+    assert Router().dispatch({"routeKey": "GET /a"}, None) is NOT_FOUND
+
+
+def test_json_response_sets_status_and_content_type():
+    response = json_response(201, {"ok": True})
+    assert response["statusCode"] == 201
+    assert response["headers"] == {"Content-Type": "application/json"}
+    assert json.loads(response["body"]) == {"ok": True}
+
+
+def test_app_serves_every_route_from_one_function():
+    lookup_cache.clear()
+    install_local_aws()
+
+    registered = app.lambda_handler(make_event("PUT", "/register", "userId=monolith"), None)
+    verified = app.lambda_handler(make_event("GET", "/", "userId=monolith"), None)
+    hello = app.lambda_handler(make_event("GET", "/hello"), None)
+    missing = app.lambda_handler(make_event("DELETE", "/register"), None)
+
+    assert registered["statusCode"] == 200
+    assert "Registered User Successfully" in registered["body"]
+    assert verified["statusCode"] == 200
+    assert "User Verification Successful" in verified["body"]
+    assert json.loads(hello["body"]) == {"message": "Hello world"}
+    assert missing["statusCode"] == 404
+    lookup_cache.clear()
+
+
+def test_verify_errors_get_a_500(monkeypatch):
+    def fail(db_key):
+        raise RuntimeError("boom")
+
+    monkeypatch.setattr(verify_user, "lookup_and_render", fail)
+    response = verify_user.lambda_handler(make_event("GET", "/", "userId=anyone"), None)
+    assert response["statusCode"] == 500
+    assert response["headers"]["Content-Type"] == "application/json"
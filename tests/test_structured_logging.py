@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the one-JSON-line-per-request logging in src/structured_logging.py
+"""
+
+import json
+import logging
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+from local_aws import make_event
+
+import structured_logging
+import verify_user
+from structured_logging import annotate, logged_handler
+
+
+class FakeContext:
+    aws_request_id = "req-1"
+
+
+@logged_handler("test_handler")
+def annotated_handler(event, context):
+    annotate(first=1)
+    annotate(second=2, first="replaced")
+    return {"statusCode": 201, "body": ""}
+
+
+@logged_handler("test_handler")
+def failing_handler(event, context):
+    annotate(stage="before failure")
+    raise RuntimeError("boom")
+
+
+def request_lines(caplog):
+    lines = [json.loads(record.getMessage()) for record in caplog.records if record.name == "root"]
+    return [line for line in lines if line["message"] == "request"]
+
+
+@pytest.fixture(autouse=True)
+def info_logs(caplog, monkeypatch):
+    monkeypatch.setattr(structured_logging, "EVENT_SAMPLE_RATE", 0.0)
+    monkeypatch.delenv("_X_AMZN_TRACE_ID", raising=False)
+    caplog.set_level(logging.INFO)
+
+
+def test_each_request_emits_exactly_one_line(caplog):
+    annotated_handler(make_event("GET", "/"), FakeContext())
+    (line,) = request_lines(caplog)
+
+    assert line["handler"] == "test_handler"
+    assert line["request_id"] == "req-1"
+    assert line["route"] == "GET /"
+    assert line["status"] == 201
+    assert isinstance(line["duration_ms"], float)
+    assert "trace_id" not in line
+
+
+def test_annotations_are_merged_into_the_line(caplog):
+    annotated_handler(make_event("GET", "/"), None)
+    (line,) = request_lines(caplog)
+    assert line["first"] == "replaced"
+    assert line["second"] == 2
+
+
+def test_annotations_outside_a_request_are_ignored(caplog):
+    annotate(orphan=True)
+    annotated_handler(make_event("GET", "/"), None)
+    (line,) = request_lines(caplog)
+    assert "orphan" not in line
+
+
+def test_only_the_first_request_is_a_cold_start(caplog, monkeypatch):
+    monkeypatch.setattr(structured_logging, "_cold_start", True)
+    annotated_handler(make_event("GET", "/"), None)
+    annotated_handler(make_event("GET", "/"), None)
+    assert [line["cold_start"] for line in request_lines(caplog)] == [True, False]
+
+
+def test_trace_id_comes_from_the_lambda_environment(caplog, monkeypatch):
+    monkeypatch.setenv("_X_AMZN_TRACE_ID", "Root=1-5759e988-bd862e3fe1be46a994272793")
+    annotated_handler(make_event("GET", "/"), None)
+    (line,) = request_lines(caplog)
+    assert line["trace_id"] == "Root=1-5759e988-bd862e3fe1be46a994272793"
+
+
+@pytest.mark.parametrize("rate, logged", [(0.0, False), (1.0, True)])
+def test_events_are_logged_at_the_sample_rate(caplog, monkeypatch, rate, logged):
+    monkeypatch.setattr(structured_logging, "EVENT_SAMPLE_RATE", rate)
+    event = make_event("GET", "/", "userId=alice")
+    annotated_handler(event, None)
+    (line,) = request_lines(caplog)
+    assert ("event" in line) is logged
+    if logged:
+        assert line["event"] == event
+
+
+def test_failed_request_still_logs_one_line_with_status_500(caplog):
+    with pytest.raises(RuntimeError):
+        failing_handler(make_event("GET", "/"), None)
+    (line,) = request_lines(caplog)
+    assert line["status"] == 500
+    assert line["stage"] == "before failure"
+
+
+def test_nothing_is_logged_below_info(caplog):
+    caplog.set_level(logging.WARNING)
+    annotated_handler(make_event("GET", "/"), None)
+    assert request_lines(caplog) == []
+
+
+def test_verify_line_carries_the_lookup_result(backend, caplog):
+    verify_user.lambda_handler(make_event("GET", "/", "userId=alice"), None)
+    (line,) = request_lines(caplog)
+    assert line["handler"] == "verify_user"
+    assert line["status"] == 200
+    assert line["user_found"] is True
+    assert line["lookup"] == "dynamodb"
@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the X-Ray subsegments around the handlers' AWS calls
+"""
+
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+from local_aws import LocalTraceCollector, make_event
+
+import register_user
+import tracing
+import verify_user
+
+src_dir = Path(__file__).parent.parent / "src"
+
+
+@pytest.fixture
+def collector(backend):
+    collector = LocalTraceCollector()
+    tracing.install_recorder(collector)
+    yield collector
+    tracing.install_recorder(None)
+
+
+def test_verify_traces_each_aws_call(collector, monkeypatch):
+    monkeypatch.setattr(verify_user, "FANOUT_ENABLED", False)
+    verify_user.lambda_handler(make_event("GET", "/", "userId=alice"), None)
+
+    assert collector.names() == ["dynamodb.get_item", "s3.get_object"]
+    assert all(subsegment.namespace == "aws" for subsegment in collector.subsegments)
+    assert all(subsegment.end_time >= subsegment.start_time for subsegment in collector.subsegments)
+
+
+def test_failed_calls_record_the_exception(collector, monkeypatch):
+    def failing_put_item(**kwargs):
+        raise RuntimeError("boom")
+
+    table = register_user.get_dynamodb_table()
+    monkeypatch.setattr(table, "put_item", failing_put_item)
+    register_user.lambda_handler(make_event("PUT", "/register", "userId=bob"), None)
+
+    (subsegment,) = collector.subsegments
+    assert subsegment.name == "dynamodb.put_item"
+    assert isinstance(subsegment.exceptions[0], RuntimeError)
+
+
+def test_cached_requests_make_no_subsegments(collector, monkeypatch):
+    # A fan-out prefetch could finish its subsegment after the clear below
+    monkeypatch.setattr(verify_user, "FANOUT_ENABLED", False)
+    verify_user.lambda_handler(make_event("GET", "/", "userId=alice"), None)
+    collector.subsegments.clear()
+    verify_user.lambda_handler(make_event("GET", "/", "userId=alice"), None)
+    assert collector.subsegments == []
+
+
+def test_disabled_tracing_imports_nothing():
+    code = (
+        "import sys; import tracing; "
+        "assert tracing.subsegment('x') is tracing.subsegment('y'); "
+        "assert not any(name.startswith('aws_xray_sdk') for name in sys.modules)"
+    )
+    subprocess.run([sys.executable, "-c", code], cwd=src_dir, check=True, env={"TRACING": "off"})
@@ -0,0 +1,51 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the concurrent DynamoDB/S3 fan-out in verify_user
+
+Runs the handler against the local stand-ins with a simulated 100 ms latency
+per AWS call.
+"""
+
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+from local_aws import install_local_aws, make_event
+
+import verify_user
+from lookup_cache import lookup_cache
+from page_cache import page_cache
+
+LATENCY_MS = 100
+
+
+def _cold_verify(user_id):
+    page_cache.clear()
+    lookup_cache.clear()
+    start = time.perf_counter()
+    response = verify_user.lambda_handler(make_event("GET", "/", f"userId={user_id}"), None)
+    return response, (time.perf_counter() - start) * 1000
+
+
+def test_lookup_and_page_fetch_overlap(monkeypatch):
+    backend = install_local_aws(latency_ms=LATENCY_MS)
+    backend.dynamodb.Table("local-users").items["alice"] = {"userId": "alice"}
+    monkeypatch.setattr(verify_user, "FANOUT_ENABLED", True)
+
+    response, elapsed_ms = _cold_verify("alice")
+
+    assert "User Verification Successful" in response["body"]
+    assert elapsed_ms < 1.8 * LATENCY_MS
+
+
+def test_serial_mode_returns_the_same_page(monkeypatch):
+    install_local_aws(latency_ms=0)
+    monkeypatch.setattr(verify_user, "FANOUT_ENABLED", True)
+    concurrent_response, _ = _cold_verify("nobody")
+    monkeypatch.setattr(verify_user, "FANOUT_ENABLED", False)
+    serial_response, _ = _cold_verify("nobody")
+
+    assert concurrent_response == serial_response
+    assert "User Verification Failed" in serial_response["body"]